@@ -1,228 +1,133 @@
+import os
+from concurrent.futures import as_completed
 import streamlit as st
-import base64
-from core.data_handler import data_handler
-from core.visualization_handler import viz_handler
-
-# Thêm CSS trực tiếp cho ảnh nền
-def add_bg_from_local(image_file):
-    with open(image_file, "rb") as image_file:
-        encoded_string = base64.b64encode(image_file.read()).decode()
-    
-    st.markdown(
-        f"""
-        <style>
-        .stApp {{
-            background-image: url("data:image/jpg;base64,{encoded_string}");
-            background-size: cover;
-            background-position: center;
-            background-repeat: no-repeat;
-            background-attachment: fixed;
-        }}
-        
-        /* Make content containers slightly transparent to show background */
-        .css-18e3th9, .css-1d391kg, .stTabs [data-baseweb="tab-panel"] {{
-            background-color: rgba(255, 255, 255, 0.85) !important;
-            border-radius: 8px;
-            padding: 10px;
-        }}
-        
-        /* Style for widgets */
-        .stSelectbox, .stMultiSelect {{
-            background-color: rgba(255, 255, 255, 0.92) !important;
-        }}
-        
-        /* Style for charts and visualization containers */
-        [data-testid="stBlock"] {{
-            background-color: rgba(255, 255, 255, 0.9);
-            border-radius: 8px;
-            padding: 15px;
-            box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-        }}
-        
-        /* Chỉ áp dụng text-shadow cho văn bản trong main-title */
-        .main-title h1, .main-title h2, .main-title p {{
-            color: white !important;
-            text-shadow: 1px 1px 3px rgba(0, 0, 0, 0.6);
-        }}
-        
-        /* Loại bỏ text-shadow cho các văn bản khác */
-        body, h1, h2, h3, p, label {{
-            text-shadow: none;
-        }}
-        
-        /* Style for main header section */
-        .main-title {{
-            text-align: center;
-            padding: 40px 20px;
-            margin-bottom: 30px;
-            background-color: rgba(0, 0, 0, 0.4);
-            border-radius: 12px;
-            box-shadow: 0 10px 15px -3px rgba(0, 0, 0, 0.2);
-        }}
-        
-        .main-title h1 {{
-            color: white !important;
-            font-family: 'Montserrat', sans-serif;
-            font-weight: 700;
-            font-size: 3.5rem;
-            margin-bottom: 10px;
-            letter-spacing: 1px;
-            text-transform: uppercase;
-            text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.5);
-        }}
-        
-        .main-title h2 {{
-            color: white !important;
-            font-family: 'Montserrat', sans-serif;
-            font-weight: 700;
-            font-size: 2.5rem;
-            margin-bottom: 10px;
-            letter-spacing: 1px;
-            text-transform: uppercase;
-            text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.5);
-        }}
-        
-        .main-title p {{
-            color: white !important;
-            font-family: 'Poppins', sans-serif;
-            font-size: 1.2rem;
-            max-width: 800px;
-            margin: 0 auto;
-            line-height: 1.6;
-            text-shadow: 1px 1px 2px rgba(0, 0, 0, 0.5);
-        }}
-        
-        /* Hide the default Streamlit title */
-        .css-1q8dd3e {{
-            display: none;
-        }}
-        
-        /* Add a gradient overlay to the header */
-        .main-title::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: linear-gradient(135deg, rgba(43, 108, 176, 0.5) 0%, rgba(37, 64, 143, 0.3) 100%);
-            border-radius: 12px;
-            z-index: -1;
-        }}
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
+from core.chart_cache import ChartCache
+from core.chart_pool import ChartProcessPool, load_figure
+from core import indicator_metadata
+from core.dataset_registry import DEFAULT_DATASET
+from core.static_assets import build_assets
+from core.chart_functions import get_chart_functions
+
+# Số biểu đồ tối đa được giữ trong bộ nhớ đệm của mỗi tiến trình server
+CHART_CACHE_SIZE = 64
+# Thư mục chứa các nguồn dữ liệu CSV, mỗi file là một bộ dữ liệu có thể chọn
+DATA_DIRECTORY = 'attached_assets'
+# Tổng bộ nhớ (byte) cho các bộ dữ liệu đã tải; bộ ít dùng nhất bị giải phóng trước
+DATASET_MEMORY_BUDGET = 2 * 1024 ** 3
+# Khoảng thời gian ngắn nhất có thể chọn, tính theo số mốc thời gian (tháng) có dữ liệu
+MIN_WINDOW_MONTHS = 12
+# Số giây giữa hai lần kiểm tra file CSV để nạp các tháng mới được ghi thêm
+DATA_WATCH_INTERVAL = 30.0
+# Nhóm chỉ số trong phần chọn chỉ số và nhóm biểu đồ trong phần chọn biểu đồ
+INDICATOR_GROUPS = {
+    "Lạm phát và Giá cả": ["Core_Inlation", "Food_Inflation", "MonthlyCPI", "China_CPI"],
+    "Thương mại": ["Export", "Import", "VN_Trade_Balance", "USD_VND"],
+    "Hàng hóa": ["Brent", "Gold", "VN_Gasoline_Prices", "VN_rice_price", "VN_coffee,tea,mate,spices"],
+    "Kinh tế vĩ mô": ["Industrial_products", "Agriculture, Forestry and Fishing", "Unemployment Rate", 
+                   "VN_fiscal_deficit", "VN_Interest_Rate", "VN_money_supply"]
+}
+CHART_GROUPS = {
+    "Phân tích xu hướng": ["Biểu đồ xu hướng", "Biểu đồ xu hướng chi tiết", "Biểu đồ vùng"],
+    "Phân tích so sánh": ["Biểu đồ cột", "Biểu đồ bánh"],
+    "Phân tích mối quan hệ": ["Biểu đồ phân tán", "Ma trận tương quan", "Biểu đồ bong bóng"],
+    "Phân tích phân phối": ["Biểu đồ hộp", "Biểu đồ histogram"],
+    "Phân tích theo mùa": ["Biểu đồ mùa vụ", "Bản đồ nhiệt thời gian"],
+    "Phân tích đa chiều": ["Biểu đồ radar", "Biểu đồ dòng chảy"]
+}
+# Các file CSS (UTF-8 hoặc UTF-16) được gộp theo thứ tự này thành một file đã rút gọn
+STYLESHEETS = ['streamlit/background.css', 'streamlit/style.css', 'streamlit/app.css']
+BACKGROUND_IMAGE = 'Lovepik_com-401947920-blue-gradient-geometric-background.jpg'
+# Thư mục static cạnh app.py, được Streamlit phục vụ tại app/static khi bật enableStaticServing
+STATIC_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+# Số cột hiển thị ở chế độ bảng điều khiển
+DASHBOARD_COLUMNS = 2
+# Số tiến trình con dựng biểu đồ của bảng điều khiển song song; với 1 CPU
+# các biểu đồ được dựng lần lượt trong tiến trình server
+DASHBOARD_WORKERS = min(6, os.cpu_count() or 1)
+# Giá trị trả về của bộ nhớ đệm khi biểu đồ chưa được dựng (None là biểu đồ không áp dụng được)
+NOT_CACHED = object()
+
+# Không hiện spinner: hàm được gọi khi nạp module, trước st.set_page_config
+@st.cache_resource(show_spinner=False)
+def get_handlers():
+    """Khởi tạo các handler một lần cho mỗi tiến trình server"""
+    from core.data_handler import data_handler
+    from core.visualization_handler import viz_handler, VisualizationHandler
+    # Các tháng mới ghi thêm vào CSV được nối vào dữ liệu mà không cần khởi động lại;
+    # data_version thay đổi nên các phiên đang mở vẽ lại biểu đồ ở lần tương tác tiếp theo
+    data_handler.watch(DATA_WATCH_INTERVAL)
+    return data_handler, viz_handler, VisualizationHandler
+
+@st.cache_resource
+def get_dataset_registry():
+    """Danh sách các bộ dữ liệu, chỉ tải khi được chọn lần đầu"""
+    from core.dataset_registry import dataset_registry
+    dataset_registry.memory_budget = DATASET_MEMORY_BUDGET
+    # Mỗi bộ dữ liệu đang trong bộ nhớ cũng nạp các tháng mới ghi thêm vào CSV của nó
+    dataset_registry.watch_interval = DATA_WATCH_INTERVAL
+    dataset_registry.register_directory(DATA_DIRECTORY)
+    return dataset_registry
+
+def get_dataset_handlers(dataset=DEFAULT_DATASET):
+    """Lấy data handler và viz handler của một bộ dữ liệu"""
+    if dataset == DEFAULT_DATASET:
+        return data_handler, viz_handler
+    dataset_handler = get_dataset_registry().get(dataset)
+    # Không giữ viz handler lâu dài để bộ dữ liệu bị giải phóng có thể thu hồi bộ nhớ
+    return dataset_handler, VisualizationHandler(data_handler=dataset_handler)
+
+@st.cache_resource
+def get_chart_cache():
+    """Bộ nhớ đệm biểu đồ dùng chung giữa các lần chạy lại và các phiên"""
+    return ChartCache(maxsize=CHART_CACHE_SIZE)
+
+# Không hiện spinner, như get_handlers
+@st.cache_resource(show_spinner=False)
+def get_chart_pool():
+    """Các tiến trình con dựng biểu đồ cho bảng điều khiển, None khi chỉ có 1 CPU"""
+    if DASHBOARD_WORKERS < 2:
+        return None
+    chart_pool = ChartProcessPool(DASHBOARD_WORKERS)
+    # Các tiến trình con khởi động trong nền, trước khi bảng điều khiển được mở
+    chart_pool.start()
+    return chart_pool
+
+@st.cache_resource
+def get_static_assets():
+    """Gộp, rút gọn CSS và xuất bản ảnh nền vào thư mục static một lần"""
+    return build_assets(STYLESHEETS, BACKGROUND_IMAGE, STATIC_DIRECTORY)
+
+@st.cache_resource
+def get_inline_styles():
+    """Thẻ <style> chứa CSS đã rút gọn và ảnh nền, dựng một lần cho mỗi tiến trình"""
+    assets = get_static_assets()
+    if not st.get_option("server.enableStaticServing"):
+        print("server.enableStaticServing is off (see .streamlit/config.toml), the background image is not shown")
+        return f'<style>{assets["css"]}</style>'
+    return f'<style>.stApp{{background-image:url("{assets["background_url"]}")}}{assets["css"]}</style>'
+
+# Các tiến trình con dựng biểu đồ (multiprocessing spawn) chạy lại file này
+# với __name__ == '__mp_main__': chúng không tải dữ liệu, không theo dõi CSV
+# và không tạo tiến trình con của riêng chúng
+if __name__ != '__mp_main__':
+    data_handler, viz_handler, VisualizationHandler = get_handlers()
+    get_chart_pool()
+
+def add_static_assets():
+    """Thêm CSS và ảnh nền của ứng dụng
+    
+    CSS được nhúng trực tiếp vì Streamlit phục vụ file .css tĩnh với kiểu
+    text/plain (kèm nosniff) nên trình duyệt không áp dụng. Thông điệp trên
+    10 KB được trình duyệt lưu đệm theo mã băm (global.minCachedMessageSize),
+    nên CSS chỉ được gửi một lần mỗi phiên, các lần chạy lại chỉ gửi mã băm.
+    Ảnh nền được tải từ app/static và trình duyệt lưu vào bộ nhớ đệm.
+    """
+    st.markdown(get_inline_styles(), unsafe_allow_html=True)
 
 def get_chart_recommendations(selected_indicators):
     """Lấy các đề xuất biểu đồ phù hợp dựa trên số lượng chỉ số được chọn"""
-    num_indicators = len(selected_indicators)
-    
-    recommendations = {
-        'Biểu đồ xu hướng': {
-            'icon': '📈',
-            'description': 'Hiển thị biến động các chỉ số theo thời gian',
-            'conditions': 'Phù hợp với 1-5 chỉ số',
-            'status': 'recommended' if 1 <= num_indicators <= 5 else 'possible' if num_indicators > 5 else 'not_recommended'
-        },
-        'Biểu đồ vùng': {
-            'icon': '🏞️',
-            'description': 'Hiển thị xu hướng với diện tích tô màu',
-            'conditions': 'Phù hợp với 2-5 chỉ số',
-            'status': 'recommended' if 2 <= num_indicators <= 5 else 'possible' if num_indicators > 5 else 'not_recommended'
-        },
-        'Biểu đồ cột': {
-            'icon': '📊',
-            'description': 'So sánh giá trị các chỉ số theo thời gian',
-            'conditions': 'Phù hợp với 1-6 chỉ số',
-            'status': 'recommended' if 1 <= num_indicators <= 6 else 'possible' if num_indicators > 6 else 'not_recommended'
-        },
-        'Biểu đồ phân tán': {
-            'icon': '🔍',
-            'description': 'Phân tích tương quan giữa hai chỉ số',
-            'conditions': 'Chính xác 2 chỉ số',
-            'status': 'recommended' if num_indicators == 2 else 'not_recommended'
-        },
-        'Ma trận tương quan': {
-            'icon': '🧩',
-            'description': 'Hiển thị mối tương quan giữa nhiều chỉ số',
-            'conditions': 'Từ 2 chỉ số trở lên',
-            'status': 'recommended' if num_indicators >= 4 else 'possible' if num_indicators >= 2 else 'not_recommended'
-        },
-        'Biểu đồ bong bóng': {
-            'icon': '🫧',
-            'description': 'Phân tích mối quan hệ giữa 3 chỉ số',
-            'conditions': 'Chính xác 3 chỉ số',
-            'status': 'recommended' if num_indicators == 3 else 'not_recommended'
-        },
-        'Biểu đồ mùa vụ': {
-            'icon': '📅',
-            'description': 'Phân tích biến động theo mùa của một chỉ số',
-            'conditions': 'Chính xác 1 chỉ số',
-            'status': 'recommended' if num_indicators == 1 else 'not_recommended'
-        },
-        'Biểu đồ xu hướng chi tiết': {
-            'icon': '📉',
-            'description': 'Phân tích xu hướng dài hạn của một chỉ số',
-            'conditions': 'Chính xác 1 chỉ số',
-            'status': 'recommended' if num_indicators == 1 else 'not_recommended'
-        },
-        'Biểu đồ hộp': {
-            'icon': '📦',
-            'description': 'Hiển thị phân phối và giá trị bất thường',
-            'conditions': 'Từ 1 chỉ số trở lên',
-            'status': 'recommended' if 1 <= num_indicators <= 6 else 'possible' if num_indicators > 6 else 'not_recommended'
-        },
-        'Biểu đồ radar': {
-            'icon': '🕸️',
-            'description': 'So sánh giá trị chuẩn hóa nhiều chỉ số',
-            'conditions': 'Từ 3 chỉ số trở lên',
-            'status': 'recommended' if num_indicators >= 3 and num_indicators <= 8 else 'possible' if num_indicators > 8 else 'not_recommended'
-        },
-        'Bản đồ nhiệt thời gian': {
-            'icon': '🗓️',
-            'description': 'Phân tích biến động theo tháng và năm',
-            'conditions': 'Chính xác 1 chỉ số',
-            'status': 'recommended' if num_indicators == 1 else 'not_recommended'
-        },
-        'Biểu đồ dòng chảy': {
-            'icon': '🌊',
-            'description': 'Hiển thị sự thay đổi theo thời gian',
-            'conditions': 'Từ 1-5 chỉ số',
-            'status': 'recommended' if 1 <= num_indicators <= 5 else 'possible' if num_indicators > 5 else 'not_recommended'
-        },
-        'Biểu đồ bánh': {
-            'icon': '🥧',
-            'description': 'So sánh tỷ trọng tại một thời điểm',
-            'conditions': 'Từ 2 chỉ số trở lên',
-            'status': 'recommended' if num_indicators >= 2 and num_indicators <= 7 else 'possible' if num_indicators > 7 else 'not_recommended'
-        },
-        'Biểu đồ histogram': {
-            'icon': '📊',
-            'description': 'Phân tích phân phối tần suất giá trị',
-            'conditions': 'Chính xác 1 chỉ số',
-            'status': 'recommended' if num_indicators == 1 else 'not_recommended'
-        }
-    }
-    
-    # Sắp xếp theo mức độ phù hợp: recommended -> possible -> not_recommended
-    sorted_charts = {}
-    # Thêm các biểu đồ được đề xuất trước
-    for chart, info in recommendations.items():
-        if info['status'] == 'recommended':
-            sorted_charts[chart] = info
-            
-    # Sau đó là biểu đồ có thể dùng được
-    for chart, info in recommendations.items():
-        if info['status'] == 'possible':
-            sorted_charts[chart] = info
-            
-    # Cuối cùng là biểu đồ không phù hợp
-    for chart, info in recommendations.items():
-        if info['status'] == 'not_recommended':
-            sorted_charts[chart] = info
-    
-    return sorted_charts
+    # Kết quả được tính sẵn theo số lượng chỉ số trong registry metadata
+    return indicator_metadata.get_chart_recommendations(len(selected_indicators))
 
 def get_indicator_explanation_safe(indicator):
     """Lấy thông tin giải thích an toàn về chỉ số, tránh KeyError"""
@@ -236,7 +141,11 @@ def get_indicator_explanation_safe(indicator):
             'threshold': {}
         }
     
-    # Đảm bảo tất cả các khóa cần thiết đều tồn tại
+    # Đảm bảo tất cả các khóa cần thiết đều tồn tại, không sửa registry dùng chung
+    required_keys = ('title', 'description', 'impact', 'interpretation', 'threshold')
+    if all(key in explanation for key in required_keys):
+        return explanation
+    explanation = dict(explanation)
     if 'title' not in explanation:
         explanation['title'] = indicator
     if 'description' not in explanation:
@@ -250,30 +159,127 @@ def get_indicator_explanation_safe(indicator):
         
     return explanation
 
-def create_chart(selected_chart, selected_indicators):
-    """Tạo biểu đồ dựa trên loại biểu đồ và các chỉ số được chọn"""
-    # Ánh xạ tên biểu đồ với hàm tạo biểu đồ tương ứng
-    chart_functions = {
-        'Biểu đồ xu hướng': lambda x: viz_handler.create_line_chart(x) if x else None,
-        'Biểu đồ cột': lambda x: viz_handler.create_bar_chart(x) if x else None,
-        'Biểu đồ phân tán': lambda x: viz_handler.create_scatter_plot(x) if len(x) == 2 else None,
-        'Ma trận tương quan': lambda x: viz_handler.create_correlation_heatmap(x) if len(x) >= 2 else None,
-        'Biểu đồ mùa vụ': lambda x: viz_handler.create_seasonal_chart(x[0]) if x else None,
-        'Biểu đồ xu hướng chi tiết': lambda x: viz_handler.create_trend_chart(x[0]) if x else None,
-        'Biểu đồ hộp': lambda x: viz_handler.create_box_plot(x) if x else None,
-        'Biểu đồ histogram': lambda x: viz_handler.create_histogram(x[0]) if x else None,
-        'Biểu đồ vùng': lambda x: viz_handler.create_area_chart(x) if len(x) >= 2 else None,
-        'Biểu đồ radar': lambda x: viz_handler.create_radar_chart(x) if len(x) >= 3 else None,
-        'Biểu đồ bong bóng': lambda x: viz_handler.create_bubble_chart(x) if len(x) == 3 else None,
-        'Bản đồ nhiệt thời gian': lambda x: viz_handler.create_calendar_heatmap(x[0]) if x else None,
-        'Biểu đồ dòng chảy': lambda x: viz_handler.create_sankey_chart(x) if x else None,
-        'Biểu đồ bánh': lambda x: viz_handler.create_pie_chart(x) if len(x) >= 2 else None
-    }
+def create_chart(selected_chart, selected_indicators, window=(None, None), dataset=DEFAULT_DATASET):
+    """Tạo biểu đồ dựa trên loại biểu đồ, các chỉ số và khoảng thời gian được chọn
+    
+    Biểu đồ đã tạo được lưu theo (bộ dữ liệu, loại biểu đồ, chỉ số, khoảng thời
+    gian, phiên bản dữ liệu) nên các lần chạy lại của Streamlit không dựng lại
+    biểu đồ không thay đổi. Thứ tự chỉ số được giữ nguyên vì nó quyết định trục
+    của biểu đồ phân tán và biểu đồ bong bóng.
+    """
+    dataset_handler, dataset_viz_handler = get_dataset_handlers(dataset)
+    # Dựng từ bản chụp dữ liệu hiện tại: nếu dữ liệu được nạp lại trong lúc
+    # dựng, biểu đồ vẫn dùng phiên bản khớp với khóa bộ nhớ đệm
+    snapshot = dataset_handler.snapshot
+    return get_chart_cache().get_or_create(
+        get_chart_cache_key(dataset, selected_chart, selected_indicators, window, snapshot),
+        lambda: build_chart(selected_chart, selected_indicators, window, dataset_viz_handler.with_data(snapshot))
+    )
+
+def get_chart_cache_key(dataset, selected_chart, selected_indicators, window, snapshot):
+    """Khóa bộ nhớ đệm của một biểu đồ dựng từ bản chụp dữ liệu snapshot"""
+    return (dataset, selected_chart, tuple(selected_indicators), tuple(window), snapshot.data_version)
+
+def render_dashboard(selected_charts, selected_indicators, window=(None, None), dataset=DEFAULT_DATASET):
+    """Hiển thị các biểu đồ đã chọn cạnh nhau, mỗi biểu đồ hiện ra ngay khi dựng xong
+    
+    Biểu đồ đã có trong bộ nhớ đệm hiện ngay. Các biểu đồ còn lại được dựng
+    song song trong các tiến trình con (việc dựng biểu đồ plotly giữ GIL nên
+    dựng bằng luồng không nhanh hơn), từ cùng một bản chụp dữ liệu, nên bảng
+    điều khiển mất khoảng thời gian của biểu đồ chậm nhất. Lỗi của một biểu
+    đồ chỉ hiện trong ô của biểu đồ đó.
+    """
+    # Giữ chỗ cho mọi biểu đồ trước để bố cục hiện ngay và không thay đổi
+    placeholders = {}
+    for i in range(0, len(selected_charts), DASHBOARD_COLUMNS):
+        columns = st.columns(DASHBOARD_COLUMNS)
+        for column, chart in zip(columns, selected_charts[i:i + DASHBOARD_COLUMNS]):
+            with column:
+                st.markdown(f"<h4>{chart}</h4>", unsafe_allow_html=True)
+                placeholders[chart] = st.empty()
+                placeholders[chart].info("⏳ Đang dựng biểu đồ...")
+    
+    dataset_handler, _ = get_dataset_handlers(dataset)
+    snapshot = dataset_handler.snapshot
+    chart_cache = get_chart_cache()
+    chart_pool = get_chart_pool()
+    
+    # Gửi các biểu đồ chưa có trong bộ nhớ đệm cho các tiến trình con
+    pending = {}
+    for chart in selected_charts:
+        cache_key = get_chart_cache_key(dataset, chart, selected_indicators, window, snapshot)
+        fig = chart_cache.get(cache_key, NOT_CACHED)
+        try:
+            if fig is NOT_CACHED and chart_pool is not None:
+                future = chart_pool.submit(snapshot, chart, selected_indicators, window, dataset_handler.indicator_dtype)
+                pending[future] = chart, cache_key
+                continue
+            if fig is NOT_CACHED:
+                fig = create_chart(chart, selected_indicators, window, dataset)
+        except Exception as e:
+            placeholders[chart].error(f"Lỗi khi tạo biểu đồ: {e}")
+            continue
+        show_dashboard_chart(placeholders[chart], chart, fig)
+    
+    for future in as_completed(pending):
+        chart, cache_key = pending[future]
+        try:
+            fig = load_figure(future.result())
+        except Exception as e:
+            placeholders[chart].error(f"Lỗi khi tạo biểu đồ: {e}")
+            continue
+        chart_cache.put(cache_key, fig)
+        show_dashboard_chart(placeholders[chart], chart, fig)
+
+def show_dashboard_chart(placeholder, chart, fig):
+    """Hiển thị một biểu đồ của bảng điều khiển vào ô giữ chỗ của nó"""
+    if fig:
+        placeholder.plotly_chart(fig, use_container_width=True, key=f"dashboard_{chart}")
+    else:
+        placeholder.warning("Không thể tạo biểu đồ này với các chỉ số đã chọn")
+
+def build_chart(selected_chart, selected_indicators, window=(None, None), chart_viz_handler=None):
+    """Dựng biểu đồ mới, không qua bộ nhớ đệm"""
+    chart_functions = get_chart_functions(chart_viz_handler or viz_handler)
     
     if selected_chart in chart_functions:
-        return chart_functions[selected_chart](selected_indicators)
+        start, end = window
+        return chart_functions[selected_chart](selected_indicators, start=start, end=end)
     return None
 
+def select_dataset():
+    """Hộp chọn bộ dữ liệu, chỉ hiển thị khi có nhiều hơn một nguồn"""
+    names = get_dataset_registry().names()
+    if len(names) < 2:
+        return DEFAULT_DATASET
+    return st.selectbox("🗂️ Bộ dữ liệu", options=names, key="dataset")
+
+def select_time_window(dataset=DEFAULT_DATASET):
+    """Thanh chọn khoảng thời gian; trả về (None, None) khi chọn toàn bộ dữ liệu"""
+    dataset_handler, _ = get_dataset_handlers(dataset)
+    dates = dataset_handler.data['Date'].tolist() if not dataset_handler.data.empty else []
+    if len(dates) < 2:
+        return None, None
+    
+    start, end = st.select_slider(
+        "🕒 Khoảng thời gian phân tích",
+        options=dates,
+        value=(dates[0], dates[-1]),
+        key="time_window"
+    )
+    # Các biểu đồ mùa vụ, tương quan... cần tối thiểu MIN_WINDOW_MONTHS tháng
+    start_pos, end_pos = dates.index(start), dates.index(end)
+    if end_pos - start_pos + 1 < MIN_WINDOW_MONTHS:
+        start_pos = max(0, end_pos - MIN_WINDOW_MONTHS + 1)
+        end_pos = min(len(dates) - 1, start_pos + MIN_WINDOW_MONTHS - 1)
+        start, end = dates[start_pos], dates[end_pos]
+        st.caption(f"Khoảng thời gian được mở rộng thành {start} – {end} (tối thiểu {MIN_WINDOW_MONTHS} mốc thời gian)")
+    
+    # Toàn bộ dữ liệu dùng chung bộ nhớ đệm và thống kê đã tính sẵn
+    if start == dates[0] and end == dates[-1]:
+        return None, None
+    return start, end
+
 def get_chart_explanation(selected_chart):
     """Lấy giải thích về cách đọc biểu đồ"""
     explanation = viz_handler.get_chart_explanation(selected_chart)
@@ -331,567 +337,425 @@ def suggest_charts(selected_indicators):
     
     return list(set(suggestions))  # Loại bỏ trùng lặp
 
-def main():
-    """Hàm chính của ứng dụng Streamlit"""
-    st.set_page_config(page_title="Economic Data Analyzer", page_icon="📊", layout="wide")
+def get_selected_dataset():
+    """Bộ dữ liệu đang chọn, đọc từ trạng thái của hộp chọn"""
+    return st.session_state.get("dataset", DEFAULT_DATASET)
+
+def get_selected_indicators(dataset=DEFAULT_DATASET):
+    """Các chỉ số đang được đánh dấu, theo thứ tự hiển thị của các nhóm"""
+    dataset_handler, _ = get_dataset_handlers(dataset)
+    return [
+        indicator
+        for indicators in INDICATOR_GROUPS.values()
+        for indicator in indicators
+        if indicator in dataset_handler.available_indicators and st.session_state.get(f"checkbox_{indicator}")
+    ]
+
+def get_selected_charts(recommendations):
+    """Các loại biểu đồ đang được đánh dấu, theo thứ tự hiển thị"""
+    return [
+        chart_type
+        for chart_types in CHART_GROUPS.values()
+        for chart_type in chart_types
+        if chart_type in recommendations and st.session_state.get(f"chart_{chart_type}")
+    ]
+
+def get_dashboard_mode():
+    """Chế độ bảng điều khiển có đang bật hay không"""
+    return st.session_state.get("dashboard_mode", False)
+
+@st.fragment
+def indicator_panel(dataset, selected_indicators):
+    """Phần chọn bộ dữ liệu và chỉ số
     
-    # Thêm ảnh nền
-    add_bg_from_local("Lovepik_com-401947920-blue-gradient-geometric-background.jpg")
+    Mọi phần khác của trang phụ thuộc vào bộ dữ liệu và các chỉ số đã chọn,
+    nên khi chúng thay đổi cả trang được chạy lại; mở/đóng các nhóm chỉ số
+    không chạy lại gì.
+    """
+    if get_selected_dataset() != dataset or get_selected_indicators(dataset) != selected_indicators:
+        st.rerun()
     
-    # Tiêu đề duy nhất ở giữa trang
     st.markdown("""
-    <div class="main-title">
-        <h1>Economic Data Analyzer</h1>
-        <h2>📊 Phân Tích Dữ Liệu Kinh Tế</h2>
-        <p>Phân tích dữ liệu kinh tế Việt Nam qua các chỉ số vĩ mô quan trọng.</p>
-        <p>Khám phá xu hướng và mối quan hệ giữa các chỉ số kinh tế quan trọng của Việt Nam</p>
-    </div>
+        <div class="panel">
+            <h2><i class="fas fa-chart-line"></i> Chọn Chỉ Số Kinh Tế</h2>
+            <p class="panel-description">Chọn một hoặc nhiều chỉ số để phân tích. Mỗi chỉ số sẽ được hiển thị với màu sắc riêng trên biểu đồ.</p>
+        </div>
     """, unsafe_allow_html=True)
+    
+    # Chọn bộ dữ liệu (nguồn CSV) để phân tích
+    select_dataset()
+    dataset_handler, _ = get_dataset_handlers(dataset)
+    
+    for group_name, indicators in INDICATOR_GROUPS.items():
+        # Sử dụng expander mặc định của Streamlit nhưng tùy chỉnh CSS đẹp hơn
+        available_indicators = [ind for ind in indicators if ind in dataset_handler.available_indicators]
+        selected_count = sum(1 for ind in available_indicators if ind in selected_indicators)
+        
+        with st.expander(f"📌 {group_name} ({selected_count}/{len(available_indicators)})", expanded=True):
+            for indicator in available_indicators:
+                st.checkbox(
+                    viz_handler.indicator_names.get(indicator, indicator),
+                    key=f"checkbox_{indicator}",
+                    help=viz_handler.get_indicator_explanation(indicator)['description']
+                )
 
-    # Load custom CSS
-    with open('.streamlit/style.css') as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
-
-    # Add custom CSS for the visualization section
+def chart_guide(selected_indicators):
+    """Nguyên tắc và gợi ý chọn biểu đồ, chỉ phụ thuộc vào các chỉ số đã chọn"""
+    # General guidelines for chart selection
     st.markdown("""
-    <style>
-    /* Styles for the visualization section */
-    .section-header {
-        background-color: white;
-        border-bottom: 2px solid #e2e8f0;
-        padding: 15px;
-        border-radius: 10px 10px 0 0;
-        box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-    }
-    
-    .section-header h2 {
-        color: #1e293b;
-        font-size: 24px;
-        font-weight: bold;
-        margin: 0;
-        padding: 0;
-    }
-    
-    .chart-explanation {
-        background-color: white;
-        padding: 20px;
-        border-radius: 8px;
-        border: 1px solid #e2e8f0;
-        margin-top: 20px;
-        box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
-    }
-    
-    .chart-explanation h3 {
-        color: #1e293b;
-        border-bottom: 2px solid #e2e8f0;
-        padding-bottom: 10px;
-        margin-bottom: 15px;
-    }
-    
-    .chart-explanation h4 {
-        color: #1e293b;
-        margin-top: 15px;
-        margin-bottom: 10px;
-    }
-    
-    .chart-explanation ul {
-        padding-left: 20px;
-    }
-    
-    .chart-explanation li {
-        margin-bottom: 8px;
-    }
-    
-    /* Force white background for Plotly chart container */
-    [data-testid="stPlotlyChart"] {
-        background-color: white !important;
-        padding: 20px;
-        border-radius: 8px;
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-        border: 1px solid #e2e8f0;
-    }
-    
-    /* Cải thiện hiển thị biểu đồ cột */
-    .js-plotly-plot .plotly .bars .point path {
-        stroke-width: 1px !important;
-        stroke: #000 !important;
-    }
-    
-    /* Tăng kích thước chữ trong trục */
-    .js-plotly-plot .plotly .xtick text,
-    .js-plotly-plot .plotly .ytick text {
-        font-size: 12px !important;
-    }
-    
-    /* Nền trắng cho vùng biểu đồ */
-    .js-plotly-plot .plotly .plot-container {
-        background-color: white !important;
-    }
-    
-    /* Làm đậm đường lưới để dễ đọc */
-    .js-plotly-plot .plotly .gridlayer path {
-        stroke-width: 0.5px !important;
-        stroke: rgba(150, 150, 150, 0.5) !important;
-    }
-    </style>
+    <div style="background-color: #f8f8f8; padding: 10px; border-radius: 5px; margin-bottom: 15px;">
+        <h4 style="margin-top: 0;">🧭 Nguyên tắc chọn biểu đồ phù hợp:</h4>
+        <ul style="margin-bottom: 0; padding-left: 20px;">
+            <li><b>Phân tích xu hướng</b>: Dùng biểu đồ đường/xu hướng cho dữ liệu theo thời gian</li>
+            <li><b>Phân tích so sánh</b>: Dùng biểu đồ cột/thanh để so sánh giá trị</li>
+            <li><b>Phân tích mối quan hệ</b>: Dùng scatter plot cho phân tích tương quan</li>
+            <li><b>Phân tích phân phối</b>: Dùng box plot/histogram cho phân bố dữ liệu</li>
+            <li><b>Phân tích đa chỉ số</b>: Dùng radar chart cho phân tích nhiều chỉ số</li>
+        </ul>
+    </div>
     """, unsafe_allow_html=True)
-
-    # Main container
-    with st.container():
-        # Selection panels
-        col1, col2 = st.columns([1, 2])
-        
-        with col1:
+    
+    # Thêm gợi ý biểu đồ dựa trên chỉ số đã chọn
+    if selected_indicators:
+        suggested_charts = suggest_charts(selected_indicators)
+        if suggested_charts:
             st.markdown("""
-                <div class="panel">
-                    <h2><i class="fas fa-chart-line"></i> Chọn Chỉ Số Kinh Tế</h2>
-                    <p class="panel-description">Chọn một hoặc nhiều chỉ số để phân tích. Mỗi chỉ số sẽ được hiển thị với màu sắc riêng trên biểu đồ.</p>
-                </div>
+            <div style="background-color: #f8f9fa; border-radius: 5px; padding: 10px; margin-bottom: 15px; border-left: 4px solid #4CAF50;">
+                <h4 style="margin-top: 0; color: #2E7D32;">🧠 Gợi ý biểu đồ phù hợp</h4>
+                <p style="margin-bottom: 5px;">Dựa trên các chỉ số bạn đã chọn, chúng tôi gợi ý các loại biểu đồ sau:</p>
+                <ul style="margin-bottom: 0;">
             """, unsafe_allow_html=True)
             
-            # Thêm CSS để làm gọn gàng hơn phần chọn chỉ số
-            st.markdown("""
-            <style>
-            /* Thu gọn không gian trong hộp chọn chỉ số */
-            .stCheckbox {
-                margin-bottom: 0px !important;
-                padding-bottom: 0px !important;
-                min-height: 25px !important;
-            }
+            for chart in suggested_charts:
+                st.markdown(f"<li><b>{chart}</b></li>", unsafe_allow_html=True)
             
-            /* Giảm kích thước font và padding */
-            .stCheckbox label {
-                font-size: 0.9rem !important;
-                padding: 3px 0 !important;
-            }
+            st.markdown("</ul></div>", unsafe_allow_html=True)
+    
+    # Thêm chú thích về chỉ số kinh tế đã chọn
+    if selected_indicators:
+        indicator_names_vi = [viz_handler.indicator_names.get(ind, ind) for ind in selected_indicators]
+        indicator_names_str = ", ".join(indicator_names_vi)
+        
+        # Xác định loại chỉ số đã chọn để cung cấp gợi ý phù hợp
+        price_indicators = ['Core_Inlation', 'Food_Inflation', 'VN_Gasoline_Prices', 'Gold', 'MonthlyCPI', 'VN_rice_price', 'China_CPI']
+        trade_indicators = ['Export', 'Import', 'VN_Trade_Balance', 'VN_coffee,tea,mate,spices']
+        rate_indicators = ['USD_VND', 'VN_Interest_Rate', 'Unemployment Rate']
+        production_indicators = ['Industrial_products', 'Agriculture, Forestry and Fishing', 'Brent']
+        
+        selected_price = [ind for ind in selected_indicators if ind in price_indicators]
+        selected_trade = [ind for ind in selected_indicators if ind in trade_indicators]
+        selected_rate = [ind for ind in selected_indicators if ind in rate_indicators]
+        selected_production = [ind for ind in selected_indicators if ind in production_indicators]
+        
+        suggestions = []
+        specific_charts = []
+        
+        # Gợi ý cho chỉ số giá cả
+        if selected_price:
+            price_names = [viz_handler.indicator_names.get(ind, ind) for ind in selected_price]
+            price_str = ", ".join(price_names[:3])
+            if len(price_names) > 3:
+                price_str += f" và {len(price_names) - 3} chỉ số khác"
             
-            /* Làm nhỏ không gian cho expander */
-            .streamlit-expanderHeader {
-                font-size: 0.95rem !important;
-                padding: 5px 10px !important;
-            }
+            suggestions.append(f"<span style='color:#0369a1'><b>{price_str}</b></span>: Sử dụng <b>biểu đồ xu hướng, biểu đồ vùng</b> để theo dõi xu hướng biến động giá theo thời gian.")
             
-            .streamlit-expanderContent {
-                padding: 0px 10px !important;
-            }
-            </style>
-            """, unsafe_allow_html=True)
+            if len(selected_price) == 1:
+                specific_charts.append(f"<b>Biểu đồ xu hướng chi tiết</b> hoặc <b>Biểu đồ mùa vụ</b> giúp phân tích chi tiết {price_names[0]} qua các giai đoạn")
+            elif len(selected_price) >= 2:
+                specific_charts.append(f"<b>Biểu đồ phân tán</b> giúp phân tích mối quan hệ giữa {price_names[0]} và {price_names[1]} (có ảnh hưởng qua lại?)")
+        
+        # Gợi ý cho chỉ số thương mại
+        if selected_trade:
+            trade_names = [viz_handler.indicator_names.get(ind, ind) for ind in selected_trade]
+            trade_str = ", ".join(trade_names[:3])
+            if len(trade_names) > 3:
+                trade_str += f" và {len(trade_names) - 3} chỉ số khác"
             
-            # Group indicators by category
-            indicator_groups = {
-                "Lạm phát và Giá cả": ["Core_Inlation", "Food_Inflation", "MonthlyCPI", "China_CPI"],
-                "Thương mại": ["Export", "Import", "VN_Trade_Balance", "USD_VND"],
-                "Hàng hóa": ["Brent", "Gold", "VN_Gasoline_Prices", "VN_rice_price", "VN_coffee,tea,mate,spices"],
-                "Kinh tế vĩ mô": ["Industrial_products", "Agriculture, Forestry and Fishing", "Unemployment Rate", 
-                               "VN_fiscal_deficit", "VN_Interest_Rate", "VN_money_supply"]
-            }
+            suggestions.append(f"<span style='color:#0369a1'><b>{trade_str}</b></span>: Sử dụng <b>biểu đồ cột, biểu đồ bong bóng</b> để so sánh giá trị và phân tích mối quan hệ.")
+            
+            if 'Export' in selected_trade and 'Import' in selected_trade and 'VN_Trade_Balance' in selected_trade:
+                specific_charts.append("<b>Biểu đồ vùng</b> với 3 chỉ số Xuất khẩu, Nhập khẩu và Cán cân thương mại sẽ thể hiện tốt mối quan hệ giữa chúng")
+            elif len(selected_trade) == 1:
+                specific_charts.append(f"<b>Biểu đồ cột</b> là lựa chọn tốt để so sánh giá trị {trade_names[0]} theo từng giai đoạn")
+        
+        # Gợi ý cho chỉ số tỷ lệ
+        if selected_rate:
+            rate_names = [viz_handler.indicator_names.get(ind, ind) for ind in selected_rate]
+            rate_str = ", ".join(rate_names[:3])
+            if len(rate_names) > 3:
+                rate_str += f" và {len(rate_names) - 3} chỉ số khác"
             
-            selected_indicators = []
+            suggestions.append(f"<span style='color:#0369a1'><b>{rate_str}</b></span>: Sử dụng <b>biểu đồ xu hướng, biểu đồ phân tán</b> để xem diễn biến và mối tương quan.")
             
-            # Thêm tracking số chỉ số được chọn
-            selected_counts = {group: 0 for group in indicator_groups}
+            if 'USD_VND' in selected_rate and 'VN_Interest_Rate' in selected_rate:
+                specific_charts.append("<b>Biểu đồ phân tán</b> giữa Tỷ giá USD/VND và Lãi suất sẽ cho thấy mối liên hệ giữa chính sách tiền tệ và tỷ giá")
+            elif 'Unemployment Rate' in selected_rate:
+                specific_charts.append("<b>Bản đồ nhiệt thời gian</b> cho Tỷ lệ thất nghiệp giúp phát hiện mẫu hình theo mùa và giai đoạn kinh tế")
+        
+        # Gợi ý cho chỉ số sản xuất
+        if selected_production:
+            prod_names = [viz_handler.indicator_names.get(ind, ind) for ind in selected_production]
+            prod_str = ", ".join(prod_names[:3])
+            if len(prod_names) > 3:
+                prod_str += f" và {len(prod_names) - 3} chỉ số khác"
             
-            for group_name, indicators in indicator_groups.items():
-                # Sử dụng expander mặc định của Streamlit nhưng tùy chỉnh CSS đẹp hơn
-                available_indicators = [ind for ind in indicators if ind in data_handler.available_indicators]
-                
-                with st.expander(f"📌 {group_name} ({sum(1 for ind in available_indicators if f'checkbox_{ind}' in st.session_state and st.session_state[f'checkbox_{ind}'])}/{len(available_indicators)})", expanded=True):
-                    for indicator in available_indicators:
-                        if st.checkbox(
-                            viz_handler.indicator_names.get(indicator, indicator),
-                            key=f"checkbox_{indicator}",
-                            help=viz_handler.get_indicator_explanation(indicator)['description']
-                        ):
-                            selected_indicators.append(indicator)
-                            selected_counts[group_name] += 1
+            suggestions.append(f"<span style='color:#0369a1'><b>{prod_str}</b></span>: Sử dụng <b>biểu đồ hộp, biểu đồ mùa vụ</b> để phân tích phân phối và yếu tố thời vụ.")
             
-            # CSS để làm nhóm chỉ số gọn hơn
+            if 'Brent' in selected_production and ('Industrial_products' in selected_production or 'Agriculture, Forestry and Fishing' in selected_production):
+                specific_charts.append("<b>Biểu đồ phân tán</b> giữa Giá dầu Brent và chỉ số sản xuất sẽ hiển thị ảnh hưởng của giá năng lượng tới sản xuất")
+        
+        # Gợi ý kết hợp giữa nhiều loại chỉ số
+        if len(selected_indicators) >= 2:
+            if any(ind in price_indicators for ind in selected_indicators) and any(ind in trade_indicators for ind in selected_indicators):
+                specific_charts.append("<b>Ma trận tương quan</b> sẽ cho thấy mối liên hệ giữa các chỉ số giá cả và thương mại (như giá dầu ảnh hưởng tới xuất/nhập khẩu)")
+            
+            if len(selected_indicators) >= 3 and len(selected_indicators) <= 8:
+                specific_charts.append(f"<b>Biểu đồ radar</b> sẽ giúp so sánh toàn diện trạng thái của {len(selected_indicators)} chỉ số đã chọn")
+            
+            if len(selected_indicators) > 4:
+                specific_charts.append("<b>Ma trận tương quan</b> giúp nhanh chóng phát hiện các mối tương quan mạnh cần phân tích sâu hơn")
+        
+        # Cải thiện hiển thị bằng cách đơn giản hóa cấu trúc HTML
+        st.markdown(f"""
+            <div style="background-color: #e0f2fe; padding: 15px; border-radius: 5px; margin-bottom: 15px; border: 1px solid #bae6fd;">
+                <p style="margin: 0; color: #0369a1; font-size: 0.95rem;">
+                    <strong>Chỉ số đã chọn:</strong> {indicator_names_str}
+                </p>
+        """, unsafe_allow_html=True)
+        
+        # Hiển thị từng gợi ý riêng biệt
+        if suggestions:
             st.markdown("""
-            <style>
-                .st-expander {
-                    border: 1px solid #e0e0e0 !important;
-                    border-radius: 4px !important;
-                    margin-bottom: 8px !important;
-                    background-color: white !important;
-                }
-                .st-expander-header {
-                    padding: 6px 10px !important;
-                    background-color: #f9fafb !important;
-                }
-                .st-expander-content {
-                    padding: 6px 10px !important;
-                }
-                div.row-widget.stCheckbox {
-                    margin-bottom: 2px !important;
-                    font-size: 0.9rem !important;
-                }
-                div.row-widget.stCheckbox label {
-                    padding-top: 0 !important;
-                    padding-bottom: 0 !important;
-                }
-                [data-testid="stExpander"] {
-                    border: 1px solid #e0e0e0 !important;
-                }
-            </style>
+                <p style="margin: 10px 0 0 0; color: #0369a1; font-size: 0.9rem;">
+                    <strong>Gợi ý biểu đồ phù hợp:</strong>
+                </p>
             """, unsafe_allow_html=True)
-
-        with col2:
-            st.subheader("📊 Chọn biểu đồ phân tích")
             
-            # General guidelines for chart selection
+            for suggestion in suggestions:
+                st.markdown(f"<p style='margin: 5px 0 0 15px; color: #0369a1; font-size: 0.85rem;'>• {suggestion}</p>", unsafe_allow_html=True)
+        
+        # Hiển thị các gợi ý cụ thể
+        if specific_charts:
             st.markdown("""
-            <div style="background-color: #f8f8f8; padding: 10px; border-radius: 5px; margin-bottom: 15px;">
-                <h4 style="margin-top: 0;">🧭 Nguyên tắc chọn biểu đồ phù hợp:</h4>
-                <ul style="margin-bottom: 0; padding-left: 20px;">
-                    <li><b>Phân tích xu hướng</b>: Dùng biểu đồ đường/xu hướng cho dữ liệu theo thời gian</li>
-                    <li><b>Phân tích so sánh</b>: Dùng biểu đồ cột/thanh để so sánh giá trị</li>
-                    <li><b>Phân tích mối quan hệ</b>: Dùng scatter plot cho phân tích tương quan</li>
-                    <li><b>Phân tích phân phối</b>: Dùng box plot/histogram cho phân bố dữ liệu</li>
-                    <li><b>Phân tích đa chỉ số</b>: Dùng radar chart cho phân tích nhiều chỉ số</li>
-                </ul>
-            </div>
+                <p style="margin: 10px 0 0 0; color: #0369a1; font-size: 0.9rem;">
+                    <strong>Gợi ý cụ thể:</strong>
+                </p>
             """, unsafe_allow_html=True)
             
-            # Thêm gợi ý biểu đồ dựa trên chỉ số đã chọn
-            if selected_indicators:
-                suggested_charts = suggest_charts(selected_indicators)
-                if suggested_charts:
-                    st.markdown("""
-                    <div style="background-color: #f8f9fa; border-radius: 5px; padding: 10px; margin-bottom: 15px; border-left: 4px solid #4CAF50;">
-                        <h4 style="margin-top: 0; color: #2E7D32;">🧠 Gợi ý biểu đồ phù hợp</h4>
-                        <p style="margin-bottom: 5px;">Dựa trên các chỉ số bạn đã chọn, chúng tôi gợi ý các loại biểu đồ sau:</p>
-                        <ul style="margin-bottom: 0;">
-                    """, unsafe_allow_html=True)
-                    
-                    for chart in suggested_charts:
-                        st.markdown(f"<li><b>{chart}</b></li>", unsafe_allow_html=True)
-                    
-                    st.markdown("</ul></div>", unsafe_allow_html=True)
+            for chart in specific_charts:
+                st.markdown(f"<p style='margin: 5px 0 0 15px; color: #0369a1; font-size: 0.85rem;'>• {chart}</p>", unsafe_allow_html=True)
+        
+        # Lưu ý cuối cùng
+        st.markdown("""
+            <div style="font-size: 0.85rem; margin-top: 10px; padding-top: 8px; border-top: 1px dashed #bae6fd; color: #0284c7;">
+                <i>💡 Lưu ý: Kết hợp nhiều biểu đồ giúp phân tích toàn diện hơn.</i>
+            </div>
+            </div>
+        """, unsafe_allow_html=True)
+
+def chart_picker(recommendations, selected_charts):
+    """Chọn chế độ bảng điều khiển và các loại biểu đồ được khuyến nghị"""
+    st.subheader("📊 Chọn biểu đồ phân tích")
+    
+    # Chế độ bảng điều khiển: hiển thị cùng lúc mọi biểu đồ được chọn
+    st.toggle(
+        "🧩 Chế độ bảng điều khiển (hiển thị nhiều biểu đồ cạnh nhau)",
+        key="dashboard_mode"
+    )
+    
+    # Display charts by group
+    for group_name, chart_types in CHART_GROUPS.items():
+        available_charts = [ct for ct in chart_types if ct in recommendations]
+        if available_charts:
+            # Thêm mô tả cho từng nhóm
+            group_descriptions = {
+                "Phân tích xu hướng": "Phù hợp để theo dõi biến động dữ liệu theo thời gian",
+                "Phân tích so sánh": "Phù hợp để so sánh giá trị giữa các chỉ số hoặc các kỳ",
+                "Phân tích mối quan hệ": "Phù hợp để tìm mối tương quan giữa các chỉ số",
+                "Phân tích phân phối": "Phù hợp để nghiên cứu phân phối và biến động của dữ liệu",
+                "Phân tích theo mùa": "Phù hợp để phát hiện xu hướng theo mùa và chu kỳ",
+                "Phân tích đa chiều": "Phù hợp để so sánh nhiều chỉ số cùng lúc"
+            }
             
-            # Lấy danh sách biểu đồ được khuyến nghị dựa trên các chỉ số đã chọn
-            recommendations = get_chart_recommendations(selected_indicators)
-            selected_chart = None
+            description = group_descriptions.get(group_name, "")
             
-            # Thêm chú thích về chỉ số kinh tế đã chọn
-            if selected_indicators:
-                indicator_names_vi = [viz_handler.indicator_names.get(ind, ind) for ind in selected_indicators]
-                indicator_names_str = ", ".join(indicator_names_vi)
-                
-                # Xác định loại chỉ số đã chọn để cung cấp gợi ý phù hợp
-                price_indicators = ['Core_Inlation', 'Food_Inflation', 'VN_Gasoline_Prices', 'Gold', 'MonthlyCPI', 'VN_rice_price', 'China_CPI']
-                trade_indicators = ['Export', 'Import', 'VN_Trade_Balance', 'VN_coffee,tea,mate,spices']
-                rate_indicators = ['USD_VND', 'VN_Interest_Rate', 'Unemployment Rate']
-                production_indicators = ['Industrial_products', 'Agriculture, Forestry and Fishing', 'Brent']
-                
-                selected_price = [ind for ind in selected_indicators if ind in price_indicators]
-                selected_trade = [ind for ind in selected_indicators if ind in trade_indicators]
-                selected_rate = [ind for ind in selected_indicators if ind in rate_indicators]
-                selected_production = [ind for ind in selected_indicators if ind in production_indicators]
-                
-                suggestions = []
-                specific_charts = []
-                
-                # Gợi ý cho chỉ số giá cả
-                if selected_price:
-                    price_names = [viz_handler.indicator_names.get(ind, ind) for ind in selected_price]
-                    price_str = ", ".join(price_names[:3])
-                    if len(price_names) > 3:
-                        price_str += f" và {len(price_names) - 3} chỉ số khác"
-                    
-                    suggestions.append(f"<span style='color:#0369a1'><b>{price_str}</b></span>: Sử dụng <b>biểu đồ xu hướng, biểu đồ vùng</b> để theo dõi xu hướng biến động giá theo thời gian.")
-                    
-                    if len(selected_price) == 1:
-                        specific_charts.append(f"<b>Biểu đồ xu hướng chi tiết</b> hoặc <b>Biểu đồ mùa vụ</b> giúp phân tích chi tiết {price_names[0]} qua các giai đoạn")
-                    elif len(selected_price) >= 2:
-                        specific_charts.append(f"<b>Biểu đồ phân tán</b> giúp phân tích mối quan hệ giữa {price_names[0]} và {price_names[1]} (có ảnh hưởng qua lại?)")
-                
-                # Gợi ý cho chỉ số thương mại
-                if selected_trade:
-                    trade_names = [viz_handler.indicator_names.get(ind, ind) for ind in selected_trade]
-                    trade_str = ", ".join(trade_names[:3])
-                    if len(trade_names) > 3:
-                        trade_str += f" và {len(trade_names) - 3} chỉ số khác"
-                    
-                    suggestions.append(f"<span style='color:#0369a1'><b>{trade_str}</b></span>: Sử dụng <b>biểu đồ cột, biểu đồ bong bóng</b> để so sánh giá trị và phân tích mối quan hệ.")
-                    
-                    if 'Export' in selected_trade and 'Import' in selected_trade and 'VN_Trade_Balance' in selected_trade:
-                        specific_charts.append("<b>Biểu đồ vùng</b> với 3 chỉ số Xuất khẩu, Nhập khẩu và Cán cân thương mại sẽ thể hiện tốt mối quan hệ giữa chúng")
-                    elif len(selected_trade) == 1:
-                        specific_charts.append(f"<b>Biểu đồ cột</b> là lựa chọn tốt để so sánh giá trị {trade_names[0]} theo từng giai đoạn")
-                
-                # Gợi ý cho chỉ số tỷ lệ
-                if selected_rate:
-                    rate_names = [viz_handler.indicator_names.get(ind, ind) for ind in selected_rate]
-                    rate_str = ", ".join(rate_names[:3])
-                    if len(rate_names) > 3:
-                        rate_str += f" và {len(rate_names) - 3} chỉ số khác"
-                    
-                    suggestions.append(f"<span style='color:#0369a1'><b>{rate_str}</b></span>: Sử dụng <b>biểu đồ xu hướng, biểu đồ phân tán</b> để xem diễn biến và mối tương quan.")
-                    
-                    if 'USD_VND' in selected_rate and 'VN_Interest_Rate' in selected_rate:
-                        specific_charts.append("<b>Biểu đồ phân tán</b> giữa Tỷ giá USD/VND và Lãi suất sẽ cho thấy mối liên hệ giữa chính sách tiền tệ và tỷ giá")
-                    elif 'Unemployment Rate' in selected_rate:
-                        specific_charts.append("<b>Bản đồ nhiệt thời gian</b> cho Tỷ lệ thất nghiệp giúp phát hiện mẫu hình theo mùa và giai đoạn kinh tế")
-                
-                # Gợi ý cho chỉ số sản xuất
-                if selected_production:
-                    prod_names = [viz_handler.indicator_names.get(ind, ind) for ind in selected_production]
-                    prod_str = ", ".join(prod_names[:3])
-                    if len(prod_names) > 3:
-                        prod_str += f" và {len(prod_names) - 3} chỉ số khác"
-                    
-                    suggestions.append(f"<span style='color:#0369a1'><b>{prod_str}</b></span>: Sử dụng <b>biểu đồ hộp, biểu đồ mùa vụ</b> để phân tích phân phối và yếu tố thời vụ.")
-                    
-                    if 'Brent' in selected_production and ('Industrial_products' in selected_production or 'Agriculture, Forestry and Fishing' in selected_production):
-                        specific_charts.append("<b>Biểu đồ phân tán</b> giữa Giá dầu Brent và chỉ số sản xuất sẽ hiển thị ảnh hưởng của giá năng lượng tới sản xuất")
-                
-                # Gợi ý kết hợp giữa nhiều loại chỉ số
-                if len(selected_indicators) >= 2:
-                    if any(ind in price_indicators for ind in selected_indicators) and any(ind in trade_indicators for ind in selected_indicators):
-                        specific_charts.append("<b>Ma trận tương quan</b> sẽ cho thấy mối liên hệ giữa các chỉ số giá cả và thương mại (như giá dầu ảnh hưởng tới xuất/nhập khẩu)")
-                    
-                    if len(selected_indicators) >= 3 and len(selected_indicators) <= 8:
-                        specific_charts.append(f"<b>Biểu đồ radar</b> sẽ giúp so sánh toàn diện trạng thái của {len(selected_indicators)} chỉ số đã chọn")
-                    
-                    if len(selected_indicators) > 4:
-                        specific_charts.append("<b>Ma trận tương quan</b> giúp nhanh chóng phát hiện các mối tương quan mạnh cần phân tích sâu hơn")
+            st.markdown(f"""
+                <div class="chart-group">
+                    <h4>{group_name}</h4>
+                    <p style="font-size: 0.85rem; color: #64748b; margin-top: 0; margin-bottom: 10px;">{description}</p>
+                </div>
+            """, unsafe_allow_html=True)
+            
+            for chart_type in available_charts:
+                chart = recommendations[chart_type]
+                status_colors = {
+                    'recommended': '#dcfce7',
+                    'possible': '#fef9c3',
+                    'not_recommended': '#fee2e2'
+                }
+                status_icons = {
+                    'recommended': '✅',
+                    'possible': '⚠️',
+                    'not_recommended': '❌'
+                }
+                bg_color = status_colors[chart['status']]
+                status_icon = status_icons[chart['status']]
                 
-                # Cải thiện hiển thị bằng cách đơn giản hóa cấu trúc HTML
                 st.markdown(f"""
-                    <div style="background-color: #e0f2fe; padding: 15px; border-radius: 5px; margin-bottom: 15px; border: 1px solid #bae6fd;">
-                        <p style="margin: 0; color: #0369a1; font-size: 0.95rem;">
-                            <strong>Chỉ số đã chọn:</strong> {indicator_names_str}
-                        </p>
-                """, unsafe_allow_html=True)
-                
-                # Hiển thị từng gợi ý riêng biệt
-                if suggestions:
-                    st.markdown("""
-                        <p style="margin: 10px 0 0 0; color: #0369a1; font-size: 0.9rem;">
-                            <strong>Gợi ý biểu đồ phù hợp:</strong>
-                        </p>
-                    """, unsafe_allow_html=True)
-                    
-                    for suggestion in suggestions:
-                        st.markdown(f"<p style='margin: 5px 0 0 15px; color: #0369a1; font-size: 0.85rem;'>• {suggestion}</p>", unsafe_allow_html=True)
-                
-                # Hiển thị các gợi ý cụ thể
-                if specific_charts:
-                    st.markdown("""
-                        <p style="margin: 10px 0 0 0; color: #0369a1; font-size: 0.9rem;">
-                            <strong>Gợi ý cụ thể:</strong>
-                        </p>
-                    """, unsafe_allow_html=True)
-                    
-                    for chart in specific_charts:
-                        st.markdown(f"<p style='margin: 5px 0 0 15px; color: #0369a1; font-size: 0.85rem;'>• {chart}</p>", unsafe_allow_html=True)
-                
-                # Lưu ý cuối cùng
-                st.markdown("""
-                    <div style="font-size: 0.85rem; margin-top: 10px; padding-top: 8px; border-top: 1px dashed #bae6fd; color: #0284c7;">
-                        <i>💡 Lưu ý: Kết hợp nhiều biểu đồ giúp phân tích toàn diện hơn.</i>
-                    </div>
+                    <div class="chart-option" style="background-color: {bg_color}; padding: 15px; border-radius: 8px; margin-bottom: 10px; border: 1px solid #e2e8f0;">
+                        <div style="display: flex; align-items: center; margin-bottom: 8px;">
+                            <div style="font-size: 1.5rem; margin-right: 10px;">{chart['icon']}</div>
+                            <div style="flex-grow: 1;">
+                                <div style="font-weight: 600; color: #1e293b;">{chart_type}</div>
+                                <div style="font-size: 0.9rem; color: #64748b;">{chart['description']}</div>
+                            </div>
+                            <div style="font-size: 1.2rem;">{status_icon}</div>
+                        </div>
+                        <div style="font-size: 0.8rem; color: #64748b; margin-top: 5px;">
+                            {chart['conditions']}
+                        </div>
                     </div>
                 """, unsafe_allow_html=True)
+                
+                st.checkbox(f"Chọn biểu đồ này", key=f"chart_{chart_type}", value=False)
             
-            # Group charts by analysis type
-            chart_groups = {
-                "Phân tích xu hướng": ["Biểu đồ xu hướng", "Biểu đồ xu hướng chi tiết", "Biểu đồ vùng"],
-                "Phân tích so sánh": ["Biểu đồ cột", "Biểu đồ bánh"],
-                "Phân tích mối quan hệ": ["Biểu đồ phân tán", "Ma trận tương quan", "Biểu đồ bong bóng"],
-                "Phân tích phân phối": ["Biểu đồ hộp", "Biểu đồ histogram"],
-                "Phân tích theo mùa": ["Biểu đồ mùa vụ", "Bản đồ nhiệt thời gian"],
-                "Phân tích đa chiều": ["Biểu đồ radar", "Biểu đồ dòng chảy"]
-            }
-            
-            # Display charts by group
-            for group_name, chart_types in chart_groups.items():
-                available_charts = [ct for ct in chart_types if ct in recommendations]
-                if available_charts:
-                    # Thêm mô tả cho từng nhóm
-                    group_descriptions = {
-                        "Phân tích xu hướng": "Phù hợp để theo dõi biến động dữ liệu theo thời gian",
-                        "Phân tích so sánh": "Phù hợp để so sánh giá trị giữa các chỉ số hoặc các kỳ",
-                        "Phân tích mối quan hệ": "Phù hợp để tìm mối tương quan giữa các chỉ số",
-                        "Phân tích phân phối": "Phù hợp để nghiên cứu phân phối và biến động của dữ liệu",
-                        "Phân tích theo mùa": "Phù hợp để phát hiện xu hướng theo mùa và chu kỳ",
-                        "Phân tích đa chiều": "Phù hợp để so sánh nhiều chỉ số cùng lúc"
-                    }
-                    
-                    description = group_descriptions.get(group_name, "")
-                    
-                    st.markdown(f"""
-                        <div class="chart-group">
-                            <h4>{group_name}</h4>
-                            <p style="font-size: 0.85rem; color: #64748b; margin-top: 0; margin-bottom: 10px;">{description}</p>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                    for chart_type in available_charts:
-                        chart = recommendations[chart_type]
-                        status_colors = {
-                            'recommended': '#dcfce7',
-                            'possible': '#fef9c3',
-                            'not_recommended': '#fee2e2'
-                        }
-                        status_icons = {
-                            'recommended': '✅',
-                            'possible': '⚠️',
-                            'not_recommended': '❌'
-                        }
-                        bg_color = status_colors[chart['status']]
-                        status_icon = status_icons[chart['status']]
-                        
-                        st.markdown(f"""
-                            <div class="chart-option" style="background-color: {bg_color}; padding: 15px; border-radius: 8px; margin-bottom: 10px; border: 1px solid #e2e8f0;">
-                                <div style="display: flex; align-items: center; margin-bottom: 8px;">
-                                    <div style="font-size: 1.5rem; margin-right: 10px;">{chart['icon']}</div>
-                                    <div style="flex-grow: 1;">
-                                        <div style="font-weight: 600; color: #1e293b;">{chart_type}</div>
-                                        <div style="font-size: 0.9rem; color: #64748b;">{chart['description']}</div>
-                                    </div>
-                                    <div style="font-size: 1.2rem;">{status_icon}</div>
-                                </div>
-                                <div style="font-size: 0.8rem; color: #64748b; margin-top: 5px;">
-                                    {chart['conditions']}
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        if st.checkbox(f"Chọn biểu đồ này", key=f"chart_{chart_type}", value=False):
-                            selected_chart = chart_type
-                    
-                    st.markdown("<hr style='margin: 15px 0; border: none; border-top: 1px solid #e2e8f0;'>", unsafe_allow_html=True)
-            
-            if not selected_chart:
-                st.info("👆 Chọn một loại biểu đồ để hiển thị phân tích")
-            
-            # Add custom CSS for chart selection
-            st.markdown("""
-                <style>
-                    .chart-group h4 {
-                        color: #1e293b;
-                        font-size: 1.1rem;
-                        font-weight: 600;
-                        margin: 15px 0 10px 0;
-                    }
-                    
-                    /* Style for chart selection rows */
-                    [data-testid="stHorizontalBlock"] {
-                        background: white;
-                        padding: 10px;
-                        border-radius: 8px;
-                        margin-bottom: 8px;
-                        border: 1px solid #e2e8f0;
-                        transition: all 0.2s ease;
-                    }
-                    
-                    [data-testid="stHorizontalBlock"]:hover {
-                        border-color: #3b82f6;
-                        transform: translateX(5px);
-                    }
-                    
-                    /* Style for checkboxes */
-                    .stCheckbox {
-                        padding: 5px 0;
-                    }
-                    
-                    .stCheckbox label {
-                        font-weight: 500;
-                        color: #1e293b;
-                    }
-                    
-                    /* Style for chart descriptions */
-                    .chart-description ul {
-                        list-style-type: none;
-                    }
-                    
-                    .chart-description ul li:before {
-                        content: "•";
-                        color: #3b82f6;
-                        font-weight: bold;
-                        display: inline-block;
-                        width: 1em;
-                        margin-left: -1em;
-                    }
-                    
-                    /* Highlight recommended charts */
-                    [data-testid="stHorizontalBlock"].recommended {
-                        background: #f0f9ff;
-                        border-color: #3b82f6;
-                    }
-                </style>
+            st.markdown("<hr style='margin: 15px 0; border: none; border-top: 1px solid #e2e8f0;'>", unsafe_allow_html=True)
+    
+    if not selected_charts:
+        st.info("👆 Chọn một loại biểu đồ để hiển thị phân tích")
+
+@st.fragment
+def chart_area(dataset, selected_indicators):
+    """Phần chọn loại biểu đồ, hiển thị biểu đồ và giải thích
+    
+    Các ô chọn biểu đồ và nút bảng điều khiển là widget của fragment này,
+    nên thay đổi chúng chỉ chạy lại phần này. Lựa chọn được đọc từ
+    session_state ở đầu mỗi lần chạy: khi fragment chạy lại riêng, Streamlit
+    truyền lại các tham số của lần chạy cả trang gần nhất.
+    """
+    recommendations = get_chart_recommendations(selected_indicators)
+    selected_charts = get_selected_charts(recommendations)
+    dashboard_mode = get_dashboard_mode()
+    
+    chart_picker(recommendations, selected_charts)
+    
+    # Visualization section
+    if selected_indicators:
+        st.markdown('<div class="section-header"><h2>Biểu Đồ Phân Tích</h2></div>', unsafe_allow_html=True)
+        
+        if chart_view(dataset, selected_indicators, selected_charts, dashboard_mode):
+            chart_explanation(selected_charts[-1], selected_indicators)
+
+@st.fragment
+def chart_view(dataset, selected_indicators, selected_charts, dashboard_mode):
+    """Phần hiển thị biểu đồ, lồng trong chart_area; đổi khoảng thời gian chỉ chạy lại phần này
+    
+    Trả về True khi một biểu đồ đơn được hiển thị (để thêm phần giải thích).
+    """
+    if dashboard_mode and len(selected_charts) > 1:
+        window = select_time_window(dataset)
+        render_dashboard(selected_charts, selected_indicators, window, dataset)
+    elif selected_charts:
+        window = select_time_window(dataset)
+        fig = create_chart(selected_charts[-1], selected_indicators, window, dataset)
+        if fig:
+            # Hiển thị biểu đồ
+            st.plotly_chart(fig, use_container_width=True)
+            return True
+    else:
+        st.info("👆 Vui lòng chọn ít nhất một chỉ số kinh tế để bắt đầu phân tích")
+    return False
+
+@st.fragment
+def chart_explanation(selected_chart, selected_indicators):
+    """Hướng dẫn đọc biểu đồ và giải thích các chỉ số, không phụ thuộc khoảng thời gian"""
+    # Combined explanation section in one white container
+    explanation = get_chart_explanation(selected_chart)
+    
+    # Sử dụng st.container() để đảm bảo nội dung nằm trong container chính màu trắng của Streamlit
+    with st.container():
+        # Hướng dẫn đọc biểu đồ
+        st.markdown(f"""
+            <div class="chart-guide-container">
+                <h3 style="color: #1f77b4;">💡 Hướng dẫn đọc {explanation['title']}</h3>
+                <p>{explanation['description']}</p>
+                <p><strong>Mục đích sử dụng:</strong> {explanation['usage']}</p>
+                <h4>Cách đọc hiểu biểu đồ:</h4>
+                <ul>
+                    {"".join(f'<li>{point}</li>' for point in explanation['reading_guide'])}
+                </ul>
+            </div>
+        """, unsafe_allow_html=True)
+    
+    # Giải thích chỉ số trong container riêng với background màu trắng
+    with st.container():
+        st.markdown("""
+        <div class="chart-guide-container">
+            <h3 style="color: #1f77b4;">💡 Giải thích chỉ số</h3>
+        """, unsafe_allow_html=True)
+        
+        for indicator in selected_indicators:
+            explanation = get_indicator_explanation_safe(indicator)
+            st.markdown(f"""
+                <div style='margin-bottom:20px; border-bottom: 1px solid #f0f0f0; padding-bottom: 15px;'>
+                    <h4>{explanation['title']}</h4>
+                    <p><strong>Mô tả:</strong> {explanation['description']}</p>
+                    <p><strong>Tác động:</strong> {explanation['impact']}</p>
+                    <p><strong>Cách đọc:</strong> {explanation['interpretation']}</p>
+                    <p><strong>Ngưỡng đánh giá:</strong></p>
+                    <ul>
+                        <li style="color: #ff7043;"><strong>Cao:</strong> {explanation['threshold']['high']}</li>
+                        <li style="color: #4caf50;"><strong>Trung bình:</strong> {explanation['threshold']['medium']}</li>
+                        <li style="color: #2196f3;"><strong>Thấp:</strong> {explanation['threshold']['low']}</li>
+                    </ul>
+                </div>
             """, unsafe_allow_html=True)
+        
+        st.markdown("</div>", unsafe_allow_html=True)
 
-        # Visualization section
-        if selected_indicators:
-            st.markdown('<div class="section-header"><h2>Biểu Đồ Phân Tích</h2></div>', unsafe_allow_html=True)
-            
-            if selected_chart:
-                fig = create_chart(selected_chart, selected_indicators)
-                if fig:
-                    # Hiển thị biểu đồ
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Combined explanation section in one white container
-                    explanation = get_chart_explanation(selected_chart)
-                    
-                    # Sử dụng st.container() để đảm bảo nội dung nằm trong container chính màu trắng của Streamlit
-                    with st.container():
-                        # Thêm một container có viền và nền màu trắng
-                        st.markdown("""
-                        <style>
-                            .chart-guide-container {
-                                background-color: white;
-                                border-radius: 10px;
-                                padding: 20px;
-                                margin: 20px 0;
-                                border: 1px solid #eaeaea;
-                                box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-                            }
-                        </style>
-                        """, unsafe_allow_html=True)
-                        
-                        # Hướng dẫn đọc biểu đồ
-                        st.markdown(f"""
-                            <div class="chart-guide-container">
-                                <h3 style="color: #1f77b4;">💡 Hướng dẫn đọc {explanation['title']}</h3>
-                                <p>{explanation['description']}</p>
-                                <p><strong>Mục đích sử dụng:</strong> {explanation['usage']}</p>
-                                <h4>Cách đọc hiểu biểu đồ:</h4>
-                                <ul>
-                                    {"".join(f'<li>{point}</li>' for point in explanation['reading_guide'])}
-                                </ul>
-                            </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Giải thích chỉ số trong container riêng với background màu trắng
-                    with st.container():
-                        st.markdown("""
-                        <div class="chart-guide-container">
-                            <h3 style="color: #1f77b4;">💡 Giải thích chỉ số</h3>
-                        """, unsafe_allow_html=True)
-                        
-                        for indicator in selected_indicators:
-                            explanation = get_indicator_explanation_safe(indicator)
-                            st.markdown(f"""
-                                <div style='margin-bottom:20px; border-bottom: 1px solid #f0f0f0; padding-bottom: 15px;'>
-                                    <h4>{explanation['title']}</h4>
-                                    <p><strong>Mô tả:</strong> {explanation['description']}</p>
-                                    <p><strong>Tác động:</strong> {explanation['impact']}</p>
-                                    <p><strong>Cách đọc:</strong> {explanation['interpretation']}</p>
-                                    <p><strong>Ngưỡng đánh giá:</strong></p>
-                                    <ul>
-                                        <li style="color: #ff7043;"><strong>Cao:</strong> {explanation['threshold']['high']}</li>
-                                        <li style="color: #4caf50;"><strong>Trung bình:</strong> {explanation['threshold']['medium']}</li>
-                                        <li style="color: #2196f3;"><strong>Thấp:</strong> {explanation['threshold']['low']}</li>
-                                    </ul>
-                                </div>
-                            """, unsafe_allow_html=True)
-                        
-                        st.markdown("</div>", unsafe_allow_html=True)
-            else:
-                st.info("👆 Vui lòng chọn ít nhất một chỉ số kinh tế để bắt đầu phân tích")
+def main():
+    """Hàm chính của ứng dụng Streamlit
+    
+    Trang gồm hai fragment chạy lại độc lập: phần chọn chỉ số và phần biểu
+    đồ (chọn loại biểu đồ, biểu đồ, giải thích), trong đó phần hiển thị biểu
+    đồ là một fragment lồng bên trong. Chọn biểu đồ hay bật bảng điều khiển
+    chỉ chạy lại phần biểu đồ, đổi khoảng thời gian chỉ chạy lại phần hiển
+    thị. Chỉ khi bộ dữ liệu hoặc các chỉ số thay đổi cả trang mới chạy lại, vì
+    các biểu đồ được khuyến nghị, phần gợi ý và biểu đồ đều phụ thuộc vào chúng.
+    """
+    st.set_page_config(page_title="Economic Data Analyzer", page_icon="📊", layout="wide")
+    
+    # CSS và ảnh nền (dựng một lần cho mỗi tiến trình server)
+    add_static_assets()
+    
+    # Tiêu đề duy nhất ở giữa trang
+    st.markdown("""
+    <div class="main-title">
+        <h1>Economic Data Analyzer</h1>
+        <h2>📊 Phân Tích Dữ Liệu Kinh Tế</h2>
+        <p>Phân tích dữ liệu kinh tế Việt Nam qua các chỉ số vĩ mô quan trọng.</p>
+        <p>Khám phá xu hướng và mối quan hệ giữa các chỉ số kinh tế quan trọng của Việt Nam</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Các lựa chọn hiện tại, là đầu vào của các fragment bên dưới
+    dataset = get_selected_dataset()
+    selected_indicators = get_selected_indicators(dataset)
+    
+    # Main container
+    with st.container():
+        # Selection panels
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            indicator_panel(dataset, selected_indicators)
+        
+        with col2:
+            chart_guide(selected_indicators)
+        
+        # Widget chọn biểu đồ phải nằm trong chính fragment của chúng, nên
+        # phần biểu đồ chiếm cả chiều rộng bên dưới
+        chart_area(dataset, selected_indicators)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
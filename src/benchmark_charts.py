@@ -0,0 +1,329 @@
+"""Benchmark every chart builder of the app on synthetic indicator panels
+
+Each chart in core.chart_functions.get_chart_functions() is built on
+generated data with the same schema as the KNN-filled CSV (Year, Month and
+one float column per indicator). Large panels stack several series of at
+most PERIODS_PER_SERIES months, so every row keeps a realistic date. Wall
+time, peak traced memory and serialized figure size are saved as JSON so
+later runs can be compared against a stored baseline.
+
+With --dashboard, the charts of a dashboard (DASHBOARD_CHARTS by default)
+are built together instead, once one after another in this process and
+once on a ChartProcessPool, the way the app's dashboard mode builds them.
+
+Run from the repository root:
+    python src/benchmark_charts.py
+    python src/benchmark_charts.py --rows 300 10000 --indicators 20 --output results.json
+    python src/benchmark_charts.py --baseline benchmark_baseline.json
+    python src/benchmark_charts.py --dashboard --rows 300 --indicators 20 --workers 6
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from concurrent.futures import as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly
+
+from core.chart_functions import get_chart_functions
+from core.chart_pool import ChartProcessPool, load_figure
+from core.data_handler import DataHandler
+from core.visualization_handler import VisualizationHandler
+
+# Indicator columns of the KNN-filled CSV, extended with generic names for larger panels
+CSV_INDICATORS = [
+    'Brent', 'China_CPI', 'Core_Inlation', 'Export', 'Food_Inflation', 'Gold', 'Import',
+    'Industrial_products', 'Agriculture, Forestry and Fishing', 'MonthlyCPI',
+    'Unemployment Rate', 'USD_VND', 'VN_coffee,tea,mate,spices', 'VN_fiscal_deficit',
+    'VN_Gasoline_Prices', 'VN_Interest_Rate', 'VN_money_supply', 'VN_rice_price',
+    'VN_Trade_Balance', 'PC1'
+]
+
+DEFAULT_ROWS = [300, 10_000, 100_000, 1_000_000]
+DEFAULT_INDICATORS = [20, 100, 500]
+# Months in one generated series (2000-01 to 2049-12); longer panels repeat these months
+PERIODS_PER_SERIES = 600
+
+# Skip scales whose indicator matrix would exceed this many values (8 bytes each)
+DEFAULT_MAX_CELLS = 20_000_000
+
+# Number of indicators passed to each chart; charts not listed get DEFAULT_SELECTION
+SELECTION_SIZES = {
+    'Biểu đồ phân tán': 2,
+    'Biểu đồ bong bóng': 3,
+}
+DEFAULT_SELECTION = 3
+
+# Differences below these floors are treated as noise when comparing
+MIN_SECONDS_DELTA = 0.05
+MIN_BYTES_DELTA = 64 * 1024
+
+# Charts built together in --dashboard mode, and the worker processes building them
+DASHBOARD_CHARTS = [
+    'Biểu đồ xu hướng', 'Biểu đồ cột', 'Ma trận tương quan',
+    'Biểu đồ hộp', 'Biểu đồ radar', 'Biểu đồ bong bóng',
+]
+DEFAULT_WORKERS = 6
+
+METRICS = ['build_seconds', 'serialize_seconds', 'peak_memory_bytes', 'figure_bytes']
+
+def get_indicator_names(count):
+    """Get count indicator names, starting with the real CSV columns"""
+    names = CSV_INDICATORS[:count]
+    names += [f'Indicator_{i:03d}' for i in range(len(names) + 1, count + 1)]
+    return names
+
+def generate_panel(rows, indicators, seed=0):
+    """Generate a monthly panel with positive random-walk indicators
+
+    Rows are consecutive series of up to PERIODS_PER_SERIES months, each
+    starting at 2000-01 (like several entities reporting the same months).
+    """
+    rng = np.random.default_rng(seed)
+    months = np.arange(rows) % PERIODS_PER_SERIES + 2000 * 12
+    data = {
+        'Year': months // 12,
+        'Month': months % 12 + 1,
+    }
+
+    # Geometric random walks keep every indicator positive, like prices and indices
+    levels = rng.uniform(10, 1000, size=indicators)
+    steps = rng.normal(0, 0.02, size=(rows, indicators))
+    values = np.empty((rows, indicators))
+    for start in range(0, rows, PERIODS_PER_SERIES):
+        series = slice(start, start + PERIODS_PER_SERIES)
+        values[series] = levels * np.exp(np.cumsum(steps[series], axis=0))
+    for j, name in enumerate(get_indicator_names(indicators)):
+        data[name] = values[:, j]
+    return pd.DataFrame(data)
+
+def measure_chart(build, selected, repeat):
+    """Build one chart and return its timings, peak memory and serialized size"""
+    build_times = []
+    serialize_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fig = build(selected)
+        build_times.append(time.perf_counter() - start)
+        if fig is None:
+            return {'error': 'chart returned None'}
+
+        start = time.perf_counter()
+        payload = fig.to_json()
+        serialize_times.append(time.perf_counter() - start)
+
+    # Measure memory in a separate pass, tracemalloc slows allocations down
+    tracemalloc.start()
+    try:
+        build(selected).to_json()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'build_seconds': min(build_times),
+        'serialize_seconds': min(serialize_times),
+        'peak_memory_bytes': peak,
+        'figure_bytes': len(payload),
+        'traces': len(fig.data),
+    }
+
+def run_benchmarks(rows_list, indicator_counts, charts=None, repeat=1, max_cells=DEFAULT_MAX_CELLS, seed=0):
+    """Benchmark the selected charts on every (rows, indicators) scale"""
+    results = []
+    for rows in rows_list:
+        for indicators in indicator_counts:
+            if rows * indicators > max_cells:
+                print(f"Skipping {rows} rows x {indicators} indicators (over {max_cells} values)")
+                continue
+
+            frame = generate_panel(rows, indicators, seed=seed)
+            # DataHandler reports every load on stdout, keep the benchmark output readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                handler = DataHandler.from_frame(frame)
+                load_seconds = time.perf_counter() - start
+            chart_functions = get_chart_functions(VisualizationHandler(data_handler=handler))
+            print(f"== {rows} rows x {indicators} indicators (load {load_seconds:.3f}s)")
+
+            for chart, build in chart_functions.items():
+                if charts and chart not in charts:
+                    continue
+                selected = handler.available_indicators[:SELECTION_SIZES.get(chart, DEFAULT_SELECTION)]
+                try:
+                    result = measure_chart(build, selected, repeat)
+                except Exception as e:
+                    result = {'error': f'{type(e).__name__}: {e}'}
+
+                result = {'rows': rows, 'indicators': indicators, 'chart': chart,
+                          'selected': len(selected), 'load_seconds': load_seconds, **result}
+                results.append(result)
+                if 'error' in result:
+                    print(f"   {chart}: ERROR {result['error']}")
+                else:
+                    print(f"   {chart}: build {result['build_seconds']:.3f}s, "
+                          f"json {result['serialize_seconds']:.3f}s, "
+                          f"peak {result['peak_memory_bytes'] / 1e6:.1f} MB, "
+                          f"size {result['figure_bytes'] / 1e6:.2f} MB")
+    return results
+
+def measure_dashboard(handler, charts, workers, repeat):
+    """Time building charts together, sequentially in this process and on a process pool
+
+    The first pool run includes writing the column store and each worker's
+    first chart; the fastest of the later runs is reported as parallel. The
+    slowest single chart is what the parallel time tends to with one CPU
+    per worker.
+    """
+    snapshot = handler.snapshot
+    chart_functions = get_chart_functions(VisualizationHandler(data_handler=handler).with_data(snapshot))
+    jobs = [(chart, handler.available_indicators[:SELECTION_SIZES.get(chart, DEFAULT_SELECTION)])
+            for chart in charts]
+
+    sequential_times = []
+    slowest_times = []
+    for _ in range(repeat + 1):
+        chart_times = []
+        for chart, selected in jobs:
+            start = time.perf_counter()
+            chart_functions[chart](selected)
+            chart_times.append(time.perf_counter() - start)
+        sequential_times.append(sum(chart_times))
+        slowest_times.append(max(chart_times))
+
+    parallel_times = []
+    with ChartProcessPool(workers) as pool:
+        pool.start()
+        for _ in range(repeat + 1):
+            start = time.perf_counter()
+            futures = [pool.submit(snapshot, chart, selected, dtype=handler.indicator_dtype)
+                       for chart, selected in jobs]
+            for future in as_completed(futures):
+                load_figure(future.result())
+            parallel_times.append(time.perf_counter() - start)
+
+    return {
+        'charts': len(jobs),
+        'workers': workers,
+        'sequential_seconds': min(sequential_times[1:]),
+        'slowest_chart_seconds': min(slowest_times[1:]),
+        'parallel_first_seconds': parallel_times[0],
+        'parallel_seconds': min(parallel_times[1:]),
+    }
+
+def run_dashboard_benchmarks(rows_list, indicator_counts, charts=None, workers=DEFAULT_WORKERS, repeat=1,
+                             max_cells=DEFAULT_MAX_CELLS, seed=0):
+    """Benchmark a dashboard of charts on every (rows, indicators) scale"""
+    results = []
+    for rows in rows_list:
+        for indicators in indicator_counts:
+            if rows * indicators > max_cells:
+                print(f"Skipping {rows} rows x {indicators} indicators (over {max_cells} values)")
+                continue
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                handler = DataHandler.from_frame(generate_panel(rows, indicators, seed=seed))
+            result = {'rows': rows, 'indicators': indicators,
+                      **measure_dashboard(handler, charts or DASHBOARD_CHARTS, workers, repeat)}
+            results.append(result)
+            print(f"== {rows} rows x {indicators} indicators, {result['charts']} charts: "
+                  f"sequential {result['sequential_seconds']:.3f}s "
+                  f"(slowest chart {result['slowest_chart_seconds']:.3f}s), "
+                  f"{workers} workers {result['parallel_seconds']:.3f}s "
+                  f"(first run {result['parallel_first_seconds']:.3f}s)")
+    return results
+
+def get_environment():
+    """Describe the interpreter and library versions the results were recorded with"""
+    return {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+        'cpus': os.cpu_count(),
+    }
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Get regressions of results against baseline results beyond tolerance"""
+    baseline_by_key = {
+        (entry['rows'], entry['indicators'], entry['chart']): entry
+        for entry in baseline['results']
+    }
+    regressions = []
+    for result in results:
+        base = baseline_by_key.get((result['rows'], result['indicators'], result['chart']))
+        if base is None:
+            continue
+        if 'error' in result and 'error' not in base:
+            regressions.append((result, 'error', None, result['error']))
+            continue
+        if 'error' in result or 'error' in base:
+            continue
+
+        for metric in METRICS:
+            floor = MIN_SECONDS_DELTA if metric.endswith('_seconds') else MIN_BYTES_DELTA
+            old, new = base[metric], result[metric]
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append((result, metric, old, new))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark chart builders on synthetic data")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS,
+                        help="row counts to generate")
+    parser.add_argument('--indicators', type=int, nargs='+', default=DEFAULT_INDICATORS,
+                        help="indicator counts to generate")
+    parser.add_argument('--charts', nargs='+', help="only benchmark these chart names")
+    parser.add_argument('--repeat', type=int, default=1, help="builds per chart, the fastest is kept")
+    parser.add_argument('--max-cells', type=int, default=DEFAULT_MAX_CELLS,
+                        help="skip scales with more rows x indicators values")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json', help="where to write the results")
+    parser.add_argument('--baseline', help="baseline results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative slowdown/growth before a regression is reported")
+    parser.add_argument('--dashboard', action='store_true',
+                        help="time building the charts together, sequentially and on a process pool")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="worker processes in --dashboard mode")
+    args = parser.parse_args(argv)
+
+    if args.dashboard:
+        results = run_dashboard_benchmarks(args.rows, args.indicators, charts=args.charts, workers=args.workers,
+                                           repeat=args.repeat, max_cells=args.max_cells, seed=args.seed)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': get_environment(), 'dashboard': results}, f, ensure_ascii=False, indent=2)
+        print(f"Saved {len(results)} results to {args.output}")
+        return 0
+
+    results = run_benchmarks(args.rows, args.indicators, charts=args.charts, repeat=args.repeat,
+                             max_cells=args.max_cells, seed=args.seed)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': get_environment(), 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f"Saved {len(results)} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for result, metric, old, new in regressions:
+            print(f"REGRESSION {result['chart']} ({result['rows']} x {result['indicators']}): "
+                  f"{metric} {old} -> {new}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+class ChartCache:
+    """Bounded LRU cache for built figures shared by all sessions of a process"""
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Get a cached figure and mark it as recently used"""
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store a figure, evicting the least recently used ones when full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_create(self, key, factory):
+        """Get a cached figure or build it with factory() and cache the result"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            # Build outside the lock so slow charts do not block other sessions
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Drop every cached figure"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
@@ -0,0 +1,21 @@
+def get_chart_functions(viz_handler):
+    """Ánh xạ tên biểu đồ với hàm tạo biểu đồ tương ứng của viz_handler
+    
+    Mỗi hàm nhận danh sách chỉ số và khoảng thời gian tùy chọn start/end ('YYYY-MM').
+    """
+    return {
+        'Biểu đồ xu hướng': lambda x, **w: viz_handler.create_line_chart(x, **w) if x else None,
+        'Biểu đồ cột': lambda x, **w: viz_handler.create_bar_chart(x, **w) if x else None,
+        'Biểu đồ phân tán': lambda x, **w: viz_handler.create_scatter_plot(x, **w) if len(x) == 2 else None,
+        'Ma trận tương quan': lambda x, **w: viz_handler.create_correlation_heatmap(x, **w) if len(x) >= 2 else None,
+        'Biểu đồ mùa vụ': lambda x, **w: viz_handler.create_seasonal_chart(x[0], **w) if x else None,
+        'Biểu đồ xu hướng chi tiết': lambda x, **w: viz_handler.create_trend_chart(x[0], **w) if x else None,
+        'Biểu đồ hộp': lambda x, **w: viz_handler.create_box_plot(x, **w) if x else None,
+        'Biểu đồ histogram': lambda x, **w: viz_handler.create_histogram(x[0], **w) if x else None,
+        'Biểu đồ vùng': lambda x, **w: viz_handler.create_area_chart(x, **w) if len(x) >= 2 else None,
+        'Biểu đồ radar': lambda x, **w: viz_handler.create_radar_chart(x, **w) if len(x) >= 3 else None,
+        'Biểu đồ bong bóng': lambda x, **w: viz_handler.create_bubble_chart(x, **w) if len(x) == 3 else None,
+        'Bản đồ nhiệt thời gian': lambda x, **w: viz_handler.create_calendar_heatmap(x[0], **w) if x else None,
+        'Biểu đồ dòng chảy': lambda x, **w: viz_handler.create_sankey_chart(x, **w) if x else None,
+        'Biểu đồ bánh': lambda x, **w: viz_handler.create_pie_chart(x, **w) if len(x) >= 2 else None
+    }
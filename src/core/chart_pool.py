@@ -0,0 +1,147 @@
+"""Build charts in worker processes from memory-mapped snapshots
+
+Plotly figure construction holds the GIL, so charts built on threads run
+one at a time. ChartProcessPool writes each snapshot it is given once as a
+column store (see column_store); worker processes map that store and
+return fig.to_json(), so several charts of the same data version are built
+at the same time and match the snapshot the caller took.
+"""
+import atexit
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from .chart_functions import get_chart_functions
+from .column_store import write_column_store
+
+# Column stores kept on disk (and chart functions kept per worker), oldest removed first
+MAX_STORES = 4
+
+# Chart functions per column store, filled in each worker process
+_worker_charts = OrderedDict()
+
+def _init_worker():
+    """Import the chart modules and load plotly's trace validators once per worker process"""
+    import plotly.graph_objects as go
+    from . import data_handler, visualization_handler
+    # Plotly loads the validators of a trace type when it is first used;
+    # load those of every chart here instead of during the first request
+    go.Figure([go.Scatter(), go.Bar(), go.Box(), go.Heatmap(), go.Histogram(), go.Pie(),
+               go.Sankey(), go.Scatterpolar()]).to_json()
+
+def build_chart_json(store, chart, indicators, start=None, end=None):
+    """Build one chart from a column store in a worker process
+
+    Returns fig.to_json(), or None when the chart does not apply to the
+    indicators.
+    """
+    chart_functions = _worker_charts.get(store)
+    if chart_functions is None:
+        from .data_handler import DataHandler
+        from .visualization_handler import VisualizationHandler
+        # DataHandler reports every load on stdout
+        with contextlib.redirect_stdout(io.StringIO()):
+            handler = DataHandler.from_column_store(store)
+        chart_functions = _worker_charts[store] = get_chart_functions(VisualizationHandler(data_handler=handler))
+        while len(_worker_charts) > MAX_STORES:
+            _worker_charts.popitem(last=False)
+    else:
+        _worker_charts.move_to_end(store)
+
+    build = chart_functions.get(chart)
+    fig = build(indicators, start=start, end=end) if build else None
+    return fig.to_json() if fig is not None else None
+
+def load_figure(payload):
+    """Turn the JSON returned by build_chart_json back into a figure
+
+    The worker already validated the figure, so it is not validated again
+    (that would cost most of what building it in the worker saved).
+    """
+    if payload is None:
+        return None
+    import plotly.graph_objects as go
+    return go.Figure(json.loads(payload), _validate=False)
+
+class ChartProcessPool:
+    """Process pool building charts of DataSnapshots in parallel
+
+    Workers are spawned (not forked, the server process runs threads) on
+    first use or by start(). Each snapshot is written once as a column store in a
+    temporary directory, keyed by its data_version; the MAX_STORES most
+    recently used stores are kept.
+    """
+
+    def __init__(self, workers, max_stores=MAX_STORES):
+        self.workers = workers
+        self.max_stores = max_stores
+        self._directory = tempfile.mkdtemp(prefix='chart-stores-')
+        # Store directory per data_version, least recently used first
+        self._stores = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+        atexit.register(self.close)
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+
+    def start(self):
+        """Spawn the workers in the background now rather than on the first charts"""
+        for _ in range(self.workers):
+            self._executor.submit(os.getpid)
+
+    def get_store(self, snapshot, dtype=None):
+        """Get the column store of snapshot, writing it on first use"""
+        with self._lock:
+            store = self._stores.get(snapshot.data_version)
+            if store is not None:
+                self._stores.move_to_end(snapshot.data_version)
+                return store
+
+            store = os.path.join(self._directory, str(snapshot.data_version))
+            write_column_store(store, snapshot.data, dtype)
+            self._stores[snapshot.data_version] = store
+            while len(self._stores) > self.max_stores:
+                _, old_store = self._stores.popitem(last=False)
+                # Workers that mapped it keep their pages; a late request for it fails
+                shutil.rmtree(old_store, ignore_errors=True)
+            return store
+
+    def submit(self, snapshot, chart, indicators, window=(None, None), dtype=None):
+        """Start building a chart of snapshot in a worker
+
+        The future's result is the figure JSON (see load_figure), or None
+        when the chart does not apply to the indicators.
+        """
+        store = self.get_store(snapshot, dtype)
+        start, end = window
+        try:
+            return self._executor.submit(build_chart_json, store, chart, list(indicators), start, end)
+        except BrokenProcessPool:
+            # A worker died (killed, out of memory...); start a new pool once
+            with self._lock:
+                self._executor = self._create_executor()
+            return self._executor.submit(build_chart_json, store, chart, list(indicators), start, end)
+
+    def close(self):
+        """Stop the workers and remove the column stores"""
+        atexit.unregister(self.close)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
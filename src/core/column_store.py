@@ -0,0 +1,77 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes so old stores are rejected
+STORE_FORMAT_VERSION = 1
+
+# Monthly period ordinals shared by every column
+INDEX_FILE = 'index.npy'
+MANIFEST_FILE = 'columns.json'
+
+# Columns rebuilt from the time index instead of being stored
+TIME_COLUMNS = ('Year', 'Month', 'Date')
+
+def _column_file(position):
+    """File name of the position-th stored column (indicator names may not be valid file names)"""
+    return f'col_{position}.npy'
+
+def _save_array(path, values):
+    """Save one .npy file through a temporary file so readers never map a partial one"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.save(f, values)
+    os.replace(tmp_path, path)
+
+def write_column_store(directory, frame, dtype=None):
+    """Write frame (Year, Month and indicator columns) as a memory-mappable column store
+
+    Rows are sorted by time. The monthly period ordinals go to index.npy
+    and each indicator to its own .npy file (as dtype, float32 for example,
+    when given), listed in columns.json. The manifest is written last, so
+    a store is only opened once all its columns are complete.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    ordinals = pd.PeriodIndex.from_fields(
+        year=frame['Year'].to_numpy(),
+        month=frame['Month'].to_numpy(),
+        freq='M'
+    ).asi8
+    order = np.argsort(ordinals, kind='stable')
+    _save_array(os.path.join(directory, INDEX_FILE), ordinals[order])
+
+    columns = [col for col in frame.columns if col not in TIME_COLUMNS]
+    for position, column in enumerate(columns):
+        values = frame[column].to_numpy(dtype=dtype or np.float64)[order]
+        _save_array(os.path.join(directory, _column_file(position)), values)
+
+    manifest = {'version': STORE_FORMAT_VERSION, 'columns': columns}
+    tmp_path = os.path.join(directory, f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_FILE))
+    return directory
+
+def open_column_store(directory):
+    """Open a column store written by write_column_store without reading its columns
+
+    Returns (period ordinals, {indicator: read-only memmap}). The columns
+    are mapped, not read: the operating system pages in only the parts
+    that are accessed and shares them between processes mapping the same
+    files.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != STORE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported column store version {manifest.get('version')} in {directory}")
+
+    ordinals = np.load(os.path.join(directory, INDEX_FILE))
+    columns = {}
+    for position, column in enumerate(manifest['columns']):
+        values = np.load(os.path.join(directory, _column_file(position)), mmap_mode='r')
+        if len(values) != len(ordinals):
+            raise ValueError(f"Column '{column}' of {directory} has {len(values)} rows, expected {len(ordinals)}")
+        columns[column] = values
+    return ordinals, columns
@@ -0,0 +1,78 @@
+import os
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes so stale caches are rebuilt
+CACHE_FORMAT_VERSION = 2
+
+def get_cache_path(source_path):
+    """Get the path of the binary cache stored next to a source CSV"""
+    root, _ = os.path.splitext(source_path)
+    return f"{root}.cache.npz"
+
+def get_source_signature(source_path):
+    """Get (mtime_ns, size) of the source file used to invalidate the cache"""
+    stat = os.stat(source_path)
+    return stat.st_mtime_ns, stat.st_size
+
+def read_cache(source_path):
+    """Load a cached frame for source_path, or None if missing or stale"""
+    cache_path = get_cache_path(source_path)
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        mtime_ns, size = get_source_signature(source_path)
+        with np.load(cache_path, allow_pickle=False) as cached:
+            if (int(cached['__version__']) != CACHE_FORMAT_VERSION
+                    or int(cached['__source_mtime_ns__']) != mtime_ns
+                    or int(cached['__source_size__']) != size):
+                return None
+
+            columns = cached['__columns__'].tolist()
+            string_columns = set(cached['__string_columns__'].tolist())
+            data = {}
+            for i, column in enumerate(columns):
+                values = cached[f'col_{i}']
+                # Strings are stored as fixed-width unicode, restore object dtype
+                data[column] = values.astype(object) if column in string_columns else values
+            return pd.DataFrame(data, columns=columns)
+    except Exception as e:
+        print(f"Ignoring unreadable data cache {cache_path}: {e}")
+        return None
+
+def write_cache(source_path, frame, signature):
+    """Write frame to the binary cache next to source_path
+
+    signature is get_source_signature(source_path) taken before the rows
+    in frame were read, so a file that grew meanwhile does not match the
+    cache and is read again.
+    """
+    cache_path = get_cache_path(source_path)
+    tmp_path = f"{cache_path}.tmp"
+
+    try:
+        mtime_ns, size = signature
+        arrays = {
+            '__version__': np.array(CACHE_FORMAT_VERSION),
+            '__source_mtime_ns__': np.array(mtime_ns, dtype=np.int64),
+            '__source_size__': np.array(size, dtype=np.int64),
+            '__columns__': np.array(frame.columns.tolist(), dtype=str),
+        }
+        string_columns = []
+        for i, column in enumerate(frame.columns):
+            values = frame[column].to_numpy()
+            if values.dtype == object:
+                values = values.astype(str)
+                string_columns.append(column)
+            arrays[f'col_{i}'] = values
+        arrays['__string_columns__'] = np.array(string_columns, dtype=str)
+
+        # Write to a temporary file first so readers never see a partial cache
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        print(f"Could not write data cache {cache_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
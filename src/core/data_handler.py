@@ -1,49 +1,498 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+import io
+import itertools
 import json
 import os
+import threading
+from .column_store import open_column_store, write_column_store
+from .data_cache import get_source_signature, read_cache, write_cache
+from .indicator_stats import (
+    build_stats_index, append_stats_index, build_distribution, sort_columns, insert_sorted,
+    percentile_ranks, CorrelationMatrix
+)
+
+DEFAULT_DATA_PATH = 'attached_assets/economic_data_filled_knn (1).csv'
+
+# Columns that describe time rather than an economic indicator
+META_COLUMNS = ['Year', 'Month', 'Date']
+
+# Storage of the indicator columns. float64 keeps statistics identical to
+# the CSV values; float32 halves their memory and keeps about 7
+# significant digits
+DEFAULT_INDICATOR_DTYPE = np.float64
+
+# Environment variable selecting the indicator dtype of the global data
+# handler, e.g. INDICATOR_DTYPE=float32 for the compact storage mode
+INDICATOR_DTYPE_ENV = 'INDICATOR_DTYPE'
+
+# 'YYYY-MM' labels as Arrow strings (a few bytes each instead of a Python str)
+LABEL_DTYPE = 'string[pyarrow]'
+
+# Seconds between two checks of the CSV in watch mode
+DEFAULT_WATCH_INTERVAL = 5.0
+
+# Bytes before the end of the loaded CSV compared to tell appends from rewrites
+SOURCE_FINGERPRINT_SIZE = 4096
+
+# Data versions come from one counter shared by every handler of the process,
+# so a handler created again for the same source (after the dataset registry
+# evicted it, for example) never reuses a version of a snapshot of older data
+_data_versions = itertools.count(1)
+
+def _next_data_version():
+    """Get a data version that no snapshot of this process has used"""
+    return next(_data_versions)
 
 class DataHandler:
-    def __init__(self):
-        self.data = None
-        self.available_indicators = None
-        self.load_data()
+    """Loads the economic data and publishes it as immutable snapshots
+
+    Every load, reload or append builds a new DataSnapshot (the frame and
+    the statistics derived from it) on the calling thread, typically the
+    watch thread, then replaces the current one with a single reference
+    assignment. Reads (handler.data, handler.filter_data(),
+    handler.stats_index...) are served by the snapshot current at the time
+    of the call, so they never wait for a reload nor see a half-built
+    frame. Code making several reads that must agree takes
+    handler.snapshot once and reads from it.
+    """
+
+    def __init__(self, file_path=DEFAULT_DATA_PATH, use_cache=True, data=None,
+                 indicator_dtype=DEFAULT_INDICATOR_DTYPE, column_store=None):
+        self.file_path = file_path
+        self.use_cache = use_cache
+        self.indicator_dtype = np.dtype(indicator_dtype)
+        # Published data, replaced as a whole and never modified
+        self._snapshot = DataSnapshot(pd.DataFrame(), None, 0)
+        # CSV columns, size and trailing bytes at load, used by watch mode
+        # to parse only what was appended to the file
+        self._source_columns = None
+        self._source_offset = None
+        self._source_fingerprint = None
+        # Serializes loads and appends; readers never take it
+        self._lock = threading.RLock()
+        self._watch_thread = None
+        self._watch_stop = None
+        if data is not None:
+            self.set_data(data)
+        elif column_store is not None:
+            self.load_column_store(column_store)
+        else:
+            self.load_data()
+
+    def __getattr__(self, name):
+        # Only reached for names the handler lacks: data, period_index,
+        # data_version and the query methods come from the current snapshot
+        if name == '_snapshot':
+            raise AttributeError(name)
+        return getattr(self._snapshot, name)
+
+    @property
+    def snapshot(self):
+        """The current DataSnapshot, unaffected by later loads and appends"""
+        return self._snapshot
+
+    @classmethod
+    def from_frame(cls, data, indicator_dtype=DEFAULT_INDICATOR_DTYPE):
+        """Create a handler over an in-memory frame with the CSV schema"""
+        return cls(file_path=None, use_cache=False, data=data, indicator_dtype=indicator_dtype)
+
+    @classmethod
+    def from_column_store(cls, directory):
+        """Create a handler over a memory-mapped column store (see column_store)"""
+        return cls(file_path=None, use_cache=False, column_store=directory)
 
     def load_data(self):
-        """Load and preprocess the economic data"""
-        try:
-            # Read the KNN-filled CSV file with explicit encoding and error handling
-            file_path = 'attached_assets/economic_data_filled_knn (1).csv'
-            self.data = pd.read_csv(file_path, encoding='utf-8')
-            
-            # Print column names for debugging
-            print("Available columns:", self.data.columns.tolist())
-            
-            # Create Date column for visualization
-            self.data['Date'] = self.data.apply(lambda row: f"{int(row['Year'])}-{int(row['Month']):02d}", axis=1)
-            
-            # Also create a YearMonth column for easier filtering
-            self.data['YearMonth'] = self.data.apply(lambda row: f"{int(row['Year'])}-{int(row['Month']):02d}", axis=1)
-            
-            # Get available indicators (all columns except Year, Month, Date, YearMonth)
-            self.available_indicators = [col for col in self.data.columns if col not in ['Year', 'Month', 'Date', 'YearMonth']]
-            
-            print("Data loaded successfully")
-            print(f"Available indicators: {self.available_indicators}")
-            print(f"Data shape: {self.data.shape}")
-            
-        except Exception as e:
-            print(f"Error loading data: {e}")
-            print(f"Current working directory: {os.getcwd()}")
-            self.data = pd.DataFrame()
-            self.available_indicators = []
+        """Load and preprocess the economic data
+
+        The current snapshot keeps serving reads until the new one, with
+        the statistics the current one had computed, is ready. If a reload
+        fails the current snapshot is kept.
+        """
+        with self._lock:
+            try:
+                # Taken before reading, so rows written meanwhile are appended again
+                # by watch mode (and dropped as duplicates) rather than missed
+                self._remember_source()
+
+                # Reuse the parsed frame from the binary cache unless the CSV changed.
+                # The cache holds the CSV columns at full precision, so handlers
+                # with any indicator dtype can share it
+                cached = read_cache(self.file_path) if self.use_cache else None
+                if cached is not None:
+                    data = cached
+                    print("Loaded data from cache")
+                else:
+                    # Stamp the cache with the file as it was before reading, so
+                    # rows appended during the read make the cache stale
+                    signature = get_source_signature(self.file_path)
+
+                    # Read the KNN-filled CSV file with explicit encoding and error handling
+                    data = pd.read_csv(self.file_path, encoding='utf-8')
+
+                    # Print column names for debugging
+                    print("Available columns:", data.columns.tolist())
+
+                    if self.use_cache:
+                        write_cache(self.file_path, data, signature)
+
+                data, period_index = self._prepare_data(data)
+                self._publish(DataSnapshot(data, period_index, _next_data_version()))
+
+            except Exception as e:
+                print(f"Error loading data: {e}")
+                print(f"Current working directory: {os.getcwd()}")
+                if self._snapshot.data.empty:
+                    self._reset_data()
+
+    def load_column_store(self, directory):
+        """Serve the data from a column store written by write_column_store
+
+        Only the time index is read; the indicator columns are mapped and
+        paged in as they are used. Calling it again after the store was
+        rewritten swaps in the new columns like a reload.
+        """
+        with self._lock:
+            try:
+                self._publish(ColumnStoreSnapshot.open(directory, _next_data_version()))
+            except Exception as e:
+                print(f"Error opening column store {directory}: {e}")
+                if self._snapshot.data.empty:
+                    self._reset_data()
+
+    def to_column_store(self, directory, dtype=None):
+        """Write the current data as a column store (indicators in dtype, by default indicator_dtype)"""
+        return write_column_store(directory, self._snapshot.data, dtype or self.indicator_dtype)
+
+    def reload_in_background(self):
+        """Reload the data in a daemon thread and return the thread
+
+        Requests keep reading the current snapshot until the reloaded one
+        is published.
+        """
+        thread = threading.Thread(target=self.load_data, name='data-reload', daemon=True)
+        thread.start()
+        return thread
+
+    def set_data(self, data):
+        """Use an in-memory frame (Year, Month and indicator columns) as the data"""
+        with self._lock:
+            try:
+                data, period_index = self._prepare_data(data.reset_index(drop=True))
+                self._publish(DataSnapshot(data, period_index, _next_data_version()))
+            except Exception as e:
+                print(f"Error loading data: {e}")
+                if self._snapshot.data.empty:
+                    self._reset_data()
+
+    def _prepare_data(self, data):
+        """Sort rows by time, add the Date labels and store indicators compactly
+
+        Returns the prepared frame and its monthly PeriodIndex.
+        """
+        # Build the monthly time index in one vectorized step; every chart
+        # builder reuses it (and the labels derived from it) instead of
+        # formatting Year/Month itself
+        period_index = self._build_period_index(data)
+        
+        # Keep rows in time order so year ranges can be sliced directly
+        if not period_index.is_monotonic_increasing:
+            order = np.argsort(period_index.asi8, kind='stable')
+            data = data.iloc[order].reset_index(drop=True)
+            period_index = period_index[order]
+        return self._add_labels(data, period_index), period_index
+
+    def _add_labels(self, data, period_index):
+        """Add the Date label column and cast the indicators to indicator_dtype"""
+        # One Arrow string column; windows are found from period_index, so
+        # no second label column is kept for filtering
+        data['Date'] = pd.array(period_index.strftime('%Y-%m'), dtype=LABEL_DTYPE)
+        indicators = [col for col in data.columns if col not in META_COLUMNS]
+        return data.astype({col: self.indicator_dtype for col in indicators}, copy=False)
+
+    def _publish(self, snapshot):
+        """Compute what the current snapshot had computed, then swap snapshot in
+
+        Statistics that requests already used are rebuilt here, off the
+        request path, so the first requests after a reload do not pay for
+        them.
+        """
+        snapshot.warm(self._snapshot)
+        self._snapshot = snapshot
+        
+        print("Data loaded successfully")
+        print(f"Available indicators: {snapshot.available_indicators}")
+        print(f"Data shape: {snapshot.data.shape}")
+
+    def _reset_data(self):
+        """Fall back to an empty data set after a failed load"""
+        self._snapshot = DataSnapshot(pd.DataFrame(), None, _next_data_version())
+
+    def append_observations(self, rows):
+        """Append new monthly observations and update the derived state
+
+        rows is a DataFrame or a list of dicts with Year, Month and indicator
+        columns; indicators left out are NaN. When every new month comes
+        after the last loaded one, the labels, sorted values, statistics
+        index, correlation matrix and rolling means of the new snapshot are
+        extended from the new rows alone. The new snapshot still gets its own
+        copy of the frame and of each sorted column, so an append costs time
+        linear in the history length (copies, no re-parse or re-sort). Rows
+        for months already loaded replace them, which needs a full rebuild.
+        Returns the number of rows appended.
+        """
+        new_rows = rows.copy() if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        if new_rows.empty:
+            return 0
+        if 'Year' not in new_rows.columns or 'Month' not in new_rows.columns:
+            raise ValueError("Observations need Year and Month columns")
+
+        with self._lock:
+            current = self._snapshot
+            if current.data.empty:
+                self.set_data(new_rows)
+                return len(new_rows)
+
+            unknown = [col for col in new_rows.columns if col not in current.data.columns]
+            if unknown:
+                raise ValueError(f"Unknown columns: {unknown}")
+
+            # Date is derived from Year/Month below
+            source_columns = [col for col in current.data.columns if col != 'Date']
+            new_rows = new_rows.reindex(columns=source_columns)
+            periods = self._build_period_index(new_rows)
+            ordinals = periods.asi8
+
+            if ordinals[0] <= current.period_index.asi8[-1] or np.any(np.diff(ordinals) <= 0):
+                # Revisions or unordered rows: merge, keep the newest values and rebuild.
+                # Invalid rows raise here and leave the current snapshot published
+                combined = pd.concat([current.data[source_columns], new_rows], ignore_index=True)
+                combined = combined.drop_duplicates(['Year', 'Month'], keep='last').reset_index(drop=True)
+                data, period_index = self._prepare_data(combined)
+                self._publish(DataSnapshot(data, period_index, _next_data_version()))
+                return len(new_rows)
+
+            new_rows = self._add_labels(new_rows, periods)
+            snapshot = current.extend(new_rows, periods, _next_data_version())
+            snapshot.warm(current)
+            self._snapshot = snapshot
+            print(f"Appended {len(new_rows)} rows, data shape: {snapshot.data.shape}")
+            return len(new_rows)
+
+
+    def _remember_source(self):
+        """Record the CSV header, size and trailing bytes for watch mode"""
+        if not self.file_path or not os.path.exists(self.file_path):
+            return
+        with open(self.file_path, 'rb') as f:
+            header = f.readline()
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - SOURCE_FINGERPRINT_SIZE))
+            fingerprint = f.read(size - f.tell())
+        self._source_columns = pd.read_csv(io.BytesIO(header), encoding='utf-8-sig').columns.tolist()
+        self._source_offset = size
+        self._source_fingerprint = fingerprint
+
+    def check_source(self):
+        """Load rows appended to the CSV since the last check
+
+        Only the bytes past the previously seen end of the file are parsed
+        and passed to append_observations. A file that shrank or whose
+        previous end changed was rewritten, and is reloaded in full.
+        Returns the number of new rows.
+        """
+        if not self.file_path or self._source_offset is None or not os.path.exists(self.file_path):
+            return 0
+
+        with self._lock:
+            offset = self._source_offset
+            # Only the first size bytes are read below, so this signature
+            # matches the rows the cache is rewritten with
+            signature = get_source_signature(self.file_path)
+            size = signature[1]
+            if size == offset:
+                return 0
+            with open(self.file_path, 'rb') as f:
+                f.seek(max(0, offset - len(self._source_fingerprint)))
+                fingerprint = f.read(min(offset, len(self._source_fingerprint)))
+                if size < offset or fingerprint != self._source_fingerprint:
+                    # The binary cache is keyed on the file size and mtime, so it is not reused
+                    print("Data file was rewritten, reloading")
+                    self.load_data()
+                    return len(self._snapshot.data)
+                appended = f.read(size - offset)
+
+            # A writer may be halfway through a line; leave it for the next check
+            complete = appended[:appended.rfind(b'\n') + 1]
+            if not complete:
+                return 0
+            new_rows = pd.read_csv(io.BytesIO(complete), header=None, names=self._source_columns,
+                                   encoding='utf-8')
+            count = self.append_observations(new_rows)
+
+            self._source_offset = offset + len(complete)
+            with open(self.file_path, 'rb') as f:
+                f.seek(max(0, self._source_offset - SOURCE_FINGERPRINT_SIZE))
+                self._source_fingerprint = f.read(self._source_offset - f.tell())
+            # A float32 frame would lose precision for full-precision handlers
+            # sharing the cache; those keep re-reading the CSV instead
+            if self.use_cache and self._source_offset == size and self.indicator_dtype == np.float64:
+                write_cache(self.file_path, self._snapshot.data.drop(columns='Date'), signature)
+            return count
+
+    def watch(self, interval=DEFAULT_WATCH_INTERVAL):
+        """Check the CSV for appended rows every interval seconds in a daemon thread"""
+        if self._watch_thread is not None and self._watch_thread.is_alive():
+            return
+        self._watch_stop = threading.Event()
+        self._watch_thread = threading.Thread(
+            target=self._watch_loop, args=(interval, self._watch_stop), name='data-watch', daemon=True
+        )
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        """Stop the watch thread started by watch()"""
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+        self._watch_thread = None
+
+    def _watch_loop(self, interval, stop):
+        while not stop.wait(interval):
+            try:
+                self.check_source()
+            except Exception as e:
+                print(f"Error checking data file: {e}")
+
+    @staticmethod
+    def _build_period_index(data):
+        """Build the monthly PeriodIndex from the Year and Month columns"""
+        return pd.PeriodIndex.from_fields(
+            year=data['Year'].to_numpy(),
+            month=data['Month'].to_numpy(),
+            freq='M'
+        )
+
+class DataSnapshot:
+    """One immutable version of the data and the state derived from it
+
+    The frame and period index are never modified once the snapshot is
+    published, so chart builders that took it keep consistent data while
+    a newer snapshot replaces it. The statistics index, correlation matrix,
+    sorted values, distributions and rolling means are computed on first
+    use and kept with the snapshot; two threads may compute the same one,
+    which only costs time.
+    """
+
+    def __init__(self, data, period_index, data_version):
+        self.data = data
+        self.period_index = period_index
+        # All columns except Year, Month and Date
+        self.available_indicators = [col for col in data.columns if col not in META_COLUMNS]
+        # Unique within the process for every new snapshot, so derived caches
+        # (the app's chart cache, for one) can key on it
+        self.data_version = data_version
+        # Statistics index, correlation matrix and sorted values are built on
+        # first use, not while the data loads
+        self._stats_index = None
+        self._correlation = None
+        self._sorted_values = None
+        # Histogram/KDE per indicator, filled on first use
+        self.distributions = {}
+        # Rolling means per (indicator, window, min_periods)
+        self._rolling_means = {}
+
+    def extend(self, new_rows, periods, data_version):
+        """Build the snapshot with new_rows (already labelled) appended
+
+        The state this snapshot has built is carried over and extended from
+        the new rows alone; this snapshot is left unchanged.
+        """
+        start = len(self.data)
+        data = pd.concat([self.data, new_rows[self.data.columns]], ignore_index=True)
+        snapshot = DataSnapshot(data, self.period_index.append(periods), data_version)
+        indicators = self.available_indicators
+
+        sorted_values, stats_index, correlation = self._sorted_values, self._stats_index, self._correlation
+        if sorted_values is not None:
+            snapshot._sorted_values = insert_sorted(sorted_values, data, indicators, start)
+        if stats_index is not None:
+            snapshot._stats_index = append_stats_index(
+                stats_index, data, indicators, snapshot.sorted_values, start
+            )
+
+        if correlation is not None:
+            values = data[indicators].iloc[start:].to_numpy(dtype=np.float64)
+            if correlation.incremental and not np.isnan(values).any():
+                snapshot._correlation = correlation.copy()
+                snapshot._correlation.update(values)
+
+        # Each new rolling mean only needs the window rows before it
+        for (indicator, window, min_periods), means in list(self._rolling_means.items()):
+            tail = data[indicator].iloc[max(0, start - window + 1):]
+            new_means = tail.rolling(window=window, min_periods=min_periods).mean().to_numpy()
+            snapshot._rolling_means[indicator, window, min_periods] = np.concatenate(
+                [means, new_means[len(new_means) - (len(data) - start):]]
+            )
+
+        return snapshot
+
+    def warm(self, previous):
+        """Compute the derived state that the previous snapshot had computed"""
+        if previous._sorted_values is not None:
+            self.sorted_values
+        if previous._stats_index is not None:
+            self.stats_index
+        if previous._correlation is not None:
+            self.correlation
+        for indicator in list(previous.distributions):
+            self.get_distribution(indicator)
+        for indicator, window, min_periods in list(previous._rolling_means):
+            self.get_rolling_mean(indicator, window, min_periods)
+
+    @property
+    def stats_index(self):
+        """Summary, box, seasonal and yearly statistics of every indicator"""
+        if self._stats_index is None:
+            self._stats_index = build_stats_index(self.data, self.available_indicators)
+        return self._stats_index
+
+    @property
+    def correlation(self):
+        """Correlation matrix over all indicators"""
+        if self._correlation is None:
+            self._correlation = CorrelationMatrix(self.data, self.available_indicators)
+        return self._correlation
+
+    @property
+    def sorted_values(self):
+        """Finite values of each indicator in ascending order, for percentile lookups"""
+        if self._sorted_values is None:
+            self._sorted_values = sort_columns(self.data, self.available_indicators)
+        return self._sorted_values
+
+    def get_rolling_mean(self, indicator, window=12, min_periods=None):
+        """Get the rolling mean of an indicator over the full history
+
+        Computed once per (window, min_periods) and extended when
+        observations are appended.
+        """
+        if not indicator or indicator not in self.available_indicators:
+            return None
+
+        key = (indicator, window, min_periods)
+        if key not in self._rolling_means:
+            self._rolling_means[key] = (
+                self.data[indicator].rolling(window=window, min_periods=min_periods).mean().to_numpy()
+            )
+        return self._rolling_means[key]
 
     def get_available_indicators(self):
         """Get list of available economic indicators"""
         if self.data is None or self.data.empty:
             return []
-        return [col for col in self.data.columns if col not in ['Year', 'Month', 'Date', 'YearMonth']]
+        return [col for col in self.data.columns if col not in META_COLUMNS]
 
     def get_date_range(self):
         """Get the date range of the data"""
@@ -51,42 +500,115 @@ class DataHandler:
             return None, None
         return self.data['Date'].min(), self.data['Date'].max()
 
-    def filter_data(self, start_year=None, end_year=None, indicators=None):
-        """Filter data by year range and indicators"""
-        if self.data is None or self.data.empty:
-            return pd.DataFrame()
+    def get_window_bounds(self, start=None, end=None, start_year=None, end_year=None):
+        """Get the [lo, hi) row positions of a time window
 
-        filtered_data = self.data.copy()
+        start and end are months ('YYYY-MM' strings or monthly Periods) and
+        are both inclusive; start_year and end_year bound whole years. Rows
+        are sorted by time, so the bounds come from binary searches on the
+        period ordinals instead of boolean masks over every row.
+        """
+        if self.data is None or self.data.empty:
+            return 0, 0
 
+        lo, hi = 0, len(self.data)
         if start_year:
-            filtered_data = filtered_data[filtered_data['Year'] >= start_year]
+            lo = max(lo, int(np.searchsorted(self.data['Year'].to_numpy(), start_year, side='left')))
         if end_year:
-            filtered_data = filtered_data[filtered_data['Year'] <= end_year]
+            hi = min(hi, int(np.searchsorted(self.data['Year'].to_numpy(), end_year, side='right')))
+        if start is not None or end is not None:
+            ordinals = self.period_index.asi8
+            if start is not None:
+                lo = max(lo, int(np.searchsorted(ordinals, pd.Period(start, freq='M').ordinal, side='left')))
+            if end is not None:
+                hi = min(hi, int(np.searchsorted(ordinals, pd.Period(end, freq='M').ordinal, side='right')))
+        return lo, max(lo, hi)
+
+    def is_full_window(self, start=None, end=None):
+        """Check whether a time window covers every loaded row"""
+        if start is None and end is None:
+            return True
+        lo, hi = self.get_window_bounds(start, end)
+        return lo == 0 and hi == len(self.data)
+
+    def filter_data(self, start_year=None, end_year=None, indicators=None, copy=False, start=None, end=None):
+        """Filter data by year range or month window and indicators
+
+        The returned frame shares memory with the loaded data. Adding new
+        columns to it is safe, but pass copy=True before modifying existing
+        values in place.
+        """
+        if self.data is None or self.data.empty:
+            return pd.DataFrame()
+
+        # Select the columns first so unrequested indicators are never touched
         if indicators:
-            # Always include Year, Month, Date and YearMonth columns
-            cols_to_include = ['Year', 'Month', 'Date', 'YearMonth'] + indicators
-            filtered_data = filtered_data[cols_to_include]
+            # Always include the Year, Month and Date columns
+            cols_to_include = META_COLUMNS + list(indicators)
+        else:
+            cols_to_include = list(self.data.columns)
+
+        # Rows are sorted by time, so a time window is a contiguous slice
+        lo, hi = self.get_window_bounds(start, end, start_year, end_year)
+
+        # Assemble the result from sliced columns without copying them
+        filtered_data = pd.DataFrame(
+            {col: self.data[col].iloc[lo:hi] for col in cols_to_include},
+            copy=False
+        )
 
-        return filtered_data
+        return filtered_data.copy() if copy else filtered_data
 
-    def create_correlation_data(self, indicators=None):
+    def _get_window_index(self, indicator, start=None, end=None):
+        """Get the statistics index entry of an indicator for a time window
+
+        The full history is served from the index built at load time; a
+        narrower window is computed from its own rows only.
+        """
+        if self.is_full_window(start, end):
+            return self.stats_index[indicator]
+        window = self.filter_data(indicators=[indicator], start=start, end=end)
+        return build_stats_index(window, [indicator]).get(indicator)
+
+    def create_correlation_data(self, indicators=None, start=None, end=None):
         """Calculate correlation matrix for selected indicators"""
         if not indicators or len(indicators) < 2:
             return pd.DataFrame()
 
-        data_subset = self.data[indicators]
-        corr_matrix = data_subset.corr()
-        return corr_matrix
+        if self.is_full_window(start, end):
+            return self.correlation.submatrix(indicators)
+        window = self.filter_data(indicators=indicators, start=start, end=end)
+        return CorrelationMatrix(window, indicators).submatrix(indicators)
 
-    def get_seasonal_data(self, indicator):
+    def get_correlation(self, indicator1, indicator2, start=None, end=None):
+        """Get the correlation between two indicators"""
+        if self.is_full_window(start, end):
+            return self.correlation.pair(indicator1, indicator2)
+        return float(self.create_correlation_data([indicator1, indicator2], start, end).iloc[0, 1])
+
+    def get_seasonal_data(self, indicator, start=None, end=None):
         """Get seasonal analysis data for an indicator"""
         if not indicator or indicator not in self.available_indicators:
             return pd.DataFrame()
 
-        monthly_avg = self.data.groupby('Month')[indicator].mean().reset_index()
-        monthly_std = self.data.groupby('Month')[indicator].std().reset_index()[indicator]
-        monthly_avg['std'] = monthly_std
-        return monthly_avg
+        entry = self._get_window_index(indicator, start, end)
+        return entry['seasonal'].copy() if entry else pd.DataFrame()
+
+    def memory_report(self):
+        """Get the bytes held by each column of the loaded frame
+
+        The row index is reported as 'Index' and, once built, the sorted
+        copies of the indicators as 'sorted_values'.
+        """
+        report = self.data.memory_usage(index=True, deep=True)
+        sorted_values = self._sorted_values
+        if sorted_values is not None:
+            report['sorted_values'] = sum(values.nbytes for values in sorted_values.values())
+        return report
+
+    def get_memory_usage(self):
+        """Get the bytes held by the loaded frame and its sorted copies"""
+        return int(self.memory_report().sum())
 
     def to_json(self, data):
         """Convert data to JSON format"""
@@ -96,52 +618,87 @@ class DataHandler:
             return data.to_json()
         return json.dumps(data)
 
-    def get_indicator_stats(self, indicator):
+    def get_indicator_stats(self, indicator, start=None, end=None):
         """Get statistical information about an indicator"""
         if not indicator or indicator not in self.available_indicators:
             return {}
 
-        stats = {
-            'mean': float(self.data[indicator].mean()),
-            'median': float(self.data[indicator].median()),
-            'std': float(self.data[indicator].std()),
-            'min': float(self.data[indicator].min()),
-            'max': float(self.data[indicator].max()),
-            'current': float(self.data[indicator].iloc[-1]),
-            'previous': float(self.data[indicator].iloc[-2]),
-            'change': float(self.data[indicator].iloc[-1] - self.data[indicator].iloc[-2]),
-            # Add percentiles
-            'percentile_25': float(self.data[indicator].quantile(0.25)),
-            'percentile_50': float(self.data[indicator].quantile(0.50)),
-            'percentile_75': float(self.data[indicator].quantile(0.75))
-        }
-        return stats
+        entry = self._get_window_index(indicator, start, end)
+        return dict(entry['stats']) if entry else {}
+
+    def get_box_stats(self, indicator, start=None, end=None):
+        """Get precomputed quartiles, fences and outliers for a box plot"""
+        if not indicator or indicator not in self.available_indicators:
+            return {}
+
+        entry = self._get_window_index(indicator, start, end)
+        return dict(entry['box']) if entry else {}
+
+    def get_percentiles(self, indicator, values=None, start=None, end=None):
+        """Get percentile ranks (0-100) of values within an indicator's history
+
+        values may be a single number (a float is returned) or an array; when
+        omitted, the rank of every point of the series (or window) is
+        returned. Ranks match scipy.stats.percentileofscore(kind='rank').
+        """
+        if not indicator or indicator not in self.available_indicators:
+            return None
+
+        if self.is_full_window(start, end):
+            sorted_values = self.sorted_values[indicator]
+            series = self.data[indicator]
+        else:
+            series = self.filter_data(indicators=[indicator], start=start, end=end)[indicator]
+            sorted_values = np.sort(series.to_numpy(dtype=np.float64))
+            sorted_values = sorted_values[:np.isfinite(sorted_values).sum()]
+
+        if values is None:
+            values = series.to_numpy(dtype=np.float64)
+        ranks = percentile_ranks(sorted_values, values)
+        return float(ranks) if ranks.ndim == 0 else ranks
+
+    def get_distribution(self, indicator, start=None, end=None):
+        """Get histogram bins and the KDE curve of an indicator
+
+        The full-history distribution is computed once per data version and
+        reused; a narrower window is computed from its own rows.
+        """
+        if not indicator or indicator not in self.available_indicators:
+            return None
+
+        if self.is_full_window(start, end):
+            if indicator not in self.distributions:
+                self.distributions[indicator] = build_distribution(self.data[indicator].to_numpy())
+            return self.distributions[indicator]
+
+        window = self.filter_data(indicators=[indicator], start=start, end=end)
+        return build_distribution(window[indicator].to_numpy())
 
     def get_trend_analysis(self, indicator, window=12):
         """Analyze trend for an indicator"""
         if not indicator or indicator not in self.available_indicators:
             return pd.DataFrame()
 
-        df = self.data.copy()
-        df['MA'] = df[indicator].rolling(window=window).mean()
+        df = self.filter_data(indicators=[indicator])
+        df['MA'] = self.get_rolling_mean(indicator, window)
         df['Trend'] = np.where(df['MA'] > df['MA'].shift(1), 'Increasing', 'Decreasing')
         return df[['Year', 'Month', 'Date', indicator, 'MA', 'Trend']].dropna()
     
-    def get_yearly_summary(self, indicator):
+    def get_yearly_summary(self, indicator, start=None, end=None):
         """Get yearly summary statistics for an indicator"""
         if not indicator or indicator not in self.available_indicators:
             return pd.DataFrame()
         
-        yearly_data = self.data.groupby('Year')[indicator].agg(['mean', 'min', 'max', 'std']).reset_index()
-        return yearly_data
+        entry = self._get_window_index(indicator, start, end)
+        return entry['yearly'].copy() if entry else pd.DataFrame()
     
     def get_related_indicators(self, indicator, threshold=0.7):
         """Get indicators that are highly correlated with the given indicator"""
         if not indicator or indicator not in self.available_indicators:
             return []
         
-        # Calculate correlation with all other indicators
-        correlations = self.data[self.available_indicators].corr()[indicator]
+        # Correlation with all other indicators from the cached matrix
+        correlations = self.correlation.row(indicator)
         
         # Filter correlations above threshold (absolute value)
         related = correlations[abs(correlations) > threshold]
@@ -152,5 +709,128 @@ class DataHandler:
         # Return as a dictionary with indicator names and correlation values
         return related.to_dict()
 
-# Initialize global data handler
-data_handler = DataHandler() 
\ No newline at end of file
+class _ColumnCache(dict):
+    """Dict computing the entry of an indicator on first lookup"""
+
+    def __init__(self, compute):
+        super().__init__()
+        self._compute = compute
+
+    def __missing__(self, indicator):
+        value = self[indicator] = self._compute(indicator)
+        return value
+
+class ColumnStoreSnapshot(DataSnapshot):
+    """Snapshot whose indicator columns are memory-mapped from a column store
+
+    Statistics, sorted values and correlation rows are computed per
+    indicator on first use and correlation matrices from the requested
+    indicators only, so a request reads
+    just the columns (and, for a time window, the rows) it needs, and
+    processes mapping the same store share those pages. memory_report()
+    counts mapped columns at their full size even though only the pages
+    that were read are resident. Appending observations copies the columns
+    into an in-memory snapshot.
+    """
+
+    def __init__(self, data, period_index, data_version):
+        super().__init__(data, period_index, data_version)
+        self._stats_index = _ColumnCache(lambda indicator: build_stats_index(self.data, [indicator])[indicator])
+        self._sorted_values = _ColumnCache(lambda indicator: sort_columns(self.data, [indicator])[indicator])
+        # Correlations of one indicator with every indicator, for get_related_indicators
+        self._correlation_rows = _ColumnCache(self._correlation_row)
+
+    @classmethod
+    def open(cls, directory, data_version):
+        """Map the columns of a store; only the time index is read"""
+        ordinals, columns = open_column_store(directory)
+        period_index = pd.PeriodIndex.from_ordinals(ordinals, freq='M')
+        data = pd.DataFrame({
+            'Year': period_index.year.to_numpy(dtype=np.int64),
+            'Month': period_index.month.to_numpy(dtype=np.int64),
+            'Date': pd.array(period_index.strftime('%Y-%m'), dtype=LABEL_DTYPE),
+            **columns
+        }, copy=False)
+        return cls(data, period_index, data_version)
+
+    def extend(self, new_rows, periods, data_version):
+        """Build an in-memory snapshot with new_rows appended; its state is rebuilt on use"""
+        data = pd.concat([self.data, new_rows[self.data.columns]], ignore_index=True)
+        return DataSnapshot(data, self.period_index.append(periods), data_version)
+
+    def warm(self, previous):
+        """Compute, per indicator, the state that the previous snapshot had computed
+
+        The full correlation matrix is never built: it would page in every
+        column.
+        """
+        caches = (
+            (self._sorted_values, previous._sorted_values),
+            (self._stats_index, previous._stats_index),
+            (self._correlation_rows, getattr(previous, '_correlation_rows', None))
+        )
+        for cache, previous_cache in caches:
+            for indicator in list(previous_cache or ()):
+                if indicator in self.available_indicators:
+                    cache[indicator]
+        for indicator in list(previous.distributions):
+            self.get_distribution(indicator)
+        for indicator, window, min_periods in list(previous._rolling_means):
+            self.get_rolling_mean(indicator, window, min_periods)
+
+    def _correlation_row(self, indicator):
+        """Pairwise-complete correlations of indicator with every indicator, one column at a time"""
+        column = self.data[indicator]
+        return pd.Series(
+            {other: column.corr(self.data[other]) for other in self.available_indicators},
+            name=indicator
+        )
+
+    def create_correlation_data(self, indicators=None, start=None, end=None):
+        """Calculate correlation matrix for selected indicators from their columns only"""
+        if not indicators or len(indicators) < 2:
+            return pd.DataFrame()
+
+        window = self.filter_data(indicators=indicators, start=start, end=end)
+        return CorrelationMatrix(window, indicators).submatrix(indicators)
+
+    def get_correlation(self, indicator1, indicator2, start=None, end=None):
+        """Get the correlation between two indicators from their columns only"""
+        return float(self.create_correlation_data([indicator1, indicator2], start, end).iloc[0, 1])
+
+    def get_related_indicators(self, indicator, threshold=0.7):
+        """Get indicators that are highly correlated with the given indicator
+
+        Only the correlation row of indicator is computed (and kept), not
+        the full matrix.
+        """
+        if not indicator or indicator not in self.available_indicators:
+            return []
+
+        correlations = self._correlation_rows[indicator]
+        related = correlations[abs(correlations) > threshold]
+        related = related[related.index != indicator]
+        return related.to_dict()
+
+# Global data handler, created on first access so importing this module
+# does not read the CSV (module __getattr__, PEP 562)
+_data_handler = None
+_data_handler_lock = threading.Lock()
+
+def get_data_handler():
+    """Get the global data handler, loading the default data on first call
+
+    Its indicators are stored as the dtype named by the INDICATOR_DTYPE
+    environment variable (float64 when unset).
+    """
+    global _data_handler
+    with _data_handler_lock:
+        if _data_handler is None:
+            indicator_dtype = os.environ.get(INDICATOR_DTYPE_ENV) or DEFAULT_INDICATOR_DTYPE
+            _data_handler = DataHandler(indicator_dtype=indicator_dtype)
+    return _data_handler
+
+def __getattr__(name):
+    if name == 'data_handler':
+        return get_data_handler()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,149 @@
+import glob
+import os
+import threading
+from collections import OrderedDict
+from .data_handler import DataHandler, DEFAULT_DATA_PATH, get_data_handler
+
+DEFAULT_DATASET = 'default'
+
+class DatasetSource:
+    """A registered CSV source and, once accessed, its loaded DataHandler"""
+
+    def __init__(self, name, file_path, use_cache=True, memory_budget=None, handler=None, pinned=False,
+                 factory=None):
+        self.name = name
+        self.file_path = file_path
+        # Builds the handler on first access instead of DataHandler(file_path)
+        self.factory = factory
+        # Each source keeps its own binary cache next to its CSV (see data_cache)
+        self.use_cache = use_cache
+        # Largest number of bytes this source may use once loaded, None for no limit
+        self.memory_budget = memory_budget
+        self.handler = handler
+        # Pinned sources are never evicted
+        self.pinned = pinned
+        self.memory_usage = handler.get_memory_usage() if handler is not None else 0
+
+    @property
+    def loaded(self):
+        return self.handler is not None
+
+class DatasetRegistry:
+    """Named data sources loaded lazily and evicted least recently used first
+
+    Sources (per country, per vintage, raw or KNN-filled...) are registered
+    by name and only read when first requested. When the loaded datasets
+    together exceed memory_budget bytes, the least recently used unpinned
+    ones are dropped; they are loaded again (from their cache) on the next
+    access. With a watch_interval, every loaded dataset checks its CSV for
+    appended rows that often (see DataHandler.watch) until it is dropped.
+    """
+
+    def __init__(self, memory_budget=None, watch_interval=None):
+        self.memory_budget = memory_budget
+        # Seconds between checks of the CSV of each loaded dataset, None to not watch
+        self.watch_interval = watch_interval
+        self._sources = {}
+        # Loaded source names, least recently used first
+        self._loaded = OrderedDict()
+        self._lock = threading.RLock()
+
+    def register(self, name, file_path, use_cache=True, memory_budget=None, handler=None, pinned=False,
+                 factory=None):
+        """Register a CSV source under name without loading it"""
+        with self._lock:
+            if name in self._sources:
+                raise ValueError(f"Dataset '{name}' is already registered")
+            source = DatasetSource(name, file_path, use_cache, memory_budget, handler, pinned, factory)
+            self._sources[name] = source
+            if source.loaded:
+                self._loaded[name] = source
+            return source
+
+    def register_directory(self, directory, pattern='*.csv', **options):
+        """Register every CSV in directory under its file name, skipping known paths"""
+        with self._lock:
+            known = {os.path.abspath(source.file_path) for source in self._sources.values()}
+            names = []
+            for path in sorted(glob.glob(os.path.join(directory, pattern))):
+                name = os.path.splitext(os.path.basename(path))[0]
+                if os.path.abspath(path) in known or name in self._sources:
+                    continue
+                self.register(name, path, **options)
+                names.append(name)
+            return names
+
+    def names(self):
+        """Get the registered dataset names in registration order"""
+        return list(self._sources)
+
+    def is_loaded(self, name):
+        """Check whether a dataset is currently in memory"""
+        return name in self._loaded
+
+    def get(self, name=DEFAULT_DATASET):
+        """Get the DataHandler of a dataset, loading it on first access"""
+        with self._lock:
+            source = self._sources.get(name)
+            if source is None:
+                raise KeyError(f"Unknown dataset '{name}'")
+
+            if source.loaded:
+                self._loaded.move_to_end(name)
+                self._watch(source.handler)
+                return source.handler
+
+            if source.factory is not None:
+                handler = source.factory()
+            else:
+                handler = DataHandler(source.file_path, use_cache=source.use_cache)
+            memory_usage = handler.get_memory_usage()
+            if source.memory_budget is not None and memory_usage > source.memory_budget:
+                raise MemoryError(
+                    f"Dataset '{name}' needs {memory_usage} bytes, over its budget of {source.memory_budget}"
+                )
+
+            source.handler = handler
+            source.memory_usage = memory_usage
+            self._loaded[name] = source
+            self._evict(keep=name)
+            self._watch(handler)
+            return handler
+
+    def unload(self, name):
+        """Drop a loaded dataset from memory (it stays registered)"""
+        with self._lock:
+            source = self._loaded.pop(name, None)
+            if source is not None:
+                # The watch thread would keep the dropped handler in memory
+                source.handler.stop_watching()
+                source.handler = None
+                source.memory_usage = 0
+
+    def _watch(self, handler):
+        """Start watching the CSV of a loaded handler (no-op when already watching)"""
+        if self.watch_interval is not None and handler.file_path:
+            handler.watch(self.watch_interval)
+
+    def get_memory_usage(self):
+        """Get the bytes used by every loaded dataset"""
+        with self._lock:
+            return {name: source.memory_usage for name, source in self._loaded.items()}
+
+    def _evict(self, keep):
+        """Unload least recently used datasets until the total fits the budget"""
+        if self.memory_budget is None:
+            return
+        total = sum(source.memory_usage for source in self._loaded.values())
+        for name, source in list(self._loaded.items()):
+            if total <= self.memory_budget:
+                break
+            if name == keep or source.pinned:
+                continue
+            total -= source.memory_usage
+            print(f"Evicting dataset '{name}' ({source.memory_usage} bytes) to stay within the memory budget")
+            self.unload(name)
+
+# Global registry; the default source is the global data handler
+dataset_registry = DatasetRegistry()
+dataset_registry.register(DEFAULT_DATASET, DEFAULT_DATA_PATH, pinned=True, factory=get_data_handler)
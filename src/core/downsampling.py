@@ -0,0 +1,44 @@
+import numpy as np
+
+def lttb_indices(values, threshold):
+    """Select threshold row positions with Largest-Triangle-Three-Buckets
+
+    Points are assumed to be evenly spaced (one per month), so the row
+    position is used as x. The first and last rows are always kept; every
+    bucket in between contributes the point forming the largest triangle
+    with the previously kept point and the mean of the next bucket, which
+    preserves peaks and troughs of the line. Returns sorted positions.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    count = len(values)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+
+    # NaN gaps would poison the triangle areas; they are rare in the filled data
+    y = np.nan_to_num(values, nan=np.nanmean(values) if np.isfinite(values).any() else 0.0)
+    edges = np.linspace(1, count - 1, threshold - 1).astype(np.intp)
+
+    # Bucket means are what each triangle is anchored on, compute them all at once
+    sums = np.add.reduceat(y[1:count - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    mean_x = (edges[:-1] + edges[1:] - 1) / 2.0
+    mean_y = sums / sizes
+    # The last bucket is followed by the final point itself
+    next_x = np.append(mean_x[1:], count - 1)
+    next_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = count - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        x = np.arange(start, stop)
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (previous - next_x[bucket]) * (y[start:stop] - y[previous])
+            - (previous - x) * (next_y[bucket] - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
@@ -0,0 +1,777 @@
+import functools
+
+# Registry of static indicator and chart metadata. Everything here is built
+# once at import time and only read afterwards, so lookups on the hover and
+# rerun hot paths never construct dictionaries.
+
+# Tên tiếng Việt cho các chỉ số
+INDICATOR_NAMES = {
+    'Core_Inlation': 'Lạm phát cơ bản',
+    'Core_Inflation': 'Lạm phát cơ bản',
+    'Food_Inflation': 'Lạm phát thực phẩm',
+    'USD_VND': 'Tỷ giá USD/VND',
+    'Brent': 'Giá dầu Brent',
+    'Export': 'Kim ngạch xuất khẩu',
+    'Import': 'Kim ngạch nhập khẩu',
+    'VN_Trade_Balance': 'Cán cân thương mại',
+    'Gold': 'Giá vàng',
+    'VN_Gasoline_Prices': 'Giá xăng dầu',
+    'VN_Interest_Rate': 'Lãi suất',
+    'Industrial_products': 'Sản xuất công nghiệp',
+    'MonthlyCPI': 'CPI hàng tháng',
+    'Unemployment Rate': 'Tỷ lệ thất nghiệp',
+    'VN_money_supply': 'Cung tiền M2',
+    'VN_rice_price': 'Giá gạo',
+    'China_CPI': 'CPI Trung Quốc',
+    'VN_fiscal_deficit': 'Thâm hụt ngân sách',
+    'Agriculture, Forestry and Fishing': 'Nông lâm ngư nghiệp',
+    'VN_coffee,tea,mate,spices': 'Cà phê, chè, hương liệu'
+}
+
+# Giải thích cho từng mức giá trị
+INDICATOR_INTERPRETATIONS = {
+    'Core_Inlation': {
+        'low': 'Áp lực lạm phát thấp, có thể cần kích thích kinh tế',
+        'medium': 'Lạm phát ở mức hợp lý, kinh tế ổn định',
+        'high': 'Áp lực lạm phát cao, cần chính sách thắt chặt'
+    },
+    'Core_Inflation': {
+        'low': 'Áp lực lạm phát thấp, có thể cần kích thích kinh tế',
+        'medium': 'Lạm phát ở mức hợp lý, kinh tế ổn định',
+        'high': 'Áp lực lạm phát cao, cần chính sách thắt chặt'
+    },
+    'Food_Inflation': {
+        'low': 'Giá thực phẩm ổn định, có lợi cho người tiêu dùng',
+        'medium': 'Giá thực phẩm tăng vừa phải',
+        'high': 'Giá thực phẩm tăng cao, ảnh hưởng đến chi tiêu hộ gia đình'
+    },
+    'USD_VND': {
+        'low': 'VND tăng giá, có lợi cho nhập khẩu và đi du lịch nước ngoài',
+        'medium': 'Tỷ giá ổn định, thuận lợi cho kế hoạch kinh doanh',
+        'high': 'VND mất giá, có lợi cho xuất khẩu nhưng bất lợi cho nhập khẩu'
+    },
+    'Brent': {
+        'low': 'Giá dầu thấp, giảm chi phí sản xuất và vận tải',
+        'medium': 'Giá dầu ở mức cân bằng',
+        'high': 'Giá dầu cao, tăng chi phí sản xuất và vận tải'
+    },
+}
+
+# Thêm các interpretation mặc định cho các chỉ số còn lại
+for _indicator in INDICATOR_NAMES:
+    INDICATOR_INTERPRETATIONS.setdefault(_indicator, {
+        'low': 'Giá trị thấp hơn mức trung bình lịch sử',
+        'medium': 'Giá trị nằm trong khoảng trung bình lịch sử',
+        'high': 'Giá trị cao hơn mức trung bình lịch sử'
+    })
+
+# Giải thích chi tiết cho từng chỉ số
+INDICATOR_EXPLANATIONS = {
+    'Core_Inflation': {
+        'title': 'Lạm phát cơ bản',
+        'description': 'Chỉ số giá tiêu dùng không bao gồm giá thực phẩm và năng lượng, phản ánh xu hướng lạm phát dài hạn.',
+        'impact': 'Ảnh hưởng trực tiếp đến chính sách tiền tệ và lãi suất của ngân hàng trung ương.',
+        'interpretation': 'Giá trị dương cho thấy áp lực lạm phát tăng, giá trị âm thể hiện xu hướng giảm phát.',
+        'threshold': {
+            'high': '> 2%: Cần theo dõi chặt chẽ',
+            'medium': '1-2%: Mức ổn định',
+            'low': '< 1%: Áp lực lạm phát thấp'
+        }
+    },
+    'Core_Inlation': {
+        'title': 'Lạm phát cơ bản',
+        'description': 'Chỉ số giá tiêu dùng không bao gồm giá thực phẩm và năng lượng, phản ánh xu hướng lạm phát dài hạn.',
+        'impact': 'Ảnh hưởng trực tiếp đến chính sách tiền tệ và lãi suất của ngân hàng trung ương.',
+        'interpretation': 'Giá trị dương cho thấy áp lực lạm phát tăng, giá trị âm thể hiện xu hướng giảm phát.',
+        'threshold': {
+            'high': '> 2%: Cần theo dõi chặt chẽ',
+            'medium': '1-2%: Mức ổn định',
+            'low': '< 1%: Áp lực lạm phát thấp'
+        }
+    },
+    'Food_Inflation': {
+        'title': 'Lạm phát thực phẩm',
+        'description': 'Biến động giá các mặt hàng thực phẩm, chiếm tỷ trọng lớn trong chi tiêu của người dân.',
+        'impact': 'Ảnh hưởng trực tiếp đến đời sống người dân và chỉ số giá tiêu dùng tổng thể.',
+        'interpretation': 'Thường có tính chu kỳ theo mùa vụ và chịu ảnh hưởng từ thời tiết, thiên tai.',
+        'threshold': {
+            'high': '> 3%: Giá thực phẩm tăng mạnh',
+            'medium': '1-3%: Biến động bình thường',
+            'low': '< 1%: Giá thực phẩm ổn định'
+        }
+    },
+    'USD_VND': {
+        'title': 'Tỷ giá USD/VND',
+        'description': 'Tỷ giá hối đoái giữa đồng Việt Nam và đô la Mỹ, phản ánh sức mạnh tương đối giữa hai đồng tiền.',
+        'impact': 'Ảnh hưởng đến hoạt động xuất nhập khẩu, đầu tư nước ngoài và giá cả hàng hóa.',
+        'interpretation': 'Tăng thể hiện VND mất giá, giảm thể hiện VND tăng giá so với USD.',
+        'threshold': {
+            'high': '> 2% tháng: VND mất giá mạnh',
+            'medium': '0.5-2%: Biến động bình thường',
+            'low': '< 0.5%: Tỷ giá ổn định'
+        }
+    },
+    'Brent': {
+        'title': 'Giá dầu Brent',
+        'description': 'Giá dầu thô Brent - một trong những chỉ số tham chiếu quan trọng của thị trường dầu mỏ thế giới.',
+        'impact': 'Ảnh hưởng đến chi phí sản xuất, vận tải và giá nhiên liệu trong nước.',
+        'interpretation': 'Biến động mạnh thường do căng thẳng địa chính trị hoặc thay đổi cung cầu toàn cầu.',
+        'threshold': {
+            'high': '> 80 USD/thùng: Giá cao',
+            'medium': '50-80 USD/thùng: Mức cân bằng',
+            'low': '< 50 USD/thùng: Giá thấp'
+        }
+    },
+    'Export': {
+        'title': 'Kim ngạch xuất khẩu',
+        'description': 'Tổng giá trị hàng hóa và dịch vụ xuất khẩu của Việt Nam.',
+        'impact': 'Phản ánh năng lực cạnh tranh và khả năng tham gia chuỗi giá trị toàn cầu.',
+        'interpretation': 'Tăng trưởng dương thể hiện cải thiện năng lực xuất khẩu.',
+        'threshold': {
+            'high': '> 10% năm: Tăng trưởng mạnh',
+            'medium': '5-10%: Tăng trưởng ổn định',
+            'low': '< 5%: Tăng trưởng chậm'
+        }
+    },
+    'Import': {
+        'title': 'Kim ngạch nhập khẩu',
+        'description': 'Tổng giá trị hàng hóa và dịch vụ nhập khẩu vào Việt Nam.',
+        'impact': 'Phản ánh nhu cầu tiêu dùng và đầu tư trong nước.',
+        'interpretation': 'Tăng có thể do đầu tư mở rộng sản xuất hoặc tiêu dùng tăng.',
+        'threshold': {
+            'high': '> 12% năm: Nhu cầu cao',
+            'medium': '6-12%: Nhu cầu bình thường',
+            'low': '< 6%: Nhu cầu thấp'
+        }
+    },
+    'VN_Trade_Balance': {
+        'title': 'Cán cân thương mại',
+        'description': 'Chênh lệch giữa giá trị xuất khẩu và nhập khẩu.',
+        'impact': 'Ảnh hưởng đến tỷ giá hối đoái và dự trữ ngoại hối.',
+        'interpretation': 'Dương là thặng dư, âm là thâm hụt thương mại.',
+        'threshold': {
+            'high': '> 1 tỷ USD: Thặng dư lớn',
+            'medium': '-1 đến 1 tỷ USD: Cân bằng',
+            'low': '< -1 tỷ USD: Thâm hụt lớn'
+        }
+    },
+    'Gold': {
+        'title': 'Giá vàng',
+        'description': 'Giá vàng thế giới được giao dịch trên thị trường quốc tế, thường tính bằng USD/ounce.',
+        'impact': 'Là tài sản trú ẩn an toàn, ảnh hưởng đến thị trường tài chính và lạm phát kỳ vọng.',
+        'interpretation': 'Tăng khi có bất ổn kinh tế/chính trị, giảm khi kinh tế phát triển ổn định.',
+        'threshold': {
+            'high': '> 1800 USD/ounce: Giá cao',
+            'medium': '1500-1800 USD/ounce: Mức bình thường',
+            'low': '< 1500 USD/ounce: Giá thấp'
+        }
+    },
+    'VN_Gasoline_Prices': {
+        'title': 'Giá xăng dầu Việt Nam',
+        'description': 'Giá bán lẻ xăng dầu trong nước, phản ánh biến động giá năng lượng toàn cầu và chính sách quản lý giá.',
+        'impact': 'Ảnh hưởng trực tiếp đến chi phí sản xuất, vận tải và lạm phát.',
+        'interpretation': 'Biến động theo giá dầu thế giới nhưng có độ trễ và mức độ thay đổi khác nhau do quỹ bình ổn giá.',
+        'threshold': {
+            'high': '> 25.000 VND/lít: Giá cao',
+            'medium': '20.000-25.000 VND/lít: Mức bình thường',
+            'low': '< 20.000 VND/lít: Giá thấp'
+        }
+    },
+    'VN_rice_price': {
+        'title': 'Giá gạo Việt Nam',
+        'description': 'Giá gạo xuất khẩu của Việt Nam, thường tính bằng USD/tấn.',
+        'impact': 'Ảnh hưởng đến thu nhập nông dân, an ninh lương thực và cán cân thương mại.',
+        'interpretation': 'Biến động theo mùa vụ, chính sách xuất khẩu và nhu cầu thị trường quốc tế.',
+        'threshold': {
+            'high': '> 500 USD/tấn: Giá cao',
+            'medium': '400-500 USD/tấn: Mức bình thường',
+            'low': '< 400 USD/tấn: Giá thấp'
+        }
+    },
+    'VN_coffee,tea,mate,spices': {
+        'title': 'Xuất khẩu cà phê, chè và gia vị',
+        'description': 'Giá trị xuất khẩu các mặt hàng cà phê, chè, mate và gia vị của Việt Nam.',
+        'impact': 'Đóng góp vào kim ngạch xuất khẩu và thu nhập của nông dân vùng sản xuất.',
+        'interpretation': 'Biến động theo mùa vụ và nhu cầu thị trường quốc tế.',
+        'threshold': {
+            'high': '> 15% tăng trưởng năm: Rất tốt',
+            'medium': '5-15% tăng trưởng năm: Bình thường',
+            'low': '< 5% tăng trưởng năm: Thấp'
+        }
+    },
+    'MonthlyCPI': {
+        'title': 'Chỉ số giá tiêu dùng hàng tháng',
+        'description': 'Chỉ số đo lường sự thay đổi về giá của một rổ hàng hóa và dịch vụ tiêu dùng phổ biến theo tháng.',
+        'impact': 'Là chỉ số chính để đánh giá lạm phát và điều chỉnh chính sách tiền tệ.',
+        'interpretation': 'Tăng liên tục cho thấy áp lực lạm phát, giảm có thể báo hiệu suy thoái.',
+        'threshold': {
+            'high': '> 0.5% tháng: Lạm phát cao',
+            'medium': '0.2-0.5% tháng: Lạm phát vừa phải',
+            'low': '< 0.2% tháng: Lạm phát thấp'
+        }
+    },
+    'China_CPI': {
+        'title': 'Chỉ số giá tiêu dùng Trung Quốc',
+        'description': 'Chỉ số giá tiêu dùng của Trung Quốc, đo lường mức độ lạm phát tại thị trường lớn nhất khu vực.',
+        'impact': 'Ảnh hưởng đến giá hàng hóa xuất nhập khẩu và chuỗi cung ứng toàn cầu.',
+        'interpretation': 'Biến động giá tại Trung Quốc thường có tác động lan tỏa đến Việt Nam.',
+        'threshold': {
+            'high': '> 3% năm: Lạm phát cao',
+            'medium': '1-3% năm: Lạm phát vừa phải',
+            'low': '< 1% năm: Lạm phát thấp'
+        }
+    },
+    'Industrial_products': {
+        'title': 'Sản xuất công nghiệp',
+        'description': 'Chỉ số sản xuất công nghiệp, phản ánh tăng trưởng trong lĩnh vực sản xuất và chế tạo.',
+        'impact': 'Ảnh hưởng trực tiếp đến tăng trưởng GDP và việc làm trong ngành công nghiệp.',
+        'interpretation': 'Tăng thể hiện hoạt động sản xuất mạnh mẽ, giảm báo hiệu suy giảm kinh tế.',
+        'threshold': {
+            'high': '> 8% năm: Tăng trưởng mạnh',
+            'medium': '4-8% năm: Tăng trưởng ổn định',
+            'low': '< 4% năm: Tăng trưởng yếu'
+        }
+    },
+    'Agriculture, Forestry and Fishing': {
+        'title': 'Nông, lâm nghiệp và thủy sản',
+        'description': 'Chỉ số tăng trưởng của ngành nông, lâm nghiệp và thủy sản, phản ánh sản lượng trong lĩnh vực này.',
+        'impact': 'Ảnh hưởng đến an ninh lương thực, đời sống nông dân và xuất khẩu nông sản.',
+        'interpretation': 'Có tính chu kỳ theo mùa vụ và chịu ảnh hưởng lớn từ điều kiện thời tiết.',
+        'threshold': {
+            'high': '> 4% năm: Tăng trưởng tốt',
+            'medium': '2-4% năm: Tăng trưởng ổn định',
+            'low': '< 2% năm: Tăng trưởng thấp'
+        }
+    },
+    'Unemployment Rate': {
+        'title': 'Tỷ lệ thất nghiệp',
+        'description': 'Phần trăm lực lượng lao động không có việc làm nhưng đang tích cực tìm kiếm việc làm.',
+        'impact': 'Phản ánh sức khỏe của thị trường lao động và tình hình kinh tế.',
+        'interpretation': 'Tăng trong thời gian dài báo hiệu suy thoái kinh tế, giảm thể hiện phục hồi.',
+        'threshold': {
+            'high': '> 3% (Việt Nam): Thất nghiệp cao',
+            'medium': '2-3%: Mức bình thường',
+            'low': '< 2%: Thất nghiệp thấp'
+        }
+    },
+    'VN_fiscal_deficit': {
+        'title': 'Thâm hụt ngân sách',
+        'description': 'Chênh lệch giữa chi tiêu công và thu ngân sách của chính phủ.',
+        'impact': 'Ảnh hưởng đến nợ công, áp lực lạm phát và tỷ giá hối đoái.',
+        'interpretation': 'Thâm hụt cao có thể kích thích tăng trưởng ngắn hạn nhưng gây áp lực dài hạn.',
+        'threshold': {
+            'high': '> 5% GDP: Thâm hụt cao',
+            'medium': '3-5% GDP: Mức bình thường',
+            'low': '< 3% GDP: Thâm hụt thấp'
+        }
+    },
+    'VN_Interest_Rate': {
+        'title': 'Lãi suất chính sách',
+        'description': 'Lãi suất cơ bản do Ngân hàng Nhà nước Việt Nam điều hành.',
+        'impact': 'Ảnh hưởng đến chi phí vay vốn, đầu tư và tiết kiệm trong nền kinh tế.',
+        'interpretation': 'Tăng thường nhằm kiểm soát lạm phát, giảm để kích thích tăng trưởng.',
+        'threshold': {
+            'high': '> 6%: Lãi suất cao',
+            'medium': '4-6%: Mức bình thường',
+            'low': '< 4%: Lãi suất thấp'
+        }
+    },
+    'VN_money_supply': {
+        'title': 'Cung tiền M2',
+        'description': 'Tổng lượng tiền trong lưu thông và tiền gửi không kỳ hạn, tiền gửi có kỳ hạn ngắn.',
+        'impact': 'Ảnh hưởng đến lạm phát, tăng trưởng tín dụng và hoạt động kinh tế.',
+        'interpretation': 'Tăng nhanh có thể gây lạm phát, tăng chậm có thể hạn chế tăng trưởng.',
+        'threshold': {
+            'high': '> 15% năm: Tăng trưởng nhanh',
+            'medium': '10-15% năm: Mức bình thường',
+            'low': '< 10% năm: Tăng trưởng chậm'
+        }
+    },
+    'PC1': {
+        'title': 'Thành phần chính 1',
+        'description': 'Thành phần chính đầu tiên từ phân tích PCA, tổng hợp biến động của nhiều chỉ số kinh tế.',
+        'impact': 'Cung cấp cái nhìn tổng quan về xu hướng chung của nền kinh tế.',
+        'interpretation': 'Giá trị dương thường thể hiện sự mở rộng, giá trị âm báo hiệu thu hẹp kinh tế.',
+        'threshold': {
+            'high': '> 1: Tăng trưởng mạnh',
+            'medium': '-1 đến 1: Mức bình thường',
+            'low': '< -1: Suy giảm'
+        }
+    }
+}
+
+# Ngưỡng (cao, trung bình) dùng để đánh giá mức độ giá trị trong hover
+LEVEL_THRESHOLDS = {
+    'Core_Inflation': (2, 1),
+    'Food_Inflation': (2, 1),
+    'USD_VND': (2, 0.5),
+    'Brent': (80, 50),
+    'Export': (10, 5),
+    'Import': (10, 5),
+    'VN_Trade_Balance': (1, -1)
+}
+
+# Định dạng hiển thị giá trị (kèm đơn vị) theo chỉ số
+VALUE_FORMATS = {
+    'Core_Inflation': '{:.1f}%',
+    'Food_Inflation': '{:.1f}%',
+    'USD_VND': '{:,.0f} VND',
+    'Brent': '${:.2f}/thùng',
+    'Export': '${:.2f} tỷ',
+    'Import': '${:.2f} tỷ',
+    'VN_Trade_Balance': '${:.2f} tỷ'
+}
+
+DEFAULT_VALUE_FORMAT = '{:,.2f}'
+
+# Các annotation lịch sử quan trọng theo tháng
+HISTORICAL_ANNOTATIONS = {
+    '2007-01': {
+        'event': 'Gia nhập WTO',
+        'impact': 'Tăng trưởng xuất khẩu và đầu tư nước ngoài',
+        'context': 'Việt Nam chính thức gia nhập Tổ chức Thương mại Thế giới'
+    },
+    '2008-06': {
+        'event': 'Khủng hoảng tài chính toàn cầu',
+        'impact': 'Tăng lạm phát, giảm tăng trưởng',
+        'context': 'Khủng hoảng bùng nổ từ Mỹ và lan rộng toàn cầu'
+    },
+    '2011-02': {
+        'event': 'Thắt chặt chính sách tiền tệ',
+        'impact': 'Lãi suất tăng cao, tín dụng giảm',
+        'context': 'Ngân hàng Nhà nước tăng lãi suất để kiểm soát lạm phát'
+    },
+    '2015-08': {
+        'event': 'Phá giá đồng Nhân dân tệ',
+        'impact': 'Tỷ giá USD/VND tăng mạnh',
+        'context': 'Trung Quốc phá giá đồng tiền gây áp lực lên thị trường tiền tệ khu vực'
+    },
+    '2018-01': {
+        'event': 'Chiến tranh thương mại Mỹ-Trung',
+        'impact': 'Xuất khẩu tăng do dịch chuyển chuỗi cung ứng',
+        'context': 'Mỹ áp thuế lên hàng hóa Trung Quốc, cơ hội cho hàng Việt'
+    },
+    '2020-01': {
+        'event': 'Đại dịch COVID-19',
+        'impact': 'Gián đoạn chuỗi cung ứng, tiêu dùng giảm mạnh',
+        'context': 'Đại dịch bùng phát từ Trung Quốc và lan rộng toàn cầu'
+    },
+    '2022-02': {
+        'event': 'Xung đột Nga-Ukraine',
+        'impact': 'Giá năng lượng và lương thực tăng mạnh',
+        'context': 'Xung đột tác động đến chuỗi cung ứng toàn cầu'
+    },
+    '2023-03': {
+        'event': 'Khủng hoảng ngân hàng Mỹ',
+        'impact': 'Biến động thị trường tài chính, FED tăng lãi suất',
+        'context': 'Silicon Valley Bank và Signature Bank sụp đổ'
+    }
+}
+
+# Các sự kiện lịch sử quan trọng với các tháng cụ thể và giai đoạn
+HISTORICAL_EVENTS = [
+    {
+        'event': 'Gia nhập WTO',
+        'month': '2007-01',
+        'period_start': '2007-01',
+        'period_end': '2007-06',
+        'impact': 'Nhẹ',
+        'color': '#E0E0E0',  # xám nhạt
+        'description': 'Tháng 1/2007: Gia nhập WTO'
+    },
+    {
+        'event': 'Khủng hoảng giá thực phẩm',
+        'month': '2007-12',
+        'period_start': '2007-12',
+        'period_end': '2008-06',
+        'impact': 'Trung bình',
+        'color': '#B0B0B0',  # xám trung
+        'description': 'Tháng 12/2007: Khủng hoảng giá thực phẩm'
+    },
+    {
+        'event': 'Khủng hoảng tài chính',
+        'month': '2008-06',
+        'period_start': '2008-06',
+        'period_end': '2009-12',
+        'impact': 'Lớn',
+        'color': '#808080',  # xám đậm
+        'description': 'Tháng 6/2008: Khủng hoảng tài chính'
+    },
+    {
+        'event': 'Phục hồi sau khủng hoảng',
+        'month': '2010-06',
+        'period_start': '2010-01',
+        'period_end': '2010-12',
+        'impact': 'Nhẹ',
+        'color': '#E0E0E0',  # xám nhạt
+        'description': 'Tháng 6/2010: Phục hồi sau khủng hoảng'
+    },
+    {
+        'event': 'Lạm phát cao',
+        'month': '2011-06',
+        'period_start': '2011-01',
+        'period_end': '2011-12',
+        'impact': 'Lớn',
+        'color': '#808080',  # xám đậm
+        'description': 'Tháng 6/2011: Lạm phát cao'
+    },
+    {
+        'event': 'Giá gạo tăng',
+        'month': '2018-08',
+        'period_start': '2018-08',
+        'period_end': '2018-12',
+        'impact': 'Trung bình',
+        'color': '#B0B0B0',  # xám trung
+        'description': 'Tháng 8/2018: Giá gạo tăng'
+    },
+    {
+        'event': 'Đại dịch COVID-19',
+        'month': '2020-01',
+        'period_start': '2020-01',
+        'period_end': '2021-12',
+        'impact': 'Lớn',
+        'color': '#808080',  # xám đậm
+        'description': 'Tháng 1/2020: Đại dịch COVID-19'
+    },
+    {
+        'event': 'Xung đột Nga-Ukraine',
+        'month': '2022-03',
+        'period_start': '2022-03',
+        'period_end': '2022-12',
+        'impact': 'Trung bình',
+        'color': '#B0B0B0',  # xám trung
+        'description': 'Tháng 3/2022: Xung đột Nga-Ukraine'
+    }
+]
+
+# Giải thích cách đọc từng loại biểu đồ
+CHART_EXPLANATIONS = {
+    'Biểu đồ xu hướng': {
+        'title': 'Biểu đồ xu hướng theo thời gian',
+        'description': 'Hiển thị sự biến động của các chỉ số theo thời gian, giúp nhận diện xu hướng và chu kỳ.',
+        'usage': 'Phù hợp để theo dõi xu hướng dài hạn và so sánh biến động giữa các chỉ số.',
+        'reading_guide': [
+            'Độ dốc của đường biểu thị tốc độ thay đổi (càng dốc = thay đổi càng nhanh)',
+            'Điểm đỉnh và đáy giúp xác định các giai đoạn biến động mạnh',
+            'Đường càng dao động = độ biến động cao, đường ít dao động = ổn định',
+            'Dấu sao (★) đánh dấu những điểm biến động mạnh > 5% so với kỳ trước',
+            'Vùng nền màu thể hiện các giai đoạn lịch sử quan trọng ảnh hưởng đến chỉ số'
+        ]
+    },
+    'Biểu đồ phân tán': {
+        'title': 'Biểu đồ tương quan',
+        'description': 'Thể hiện mối quan hệ giữa hai chỉ số, với màu sắc thể hiện thời gian.',
+        'usage': 'Dùng để phân tích mối quan hệ và phát hiện các điểm bất thường.',
+        'reading_guide': [
+            'Các điểm nằm dọc theo đường chéo từ dưới-trái lên trên-phải: tương quan dương (cùng tăng/giảm)',
+            'Các điểm nằm dọc theo đường chéo từ trên-trái xuống dưới-phải: tương quan âm (một tăng, một giảm)',
+            'Điểm nằm xa xu hướng chung: điểm bất thường, cần chú ý',
+            'Màu sắc cho biết thời gian, giúp theo dõi sự thay đổi của mối quan hệ theo thời gian',
+            'Sự phân tán của điểm cho biết độ mạnh của mối tương quan (càng gần = tương quan càng mạnh)'
+        ]
+    },
+    'Bản đồ nhiệt thời gian': {
+        'title': 'Bản đồ nhiệt theo tháng và năm',
+        'description': 'Hiển thị cường độ của chỉ số theo màu sắc, phân chia theo tháng và năm.',
+        'usage': 'Phù hợp để phân tích mẫu hình theo mùa và xu hướng dài hạn.',
+        'reading_guide': [
+            'Màu đỏ thể hiện giá trị cao, màu xanh thể hiện giá trị thấp',
+            'Nhìn theo hàng ngang (mỗi năm): xác định chu kỳ theo mùa',
+            'Nhìn theo cột dọc (cùng tháng qua các năm): xác định xu hướng dài hạn',
+            'Dấu sao (★) đánh dấu các sự kiện lịch sử đặc biệt ảnh hưởng đến chỉ số',
+            'So sánh các ô cùng màu để tìm mẫu hình lặp lại theo mùa hoặc chu kỳ kinh tế'
+        ]
+    },
+    'Biểu đồ mùa vụ': {
+        'title': 'Biểu đồ biến động theo mùa',
+        'description': 'Phân tích sự biến động của chỉ số theo từng tháng trong năm.',
+        'usage': 'Xác định mẫu hình mùa vụ, tháng cao điểm và thấp điểm.',
+        'reading_guide': [
+            'Đường chính thể hiện giá trị trung bình của chỉ số theo từng tháng',
+            'Vùng màu xám thể hiện độ biến thiên (độ lệch chuẩn) của giá trị',
+            'Dấu sao màu đỏ (★) đánh dấu tháng có giá trị cao bất thường (cao điểm theo mùa)',
+            'Dấu sao màu xanh (★) đánh dấu tháng có giá trị thấp bất thường (thấp điểm theo mùa)',
+            'Vùng có độ biến thiên rộng: chỉ số có độ dao động lớn trong tháng đó qua các năm'
+        ]
+    },
+    'Ma trận tương quan': {
+        'title': 'Ma trận tương quan giữa các chỉ số',
+        'description': 'Hiển thị mức độ tương quan giữa tất cả các chỉ số được chọn.',
+        'usage': 'Phù hợp để xác định nhanh mối liên hệ giữa nhiều chỉ số cùng lúc.',
+        'reading_guide': [
+            'Màu xanh thể hiện tương quan dương (cùng tăng/giảm), màu đỏ thể hiện tương quan âm (một tăng, một giảm)',
+            'Độ đậm của màu thể hiện độ mạnh của tương quan (càng đậm = liên hệ càng mạnh)',
+            'Các ô theo đường chéo chính luôn có giá trị 1 (tương quan hoàn hảo với chính nó)',
+            'Hệ số gần 0 (màu nhạt): hai chỉ số ít hoặc không liên quan đến nhau',
+            'Hệ số gần 1 hoặc -1 (màu đậm): hai chỉ số có mối liên hệ chặt chẽ'
+        ]
+    },
+    'Biểu đồ xu hướng chi tiết': {
+        'title': 'Phân tích xu hướng của chỉ số',
+        'description': 'Phân tích chi tiết xu hướng của chỉ số với đường trung bình di động.',
+        'usage': 'Loại bỏ nhiễu ngắn hạn để xem xu hướng dài hạn rõ ràng hơn.',
+        'reading_guide': [
+            'Đường màu chính thể hiện giá trị thực của chỉ số',
+            'Đường đứt khúc là đường trung bình di động (MA), làm mịn dao động ngắn hạn',
+            'Khi đường giá trị cắt lên trên đường MA: tín hiệu xu hướng tăng',
+            'Khi đường giá trị cắt xuống dưới đường MA: tín hiệu xu hướng giảm',
+            'Dấu chấm xanh/đỏ thể hiện điểm bắt đầu của xu hướng tăng/giảm'
+        ]
+    },
+    'Biểu đồ cột': {
+        'title': 'Biểu đồ cột so sánh các chỉ số',
+        'description': 'So sánh giá trị của các chỉ số theo thời gian hoặc nhóm.',
+        'usage': 'Phù hợp để so sánh giá trị rời rạc giữa các biến số khác nhau.',
+        'reading_guide': [
+            'Chiều cao của cột thể hiện giá trị của chỉ số tại thời điểm đó',
+            'So sánh các cột cùng màu để thấy biến động của một chỉ số theo thời gian',
+            'So sánh các cột khác màu tại cùng thời điểm để so sánh các chỉ số với nhau',
+            'Những cột cao bất thường cho thấy các giai đoạn tăng trưởng mạnh hoặc suy giảm',
+            'Khoảng cách đều đặn giữa các cột liên tiếp thể hiện chu kỳ ổn định'
+        ]
+    },
+    'Biểu đồ hộp': {
+        'title': 'Biểu đồ hộp phân tích phân phối',
+        'description': 'Hiển thị phân phối thống kê của các chỉ số kinh tế.',
+        'usage': 'Phù hợp để phân tích độ biến động và phát hiện giá trị bất thường.',
+        'reading_guide': [
+            'Đường ngang giữa hộp: giá trị trung vị (50% số quan sát)',
+            'Viền dưới và trên của hộp: tứ phân vị thứ nhất (25%) và thứ ba (75%)',
+            'Các "râu" kéo dài: phạm vi bình thường của dữ liệu (1.5 x khoảng tứ phân vị)',
+            'Điểm nằm ngoài "râu": giá trị bất thường (outliers), cần chú ý đặc biệt',
+            'Hộp càng cao: độ phân tán dữ liệu càng lớn, hộp thấp: dữ liệu tập trung'
+        ]
+    },
+    'Biểu đồ histogram': {
+        'title': 'Biểu đồ phân phối tần suất',
+        'description': 'Hiển thị tần suất xuất hiện của các khoảng giá trị trong chỉ số.',
+        'usage': 'Phù hợp để hiểu phân phối và mô hình thống kê của dữ liệu.',
+        'reading_guide': [
+            'Trục X: các khoảng giá trị của chỉ số, trục Y: tần suất xuất hiện',
+            'Đỉnh của histogram: giá trị phổ biến nhất của chỉ số',
+            'Đường cong đỏ (KDE): ước tính phân phối xác suất liên tục của dữ liệu',
+            'Histogram lệch phải: nhiều giá trị cao bất thường, lệch trái: nhiều giá trị thấp bất thường',
+            'Histogram có nhiều đỉnh: dữ liệu có thể thuộc về nhiều chu kỳ hoặc thời kỳ khác nhau'
+        ]
+    },
+    'Biểu đồ vùng': {
+        'title': 'Biểu đồ vùng tích lũy',
+        'description': 'Hiển thị xu hướng của các chỉ số theo thời gian với diện tích tô màu.',
+        'usage': 'Phù hợp để theo dõi xu hướng và đóng góp tương đối của các thành phần.',
+        'reading_guide': [
+            'Trục X: thời gian, trục Y: giá trị tích lũy của các chỉ số',
+            'Diện tích màu thể hiện giá trị hoặc tỷ trọng đóng góp của từng chỉ số',
+            'Vùng trên cùng thể hiện tổng giá trị của tất cả các chỉ số theo thời gian',
+            'Mở rộng vùng theo chiều dọc: đóng góp của chỉ số tăng lên',
+            'Thu hẹp vùng theo chiều dọc: đóng góp của chỉ số giảm xuống'
+        ]
+    },
+    'Biểu đồ radar': {
+        'title': 'Biểu đồ radar so sánh nhiều chỉ số',
+        'description': 'Hiển thị giá trị chuẩn hóa của nhiều chỉ số trên các trục tỏa ra từ tâm.',
+        'usage': 'Phù hợp để so sánh toàn diện nhiều chỉ số cùng lúc.',
+        'reading_guide': [
+            'Mỗi trục tỏa ra từ tâm thể hiện một chỉ số riêng biệt',
+            'Giá trị gần tâm: thấp hơn, giá trị xa tâm: cao hơn (đã chuẩn hóa)',
+            'Diện tích của đa giác thể hiện mức độ tổng thể của tất cả các chỉ số',
+            'Biểu đồ cân đối (gần hình tròn): các chỉ số tương đối đồng đều',
+            'Biểu đồ không cân đối: một số chỉ số nổi trội hơn các chỉ số khác'
+        ]
+    },
+    'Biểu đồ bong bóng': {
+        'title': 'Biểu đồ bong bóng so sánh ba chiều',
+        'description': 'Hiển thị mối quan hệ giữa ba chỉ số: X, Y và kích thước bong bóng.',
+        'usage': 'Phù hợp để phân tích mối quan hệ phức tạp giữa ba biến.',
+        'reading_guide': [
+            'Trục X và Y: hai chỉ số chính cần so sánh',
+            'Kích thước bong bóng: chỉ số thứ ba, càng lớn = giá trị càng cao',
+            'Màu sắc thể hiện thời gian, giúp theo dõi sự thay đổi theo thời gian',
+            'Đường chấm đỏ thể hiện xu hướng tương quan giữa hai chỉ số trên trục X và Y',
+            'Bong bóng di chuyển theo đường chéo: hai chỉ số X và Y có tương quan mạnh'
+        ]
+    },
+    'Biểu đồ dòng chảy': {
+        'title': 'Biểu đồ dòng chảy Sankey',
+        'description': 'Hiển thị dòng chảy và mối quan hệ giữa các nhóm chỉ số.',
+        'usage': 'Phù hợp để phân tích sự phân bổ và dòng chảy giữa các thành phần.',
+        'reading_guide': [
+            'Độ rộng của mỗi dòng thể hiện lượng hoặc giá trị dòng chảy',
+            'Các nút thể hiện các nhóm hoặc thành phần chính',
+            'Màu sắc theo nút nguồn hoặc nút đích, giúp phân biệt các dòng chảy',
+            'Dòng càng rộng: đóng góp hoặc mối liên hệ càng mạnh',
+            'Di chuột qua mỗi dòng để xem chi tiết giá trị và mối liên hệ'
+        ]
+    },
+    'Biểu đồ bánh': {
+        'title': 'Biểu đồ tròn thể hiện tỷ lệ',
+        'description': 'Hiển thị tỷ lệ đóng góp của từng chỉ số vào tổng thể.',
+        'usage': 'Phù hợp để so sánh tỷ trọng của các thành phần trong một tổng thể.',
+        'reading_guide': [
+            'Mỗi phần của bánh thể hiện tỷ lệ phần trăm của một chỉ số',
+            'Tổng của tất cả các phần luôn bằng 100%',
+            'Phần lớn nhất thể hiện chỉ số đóng góp nhiều nhất',
+            'Tránh sử dụng biểu đồ này khi có quá nhiều chỉ số (gây khó đọc)',
+            'Di chuột qua mỗi phần để xem chi tiết giá trị và phần trăm'
+        ]
+    }
+}
+
+# Mô tả và khoảng số chỉ số (min, max) phù hợp cho từng loại biểu đồ
+CHART_RECOMMENDATIONS = {
+    'Biểu đồ xu hướng': {
+        'icon': '📈',
+        'description': 'Hiển thị biến động các chỉ số theo thời gian',
+        'conditions': 'Phù hợp với 1-5 chỉ số',
+        'recommended': (1, 5),
+        'possible': (6, None)
+    },
+    'Biểu đồ vùng': {
+        'icon': '🏞️',
+        'description': 'Hiển thị xu hướng với diện tích tô màu',
+        'conditions': 'Phù hợp với 2-5 chỉ số',
+        'recommended': (2, 5),
+        'possible': (6, None)
+    },
+    'Biểu đồ cột': {
+        'icon': '📊',
+        'description': 'So sánh giá trị các chỉ số theo thời gian',
+        'conditions': 'Phù hợp với 1-6 chỉ số',
+        'recommended': (1, 6),
+        'possible': (7, None)
+    },
+    'Biểu đồ phân tán': {
+        'icon': '🔍',
+        'description': 'Phân tích tương quan giữa hai chỉ số',
+        'conditions': 'Chính xác 2 chỉ số',
+        'recommended': (2, 2),
+        'possible': None
+    },
+    'Ma trận tương quan': {
+        'icon': '🧩',
+        'description': 'Hiển thị mối tương quan giữa nhiều chỉ số',
+        'conditions': 'Từ 2 chỉ số trở lên',
+        'recommended': (4, None),
+        'possible': (2, 3)
+    },
+    'Biểu đồ bong bóng': {
+        'icon': '🫧',
+        'description': 'Phân tích mối quan hệ giữa 3 chỉ số',
+        'conditions': 'Chính xác 3 chỉ số',
+        'recommended': (3, 3),
+        'possible': None
+    },
+    'Biểu đồ mùa vụ': {
+        'icon': '📅',
+        'description': 'Phân tích biến động theo mùa của một chỉ số',
+        'conditions': 'Chính xác 1 chỉ số',
+        'recommended': (1, 1),
+        'possible': None
+    },
+    'Biểu đồ xu hướng chi tiết': {
+        'icon': '📉',
+        'description': 'Phân tích xu hướng dài hạn của một chỉ số',
+        'conditions': 'Chính xác 1 chỉ số',
+        'recommended': (1, 1),
+        'possible': None
+    },
+    'Biểu đồ hộp': {
+        'icon': '📦',
+        'description': 'Hiển thị phân phối và giá trị bất thường',
+        'conditions': 'Từ 1 chỉ số trở lên',
+        'recommended': (1, 6),
+        'possible': (7, None)
+    },
+    'Biểu đồ radar': {
+        'icon': '🕸️',
+        'description': 'So sánh giá trị chuẩn hóa nhiều chỉ số',
+        'conditions': 'Từ 3 chỉ số trở lên',
+        'recommended': (3, 8),
+        'possible': (9, None)
+    },
+    'Bản đồ nhiệt thời gian': {
+        'icon': '🗓️',
+        'description': 'Phân tích biến động theo tháng và năm',
+        'conditions': 'Chính xác 1 chỉ số',
+        'recommended': (1, 1),
+        'possible': None
+    },
+    'Biểu đồ dòng chảy': {
+        'icon': '🌊',
+        'description': 'Hiển thị sự thay đổi theo thời gian',
+        'conditions': 'Từ 1-5 chỉ số',
+        'recommended': (1, 5),
+        'possible': (6, None)
+    },
+    'Biểu đồ bánh': {
+        'icon': '🥧',
+        'description': 'So sánh tỷ trọng tại một thời điểm',
+        'conditions': 'Từ 2 chỉ số trở lên',
+        'recommended': (2, 7),
+        'possible': (8, None)
+    },
+    'Biểu đồ histogram': {
+        'icon': '📊',
+        'description': 'Phân tích phân phối tần suất giá trị',
+        'conditions': 'Chính xác 1 chỉ số',
+        'recommended': (1, 1),
+        'possible': None
+    }
+}
+
+@functools.lru_cache(maxsize=None)
+def _default_explanation(indicator):
+    """Build (once per indicator) the explanation for indicators not in the registry"""
+    return {
+        'title': INDICATOR_NAMES.get(indicator, indicator),
+        'description': 'Chỉ số kinh tế quan trọng cần theo dõi.',
+        'impact': 'Có ảnh hưởng đến các quyết định chính sách và hoạt động kinh tế.',
+        'interpretation': 'Cần phân tích trong bối cảnh tổng thể của nền kinh tế.',
+        'threshold': {
+            'high': 'Giá trị cao hơn bình thường',
+            'medium': 'Giá trị trong khoảng bình thường',
+            'low': 'Giá trị thấp hơn bình thường'
+        }
+    }
+
+def get_indicator_explanation(indicator):
+    """Get the shared (read-only) explanation entry for an indicator"""
+    explanation = INDICATOR_EXPLANATIONS.get(indicator)
+    if explanation is None:
+        explanation = _default_explanation(indicator)
+    return explanation
+
+def get_chart_explanation(chart_type):
+    """Get the shared (read-only) explanation entry for a chart type"""
+    return CHART_EXPLANATIONS.get(chart_type)
+
+def _in_range(value, bounds):
+    """Check whether value lies in the inclusive (min, max) bounds, max None meaning unbounded"""
+    if bounds is None:
+        return False
+    low, high = bounds
+    return value >= low and (high is None or value <= high)
+
+@functools.lru_cache(maxsize=None)
+def get_chart_recommendations(num_indicators):
+    """Get chart recommendations for a number of indicators, sorted by suitability"""
+    statuses = {}
+    for chart, info in CHART_RECOMMENDATIONS.items():
+        if _in_range(num_indicators, info['recommended']):
+            statuses[chart] = 'recommended'
+        elif _in_range(num_indicators, info['possible']):
+            statuses[chart] = 'possible'
+        else:
+            statuses[chart] = 'not_recommended'
+
+    # Sắp xếp theo mức độ phù hợp: recommended -> possible -> not_recommended
+    sorted_charts = {}
+    for status in ('recommended', 'possible', 'not_recommended'):
+        for chart, info in CHART_RECOMMENDATIONS.items():
+            if statuses[chart] == status:
+                sorted_charts[chart] = {
+                    'icon': info['icon'],
+                    'description': info['description'],
+                    'conditions': info['conditions'],
+                    'status': status
+                }
+    return sorted_charts
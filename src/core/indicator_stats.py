@@ -0,0 +1,425 @@
+import copy
+import warnings
+import numpy as np
+import pandas as pd
+
+def build_stats_index(data, indicators):
+    """Compute summary, seasonal and yearly statistics for every indicator
+
+    All indicators are processed together in one vectorized pass, so the
+    result can be built once per data load and served without rescanning
+    the columns.
+    """
+    if data is None or data.empty or not indicators:
+        return {}
+
+    values = data[indicators].to_numpy(dtype=np.float64)
+    count = len(values)
+
+    # Column-wise summary statistics (NaN-aware, matching pandas defaults);
+    # short windows and all-NaN columns give NaN instead of warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0, ddof=1)
+        min_values = np.nanmin(values, axis=0)
+        max_values = np.nanmax(values, axis=0)
+        q1, median, q3 = np.nanquantile(values, [0.25, 0.5, 0.75], axis=0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+    finite_counts = np.isfinite(values).sum(axis=0)
+    current = values[-1]
+    previous = values[-2] if count > 1 else np.full(len(indicators), np.nan)
+
+    # Tukey fences used by the box plot: the most extreme points within 1.5 IQR
+    iqr = q3 - q1
+    low_limit = q1 - 1.5 * iqr
+    high_limit = q3 + 1.5 * iqr
+    outlier_mask = (values < low_limit) | (values > high_limit)
+    inside = np.where(outlier_mask, np.nan, values)
+    lower_fence = np.nanmin(inside, axis=0)
+    upper_fence = np.nanmax(inside, axis=0)
+
+    # Monthly and yearly aggregates for all indicators in one groupby each
+    monthly = data.groupby('Month')[indicators].agg(['mean', 'std', 'count'])
+    yearly = data.groupby('Year')[indicators].agg(['mean', 'min', 'max', 'std'])
+
+    index = {}
+    for j, indicator in enumerate(indicators):
+        month_stats = monthly[indicator]
+        seasonal = month_stats[['mean', 'std']].reset_index()
+        seasonal.columns = ['Month', indicator, 'std']
+
+        # Running (count, mean, M2) moments let appended rows update the stats
+        monthly_moments = np.zeros((12, 3))
+        month_counts = month_stats['count'].to_numpy(dtype=np.float64)
+        monthly_moments[month_stats.index.to_numpy() - 1] = np.column_stack([
+            month_counts,
+            month_stats['mean'].to_numpy(),
+            np.nan_to_num(month_stats['std'].to_numpy() ** 2 * (month_counts - 1))
+        ])
+
+        index[indicator] = {
+            'stats': {
+                'mean': float(mean[j]),
+                'median': float(median[j]),
+                'std': float(std[j]),
+                'min': float(min_values[j]),
+                'max': float(max_values[j]),
+                'current': float(current[j]),
+                'previous': float(previous[j]),
+                'change': float(current[j] - previous[j]),
+                'percentile_25': float(q1[j]),
+                'percentile_50': float(median[j]),
+                'percentile_75': float(q3[j])
+            },
+            'box': {
+                'q1': float(q1[j]),
+                'median': float(median[j]),
+                'q3': float(q3[j]),
+                'mean': float(mean[j]),
+                'sd': float(std[j]),
+                'lowerfence': float(lower_fence[j]),
+                'upperfence': float(upper_fence[j]),
+                'outliers': values[outlier_mask[:, j], j]
+            },
+            'seasonal': seasonal,
+            'yearly': yearly[indicator].reset_index(),
+            'moments': np.array([finite_counts[j], mean[j], m2[j]]),
+            'monthly_moments': monthly_moments
+        }
+
+    return index
+
+def _batch_moments(values):
+    """(count, mean, M2) of the finite values"""
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.zeros(3)
+    mean = values.mean()
+    return np.array([len(values), mean, ((values - mean) ** 2).sum()])
+
+def _merge_moments(a, b):
+    """Combine two (count, mean, M2) moments (Chan et al. parallel update)"""
+    count = a[0] + b[0]
+    if b[0] == 0:
+        return a
+    if a[0] == 0:
+        return b
+    delta = b[1] - a[1]
+    return np.array([
+        count,
+        a[1] + delta * b[0] / count,
+        a[2] + b[2] + delta ** 2 * a[0] * b[0] / count
+    ])
+
+def _std_from_moments(moments):
+    """Sample standard deviation (ddof=1) from (count, mean, M2)"""
+    return float(np.sqrt(moments[2] / (moments[0] - 1))) if moments[0] > 1 else np.nan
+
+def _sorted_quantile(ordered, q):
+    """Linear-interpolated quantile of sorted finite values (as np.quantile)"""
+    if len(ordered) == 0:
+        return np.nan
+    position = q * (len(ordered) - 1)
+    low = int(np.floor(position))
+    high = min(low + 1, len(ordered) - 1)
+    return float(ordered[low] + (position - low) * (ordered[high] - ordered[low]))
+
+def append_stats_index(index, data, indicators, sorted_values, start):
+    """Get the stats index updated for rows data[start:] appended to the data
+
+    index itself is left unchanged (readers may still hold it) and the
+    entries of the result are new dicts. sorted_values must already
+    include the new rows. Summary statistics
+    come from the running moments and the sorted arrays, seasonal
+    aggregates from per-month moments and yearly aggregates are recomputed
+    only for the years the new rows touch, so the cost grows with the
+    number of new rows rather than the length of the history. Outliers are
+    listed in value order rather than time order.
+    """
+    new_rows = data.iloc[start:]
+    if new_rows.empty:
+        return index
+    index = dict(index)
+
+    values = new_rows[indicators].to_numpy(dtype=np.float64)
+    months = new_rows['Month'].to_numpy()
+    first_year = new_rows['Year'].iloc[0]
+    year_start = int(np.searchsorted(data['Year'].to_numpy(), first_year, side='left'))
+    recent_years = data.iloc[year_start:].groupby('Year')[indicators].agg(['mean', 'min', 'max', 'std'])
+    tail = data[indicators].iloc[-2:].to_numpy(dtype=np.float64)
+    current = tail[-1]
+    previous = tail[0] if len(data) > 1 else np.full(len(indicators), np.nan)
+
+    for j, indicator in enumerate(indicators):
+        entry = index[indicator] = dict(index[indicator])
+        column = values[:, j]
+        ordered = sorted_values[indicator]
+
+        moments = _merge_moments(entry['moments'], _batch_moments(column))
+        entry['moments'] = moments
+        monthly_moments = entry['monthly_moments'] = entry['monthly_moments'].copy()
+        for month in np.unique(months):
+            monthly_moments[month - 1] = _merge_moments(monthly_moments[month - 1], _batch_moments(column[months == month]))
+
+        mean, std = float(moments[1]), _std_from_moments(moments)
+        q1, median, q3 = (_sorted_quantile(ordered, q) for q in (0.25, 0.5, 0.75))
+        entry['stats'] = {
+            'mean': mean,
+            'median': median,
+            'std': std,
+            'min': float(ordered[0]) if len(ordered) else np.nan,
+            'max': float(ordered[-1]) if len(ordered) else np.nan,
+            'current': float(current[j]),
+            'previous': float(previous[j]),
+            'change': float(current[j] - previous[j]),
+            'percentile_25': q1,
+            'percentile_50': median,
+            'percentile_75': q3
+        }
+
+        # Fences and outliers from binary searches on the sorted values
+        iqr = q3 - q1
+        low = int(np.searchsorted(ordered, q1 - 1.5 * iqr, side='left'))
+        high = int(np.searchsorted(ordered, q3 + 1.5 * iqr, side='right'))
+        entry['box'] = {
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'mean': mean,
+            'sd': std,
+            'lowerfence': float(ordered[low]) if low < high else np.nan,
+            'upperfence': float(ordered[high - 1]) if low < high else np.nan,
+            'outliers': np.concatenate([ordered[:low], ordered[high:]])
+        }
+
+        present = monthly_moments[:, 0] > 0
+        entry['seasonal'] = pd.DataFrame({
+            'Month': np.flatnonzero(present) + 1,
+            indicator: monthly_moments[present, 1],
+            'std': [_std_from_moments(row) for row in monthly_moments[present]]
+        })
+
+        yearly = entry['yearly']
+        entry['yearly'] = pd.concat(
+            [yearly[yearly['Year'] < first_year], recent_years[indicator].reset_index()],
+            ignore_index=True
+        )
+
+    return index
+
+def insert_sorted(sorted_values, data, indicators, start):
+    """Get the sorted arrays with the finite values of rows data[start:] inserted
+
+    Only the new values are sorted and searched, but np.insert copies each
+    sorted array, so the cost is linear in the history length per indicator
+    (a memory copy, not a re-sort).
+    """
+    values = data[indicators].iloc[start:].to_numpy(dtype=np.float64)
+    sorted_values = dict(sorted_values)
+    for j, indicator in enumerate(indicators):
+        column = np.sort(values[np.isfinite(values[:, j]), j])
+        ordered = sorted_values[indicator]
+        sorted_values[indicator] = np.insert(ordered, np.searchsorted(ordered, column), column)
+    return sorted_values
+
+def sign_runs(values):
+    """Run-length encode the sign of values
+
+    Returns (starts, stops, signs) arrays where each run covers
+    values[start:stop] with the same non-zero sign. Zeros and NaN break runs
+    and are not reported, so the output size is the number of regime changes
+    rather than the number of rows.
+    """
+    signs = np.sign(np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0)).astype(np.int8)
+    if len(signs) == 0:
+        empty = np.array([], dtype=np.intp)
+        return empty, empty, signs[:0]
+
+    # A run starts wherever the sign differs from the previous element
+    boundaries = np.flatnonzero(np.diff(signs)) + 1
+    starts = np.concatenate(([0], boundaries))
+    stops = np.concatenate((boundaries, [len(signs)]))
+    run_signs = signs[starts]
+    keep = run_signs != 0
+    return starts[keep], stops[keep], run_signs[keep]
+
+def sort_columns(data, indicators):
+    """Sort every indicator once for percentile lookups
+
+    Returns {indicator: sorted 1-D array of its finite values}. The columns
+    are sorted together in Fortran order so each one is a contiguous view.
+    """
+    if data is None or data.empty or not indicators:
+        return {}
+
+    ordered = np.sort(np.asfortranarray(data[indicators].to_numpy(dtype=np.float64)), axis=0)
+    # NaN sorts last, so the finite values are a prefix of every column
+    finite_counts = np.isfinite(ordered).sum(axis=0)
+    return {
+        indicator: ordered[:finite_counts[j], j]
+        for j, indicator in enumerate(indicators)
+    }
+
+def percentile_ranks(sorted_values, scores):
+    """Percentile rank (0-100) of scores within sorted_values
+
+    Matches scipy.stats.percentileofscore(kind='rank') with NaN values
+    omitted, using two binary searches per score instead of a full scan.
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    count = len(sorted_values)
+    if count == 0:
+        return np.full(scores.shape, np.nan)
+
+    left = np.searchsorted(sorted_values, scores, side='left')
+    right = np.searchsorted(sorted_values, scores, side='right')
+    ranks = (left + right + (left < right)) * (50.0 / count)
+    return np.where(np.isnan(scores), np.nan, ranks)
+
+def binned_kde(values, grid_size=1024):
+    """Gaussian KDE of values evaluated on an even grid between min and max
+
+    Uses Scott's bandwidth like scipy.stats.gaussian_kde, but the samples are
+    first linearly binned onto the grid and the kernel is applied with one
+    FFT convolution, so the cost is O(n + grid log grid) instead of
+    O(n x grid). Returns (grid, density).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    count = len(values)
+    low, high = values.min(), values.max()
+    grid = np.linspace(low, high, grid_size)
+    bandwidth = values.std(ddof=1) * count ** (-1 / 5)
+    if high == low or not bandwidth > 0:
+        return grid, np.zeros(grid_size)
+
+    # Linear binning: split each sample between its two neighbouring grid points
+    step = (high - low) / (grid_size - 1)
+    position = (values - low) / step
+    left = np.minimum(position.astype(np.intp), grid_size - 2)
+    right_weight = position - left
+    weights = np.bincount(left, weights=1 - right_weight, minlength=grid_size)
+    weights += np.bincount(left + 1, weights=right_weight, minlength=grid_size)
+
+    # Kernel sampled at grid offsets, truncated where it is negligible
+    reach = min(grid_size - 1, int(np.ceil(5 * bandwidth / step)))
+    offsets = np.arange(-reach, reach + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+
+    # Zero-padded FFT convolution, keeping the part aligned with the grid
+    size = 1 << int(np.ceil(np.log2(grid_size + 2 * reach + 1)))
+    density = np.fft.irfft(np.fft.rfft(weights, size) * np.fft.rfft(kernel, size), size)
+    density = density[reach:reach + grid_size] / count
+    return grid, np.clip(density, 0, None)
+
+def build_distribution(values, bins=30, grid_size=1024):
+    """Histogram bins (as probabilities) and KDE curve of one indicator"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return None
+
+    counts, edges = np.histogram(values, bins=bins)
+    distribution = {
+        'centers': (edges[:-1] + edges[1:]) / 2,
+        'widths': np.diff(edges),
+        'probabilities': counts / len(values),
+        'kde_x': None,
+        'kde_y': None
+    }
+    # Need enough data points for KDE
+    if len(values) > 5:
+        distribution['kde_x'], distribution['kde_y'] = binned_kde(values, grid_size)
+    return distribution
+
+class CorrelationMatrix:
+    """Pearson correlation matrix over all indicators
+
+    The matrix is kept together with its sufficient statistics (row count,
+    column sums and cross-products), so appending rows updates it in
+    O(new rows x indicators^2) without revisiting earlier data. Callers
+    slice sub-matrices, rows or single pairs from it instead of calling
+    DataFrame.corr() themselves.
+    """
+
+    def __init__(self, data, indicators):
+        self.indicators = list(indicators)
+        self._positions = {indicator: i for i, indicator in enumerate(self.indicators)}
+        size = len(self.indicators)
+        self._count = 0
+        self._shift = None
+        self._sums = np.zeros(size)
+        self._cross = np.zeros((size, size))
+        self.matrix = np.full((size, size), np.nan)
+
+        if data is None or data.empty or not self.indicators:
+            self.incremental = True
+            return
+
+        values = data[self.indicators].to_numpy(dtype=np.float64)
+        # Pairwise-complete correlations cannot be updated from running sums,
+        # so data with gaps falls back to pandas and must be rebuilt on change
+        self.incremental = not np.isnan(values).any()
+        if self.incremental:
+            self.update(values)
+        else:
+            self.matrix = data[self.indicators].corr().to_numpy()
+
+    def copy(self):
+        """Independent copy that can be updated without changing this matrix"""
+        matrix = copy.copy(self)
+        matrix._sums = self._sums.copy()
+        matrix._cross = self._cross.copy()
+        return matrix
+
+    def update(self, values):
+        """Fold new rows (in indicator order) into the matrix"""
+        if not self.incremental:
+            raise ValueError("Correlation matrix was built from data with gaps and must be rebuilt")
+
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.indicators))
+        if len(values) == 0:
+            return
+
+        # Shift by the first batch mean to keep the one-pass sums well conditioned
+        if self._shift is None:
+            self._shift = values.mean(axis=0)
+        centered = values - self._shift
+
+        self._count += len(values)
+        self._sums += centered.sum(axis=0)
+        self._cross += centered.T @ centered
+        self._refresh()
+
+    def _refresh(self):
+        """Recompute the correlation matrix from the running sums"""
+        if self._count < 2:
+            self.matrix = np.full(self._cross.shape, np.nan)
+            return
+
+        cov = self._cross - np.outer(self._sums, self._sums) / self._count
+        std = np.sqrt(np.clip(np.diag(cov), 0, None))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.outer(std, std)
+        corr[(std == 0)[:, None] | (std == 0)[None, :]] = np.nan
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        self.matrix = corr
+
+    def submatrix(self, indicators):
+        """Get the correlation matrix for a subset of indicators"""
+        positions = [self._positions[indicator] for indicator in indicators]
+        return pd.DataFrame(
+            self.matrix[np.ix_(positions, positions)],
+            index=list(indicators),
+            columns=list(indicators)
+        )
+
+    def row(self, indicator):
+        """Get correlations of one indicator with every indicator"""
+        return pd.Series(self.matrix[self._positions[indicator]], index=self.indicators, name=indicator)
+
+    def pair(self, indicator1, indicator2):
+        """Get the correlation between two indicators"""
+        return float(self.matrix[self._positions[indicator1], self._positions[indicator2]])
@@ -0,0 +1,87 @@
+import codecs
+import hashlib
+import os
+import re
+
+# Background image name inside the static directory
+BACKGROUND_NAME = 'background'
+
+# URL prefix under which Streamlit serves the app's static directory
+STATIC_URL = 'app/static'
+
+_COMMENTS = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE = re.compile(r'\s+')
+_AROUND_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+_AFTER_COLON = re.compile(r':\s+')
+_IMPORTS = re.compile(r'@import\s+(?:url\([^)]*\)|"[^"]*"|\'[^\']*\')[^;]*;')
+
+def read_text(path):
+    """Read a text file saved as UTF-8 or UTF-16 (detected from its BOM)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return raw.decode('utf-16')
+    return raw.decode('utf-8-sig')
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet
+
+    Spaces before ':' are kept, since 'a :hover' and 'a:hover' select
+    different elements.
+    """
+    css = _COMMENTS.sub('', css)
+    css = _WHITESPACE.sub(' ', css)
+    css = _AROUND_PUNCTUATION.sub(r'\1', css)
+    css = _AFTER_COLON.sub(':', css)
+    return css.replace(';}', '}').strip()
+
+def concat_css(stylesheets):
+    """Concatenate stylesheets, moving their @import rules to the top
+
+    Browsers ignore @import anywhere but at the start of a stylesheet,
+    which is where each rule was in its own file.
+    """
+    imports, bodies = [], []
+    for css in stylesheets:
+        css = _COMMENTS.sub('', css)
+        imports.extend(_IMPORTS.findall(css))
+        bodies.append(_IMPORTS.sub('', css))
+    return '\n'.join(imports + bodies)
+
+def content_hash(data):
+    """Short content hash used as the ?v= cache-busting version"""
+    return hashlib.sha1(data).hexdigest()[:12]
+
+def _write_if_changed(path, data):
+    """Write bytes to path unless it already holds them (keeps the mtime stable)"""
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def build_assets(stylesheets, background_image, output_dir):
+    """Bundle the stylesheets and publish the background image once
+
+    The stylesheets (UTF-8 or UTF-16) are concatenated in order and
+    minified for inlining: Streamlit serves static .css files as text/plain
+    with nosniff, so browsers would refuse a linked stylesheet. The
+    background image is copied to output_dir and referenced with a content
+    hash in its URL, so browsers can cache it for as long as it does not
+    change. Returns the minified CSS and the image URL.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    with open(background_image, 'rb') as f:
+        image = f.read()
+    extension = os.path.splitext(background_image)[1].lower()
+    image_name = f"{BACKGROUND_NAME}{extension}"
+    _write_if_changed(os.path.join(output_dir, image_name), image)
+
+    return {
+        'css': minify_css(concat_css(read_text(path) for path in stylesheets)),
+        'background_url': f"{STATIC_URL}/{image_name}?v={content_hash(image)}"
+    }
@@ -0,0 +1,169 @@
+"""Render charts to static HTML/JSON files without the Streamlit UI
+
+Jobs are (chart type, indicators[, start, end]) entries, read from a JSON
+file or generated from --charts/--indicators. They are spread over a pool
+of worker processes; each worker loads the data once and builds figures
+with the app's chart functions (without importing the Streamlit app, so no
+CSV watch thread is started), and every finished chart is written to disk
+and appended to manifest.jsonl as soon as it is done.
+
+Run from the repository root:
+    python src/export_charts.py --indicators Brent Gold USD_VND --output reports/nightly
+    python src/export_charts.py --charts "Biểu đồ xu hướng" "Biểu đồ hộp" --indicators Export Import
+    python src/export_charts.py --jobs jobs.json --format html json --workers 8
+
+A jobs file is a JSON list such as:
+    [{"chart": "Biểu đồ phân tán", "indicators": ["Brent", "Gold"], "start": "2015-01", "end": "2020-12"}]
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.chart_functions import get_chart_functions
+from core.indicator_metadata import CHART_RECOMMENDATIONS, get_chart_recommendations
+
+FORMATS = ('html', 'json')
+
+# Set in each worker process by _init_worker
+_chart_functions = None
+
+def generate_jobs(charts, indicators):
+    """Build jobs for every chart and every valid combination of indicators
+
+    Charts that take a fixed number of indicators (scatter, bubble,
+    single-indicator charts) get one job per combination of that size;
+    the others get one job with all the indicators when that count is
+    recommended or possible for them.
+    """
+    jobs = []
+    for chart in charts:
+        low, high = CHART_RECOMMENDATIONS[chart]['recommended']
+        if high == low:
+            for combination in itertools.combinations(indicators, low):
+                jobs.append({'chart': chart, 'indicators': list(combination)})
+        elif get_chart_recommendations(len(indicators))[chart]['status'] != 'not_recommended':
+            jobs.append({'chart': chart, 'indicators': list(indicators)})
+    return jobs
+
+def load_jobs(path):
+    """Read jobs from a JSON list of {"chart", "indicators", "start"?, "end"?} objects"""
+    with open(path, encoding='utf-8') as f:
+        jobs = json.load(f)
+    for job in jobs:
+        if job.get('chart') not in CHART_RECOMMENDATIONS or not job.get('indicators'):
+            raise ValueError(f"Invalid job: {job}")
+    return jobs
+
+def get_job_name(index, job):
+    """Get an ASCII file name for a job, unique through its index"""
+    text = f"{job['chart']} {' '.join(job['indicators'])}"
+    if job.get('start') or job.get('end'):
+        text += f" {job.get('start') or ''} {job.get('end') or ''}"
+    # Vietnamese chart names: drop the accents, keep letters and digits
+    text = unicodedata.normalize('NFKD', text.replace('đ', 'd').replace('Đ', 'D'))
+    text = text.encode('ascii', 'ignore').decode('ascii')
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_').lower()
+    return f"{index:05d}_{slug[:80]}"
+
+def _init_worker():
+    """Load the data once per worker process, quietly"""
+    global _chart_functions
+    from core.visualization_handler import get_viz_handler
+    viz_handler = get_viz_handler()
+    with contextlib.redirect_stdout(io.StringIO()):
+        viz_handler.data_handler
+    _chart_functions = get_chart_functions(viz_handler)
+
+def render_job(index, job, output_dir, formats, include_plotlyjs):
+    """Build one chart and write it to disk, returning its manifest entry"""
+    entry = {'index': index, **job, 'files': []}
+    start = time.perf_counter()
+    try:
+        build = _chart_functions.get(job['chart'])
+        fig = build(job['indicators'], start=job.get('start'), end=job.get('end')) if build else None
+        if fig is None:
+            raise ValueError("chart returned None for these indicators")
+
+        name = get_job_name(index, job)
+        if 'json' in formats:
+            path = os.path.join(output_dir, f"{name}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(fig.to_json())
+            entry['files'].append(path)
+        if 'html' in formats:
+            path = os.path.join(output_dir, f"{name}.html")
+            fig.write_html(path, include_plotlyjs=include_plotlyjs, full_html=True)
+            entry['files'].append(path)
+    except Exception as e:
+        entry['error'] = f"{type(e).__name__}: {e}"
+    entry['seconds'] = round(time.perf_counter() - start, 4)
+    return entry
+
+def export_charts(jobs, output_dir, formats=FORMATS, workers=None, include_plotlyjs='cdn'):
+    """Render jobs in a process pool and stream the manifest; returns the failed count"""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, 'manifest.jsonl')
+    failed = 0
+
+    with open(manifest_path, 'w', encoding='utf-8') as manifest, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [
+            executor.submit(render_job, index, job, output_dir, formats, include_plotlyjs)
+            for index, job in enumerate(jobs)
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            entry = future.result()
+            manifest.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            manifest.flush()
+            status = f"ERROR {entry['error']}" if 'error' in entry else f"{entry['seconds']:.2f}s"
+            if 'error' in entry:
+                failed += 1
+            print(f"[{done}/{len(jobs)}] {entry['chart']} {', '.join(entry['indicators'])}: {status}")
+
+    print(f"Wrote {len(jobs) - failed} charts to {output_dir} ({failed} failed), manifest: {manifest_path}")
+    return failed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render charts to HTML/JSON files in parallel")
+    parser.add_argument('--jobs', help="JSON file with the list of jobs")
+    parser.add_argument('--charts', nargs='+', default=list(CHART_RECOMMENDATIONS),
+                        help="chart types to render with --indicators (default: all)")
+    parser.add_argument('--indicators', nargs='+', help="indicators to combine into jobs")
+    parser.add_argument('--start', help="first month of the time window (YYYY-MM)")
+    parser.add_argument('--end', help="last month of the time window (YYYY-MM)")
+    parser.add_argument('--output', default='exports', help="output directory")
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=list(FORMATS), dest='formats')
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--inline-plotlyjs', action='store_true',
+                        help="embed plotly.js in every HTML file instead of loading it from the CDN")
+    args = parser.parse_args(argv)
+
+    if args.jobs:
+        jobs = load_jobs(args.jobs)
+    elif args.indicators:
+        unknown = [chart for chart in args.charts if chart not in CHART_RECOMMENDATIONS]
+        if unknown:
+            parser.error(f"unknown chart types: {', '.join(unknown)}")
+        jobs = generate_jobs(args.charts, args.indicators)
+    else:
+        parser.error("either --jobs or --indicators is required")
+
+    if args.start or args.end:
+        for job in jobs:
+            job.setdefault('start', args.start)
+            job.setdefault('end', args.end)
+
+    failed = export_charts(jobs, args.output, formats=args.formats, workers=args.workers,
+                           include_plotlyjs=True if args.inline_plotlyjs else 'cdn')
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
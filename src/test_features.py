@@ -1,8 +1,15 @@
 import sys
 import os
+import shutil
+import subprocess
+import tempfile
 import traceback
-from core.data_handler import data_handler
-from core.visualization_handler import viz_handler
+import numpy as np
+from core.chart_cache import ChartCache
+from core.data_handler import data_handler, DataHandler
+from core.data_cache import get_source_signature, read_cache, write_cache
+from core.dataset_registry import DatasetRegistry
+from core.visualization_handler import viz_handler, VisualizationHandler
 
 def test_all_features():
     """Kiểm tra tất cả tính năng của ứng dụng Economic Data Analyzer"""
@@ -12,6 +19,10 @@ def test_all_features():
     indicators = data_handler.get_available_indicators()
     print(f"Có {len(indicators)} chỉ số: {', '.join(indicators)}")
     
+    # Kiểm tra thời gian import
+    print("\n=== Kiểm tra thời gian import ===")
+    test_import_time()
+    
     # Kiểm tra data handler
     print("\n=== Kiểm tra Data Handler ===")
     test_data_handler(indicators)
@@ -22,6 +33,44 @@ def test_all_features():
     
     print("\nKiểm tra hoàn tất!")
 
+# Các module nặng không được nạp khi chỉ import các handler
+LAZY_MODULES = ['scipy', 'plotly.express', 'plotly.subplots']
+
+def test_import_time(top=8):
+    """In báo cáo thời gian import (python -X importtime) của các handler"""
+    try:
+        # Chạy trong tiến trình mới để đo import lạnh
+        check = (
+            "import sys, core.data_handler as dh, core.visualization_handler as vh;"
+            f"print([name for name in {LAZY_MODULES!r} if name in sys.modules]);"
+            "print(dh._data_handler is not None, vh._viz_handler is not None)"
+        )
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', check],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        )
+        
+        # Mỗi dòng: "import time: self [us] | cumulative | module"
+        timings = []
+        for line in result.stderr.splitlines():
+            parts = line.split('|')
+            if len(parts) == 3 and parts[0].split(':')[-1].strip().isdigit():
+                timings.append((int(parts[1]), parts[2].rstrip()))
+        for cumulative, module in sorted(timings, reverse=True)[:top]:
+            print(f"   {cumulative / 1000:8.1f} ms  {module}")
+        
+        loaded_lazy, data_loaded = result.stdout.strip().splitlines()
+        if loaded_lazy != '[]':
+            raise ValueError(f"Module nặng bị import sớm: {loaded_lazy}")
+        if data_loaded != 'False False':
+            raise ValueError("Dữ liệu bị tải ngay khi import")
+        total = max(timings)[0] / 1000 if timings else 0
+        print(f"✅ Import handler: Thành công ({total:.0f} ms, chưa tải dữ liệu)")
+    except Exception as e:
+        print(f"❌ Import handler lỗi: {e}")
+        traceback.print_exc()
+
 def test_data_handler(indicators):
     """Kiểm tra các chức năng của Data Handler"""
     try:
@@ -39,10 +88,152 @@ def test_data_handler(indicators):
         filtered_data = data_handler.filter_data(indicators=multi_indicators)
         print(f"✅ filter_data (nhiều chỉ số): Thành công (shape: {filtered_data.shape})")
         
+        # Test khoảng thời gian: 24 tháng gần nhất bằng tìm kiếm nhị phân
+        dates = data_handler.data['Date']
+        window_data = data_handler.filter_data(indicators=[test_indicator], start=dates.iloc[-24], end=dates.iloc[-1])
+        window_stats = data_handler.get_indicator_stats(test_indicator, start=dates.iloc[-24], end=dates.iloc[-1])
+        if len(window_data) != 24 or abs(window_stats['mean'] - window_data[test_indicator].mean()) > 1e-9:
+            raise ValueError("Dữ liệu theo khoảng thời gian không đúng")
+        print(f"✅ filter_data (khoảng thời gian): Thành công (shape: {window_data.shape})")
+        
         # Test create_correlation_data
         corr_matrix = data_handler.create_correlation_data(indicators[:5])
         print(f"✅ create_correlation_data: Thành công (shape: {corr_matrix.shape})")
         
+        # Test thống kê tính sẵn khi tải dữ liệu
+        stats = data_handler.get_indicator_stats(test_indicator)
+        if abs(stats['mean'] - data_handler.data[test_indicator].mean()) > 1e-9:
+            raise ValueError("Thống kê tính sẵn không khớp với dữ liệu")
+        print(f"✅ get_indicator_stats: Thành công ({len(stats)} chỉ tiêu)")
+        
+        # Test tra cứu phân vị trên mảng đã sắp xếp sẵn
+        series_percentiles = data_handler.get_percentiles(test_indicator)
+        latest = data_handler.get_percentiles(test_indicator, data_handler.data[test_indicator].iloc[-1])
+        if len(series_percentiles) != len(data_handler.data) or abs(series_percentiles[-1] - latest) > 1e-9:
+            raise ValueError("Phân vị không khớp")
+        print(f"✅ get_percentiles: Thành công (phân vị hiện tại: {latest:.1f})")
+        
+        # Test cache nhị phân cho file CSV (các cột của CSV, nhãn Date được tạo lại khi tải)
+        cached = read_cache(data_handler.file_path)
+        if cached is None or not cached.equals(data_handler.data.drop(columns='Date')):
+            raise ValueError("Cache không khớp với dữ liệu đã tải")
+        print(f"✅ read_cache: Thành công (shape: {cached.shape})")
+        
+        # Test cache ghi từ dữ liệu đọc trước khi file được nối thêm thì bị coi là cũ
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, 'data.csv')
+            shutil.copyfile(data_handler.file_path, csv_path)
+            signature = get_source_signature(csv_path)
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                f.write(f"{int(cached['Year'].iloc[-1]) + 1},1\n")
+            write_cache(csv_path, cached, signature)
+            if read_cache(csv_path) is not None:
+                raise ValueError("Cache cũ được dùng sau khi file CSV thay đổi")
+        print("✅ write_cache (file thay đổi khi đọc): Thành công")
+        
+        # Test bộ dữ liệu chỉ được tải khi truy cập lần đầu
+        registry = DatasetRegistry()
+        registry.register('test', data_handler.file_path)
+        if registry.is_loaded('test'):
+            raise ValueError("Bộ dữ liệu bị tải trước khi dùng")
+        if registry.get('test').data.shape != data_handler.data.shape or not registry.is_loaded('test'):
+            raise ValueError("Bộ dữ liệu tải không đúng")
+        print(f"✅ DatasetRegistry: Thành công ({len(registry.names())} bộ dữ liệu)")
+        
+        # Test bộ dữ liệu bị giải phóng rồi tải lại sau khi CSV thay đổi không dùng biểu đồ cũ
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, 'data.csv')
+            shutil.copyfile(data_handler.file_path, csv_path)
+            registry = DatasetRegistry()
+            registry.register('test', csv_path)
+            chart_cache = ChartCache()
+            
+            def cached_chart(handler):
+                # Cùng khóa với bộ nhớ đệm biểu đồ của ứng dụng
+                snapshot = handler.snapshot
+                key = ('test', 'Biểu đồ cột', (indicators[0],), (None, None), snapshot.data_version)
+                return chart_cache.get_or_create(
+                    key, lambda: VisualizationHandler(data_handler=handler).with_data(snapshot).create_bar_chart([indicators[0]])
+                )
+            
+            old_fig = cached_chart(registry.get('test'))
+            registry.unload('test')
+            cached.iloc[:-12].to_csv(csv_path, index=False)
+            new_fig = cached_chart(registry.get('test'))
+            if new_fig is old_fig or len(new_fig.data[0].x) != len(cached) - 12:
+                raise ValueError("Biểu đồ cũ được dùng sau khi bộ dữ liệu được tải lại")
+        print(f"✅ DatasetRegistry (tải lại): Thành công ({len(old_fig.data[0].x)} → {len(new_fig.data[0].x)} tháng)")
+        
+        # Test nối thêm các tháng mới cho kết quả giống như tải lại toàn bộ
+        source = data_handler.data.drop(columns='Date')
+        appended = DataHandler.from_frame(source.iloc[:-6])
+        indicator = indicators[0]
+        appended.stats_index, appended.correlation, appended.get_rolling_mean(indicator)
+        snapshot = appended.snapshot
+        snapshot_stats = snapshot.get_indicator_stats(indicator)
+        appended.append_observations(source.iloc[-6:])
+        if not appended.data.equals(data_handler.data):
+            raise ValueError("Dữ liệu sau khi nối thêm không khớp")
+        for name in ('mean', 'std', 'median', 'percentile_75', 'current'):
+            if not np.isclose(appended.get_indicator_stats(indicator)[name], data_handler.get_indicator_stats(indicator)[name]):
+                raise ValueError(f"Thống kê {name} không khớp sau khi nối thêm")
+        if not np.allclose(appended.get_seasonal_data(indicator)[indicator], data_handler.get_seasonal_data(indicator)[indicator]):
+            raise ValueError("Dữ liệu theo mùa không khớp sau khi nối thêm")
+        if not np.allclose(appended.get_rolling_mean(indicator), data_handler.get_rolling_mean(indicator), equal_nan=True):
+            raise ValueError("Trung bình động không khớp sau khi nối thêm")
+        if not np.allclose(appended.create_correlation_data(indicators[:3]), data_handler.create_correlation_data(indicators[:3])):
+            raise ValueError("Ma trận tương quan không khớp sau khi nối thêm")
+        print(f"✅ append_observations: Thành công (shape: {appended.data.shape})")
+        
+        # Test bản chụp đã lấy trước khi nối thêm không bị thay đổi
+        if (len(snapshot.data) != len(source) - 6 or snapshot.get_indicator_stats(indicator) != snapshot_stats
+                or len(snapshot.sorted_values[indicator]) != np.isfinite(snapshot.data[indicator]).sum()):
+            raise ValueError("Bản chụp dữ liệu cũ bị thay đổi khi nối thêm")
+        if appended.snapshot is snapshot or appended.data_version <= snapshot.data_version:
+            raise ValueError("Bản chụp mới không được công bố")
+        print(f"✅ DataSnapshot: Thành công (phiên bản {snapshot.data_version} → {appended.data_version})")
+        
+        # Test sửa một tháng cũ bằng giá trị không hợp lệ báo lỗi và giữ nguyên dữ liệu
+        published = appended.snapshot
+        try:
+            appended.append_observations([{'Year': int(source['Year'].iloc[-1]), 'Month': int(source['Month'].iloc[-1]), indicator: 'n/a'}])
+        except ValueError:
+            pass
+        else:
+            raise ValueError("Giá trị sửa không hợp lệ không báo lỗi")
+        if appended.snapshot is not published or appended.data.shape != data_handler.data.shape:
+            raise ValueError("Sửa dữ liệu lỗi làm mất dữ liệu đã công bố")
+        print(f"✅ append_observations (sửa lỗi): Thành công (shape: {appended.data.shape})")
+        
+        # Test chế độ lưu gọn: chỉ số float32, một cột nhãn Date
+        compact = DataHandler.from_frame(source, indicator_dtype=np.float32)
+        report = compact.memory_report()
+        if report[indicator] != 4 * len(source) or 'YearMonth' in report:
+            raise ValueError("Chỉ số không được lưu dạng float32")
+        if not np.isclose(compact.get_indicator_stats(indicator)['mean'], data_handler.get_indicator_stats(indicator)['mean'], rtol=1e-5):
+            raise ValueError("Thống kê float32 không khớp")
+        if compact.get_memory_usage() >= data_handler.get_memory_usage():
+            raise ValueError("Chế độ lưu gọn không giảm bộ nhớ")
+        print(f"✅ memory_report: Thành công ({compact.get_memory_usage()} / {data_handler.get_memory_usage()} bytes)")
+        
+        # Test kho cột ánh xạ bộ nhớ: chỉ đọc các chỉ số được dùng
+        with tempfile.TemporaryDirectory() as store:
+            data_handler.to_column_store(store)
+            mapped = DataHandler.from_column_store(store)
+            if not mapped.data.drop(columns='Date').equals(source):
+                raise ValueError("Kho cột không khớp với dữ liệu đã tải")
+            if not np.isclose(mapped.get_indicator_stats(indicator)['std'], data_handler.get_indicator_stats(indicator)['std']):
+                raise ValueError("Thống kê từ kho cột không khớp")
+            if not np.allclose(mapped.create_correlation_data(indicators[:3]), data_handler.create_correlation_data(indicators[:3])):
+                raise ValueError("Ma trận tương quan từ kho cột không khớp")
+            if mapped.get_related_indicators(indicator, 0.5).keys() != data_handler.get_related_indicators(indicator, 0.5).keys():
+                raise ValueError("Chỉ số liên quan từ kho cột không khớp")
+            mapped.load_column_store(store)
+            if list(mapped.stats_index) != [indicator] or mapped.snapshot._correlation is not None:
+                raise ValueError("Kho cột đọc cả các chỉ số không được dùng")
+            print(f"✅ Column store: Thành công ({len(mapped.available_indicators)} cột ánh xạ)")
+            del mapped
+        
     except Exception as e:
         print(f"❌ Data Handler lỗi: {e}")
         traceback.print_exc()
@@ -58,6 +249,8 @@ def test_visualizations(indicators):
         ("create_trend_chart", test_trend_chart),
         ("create_bar_chart", test_bar_chart),
         ("create_pie_chart", test_pie_chart),
+        ("create_box_plot", test_box_plot),
+        ("create_histogram", test_histogram),
         ("create_sankey_chart", test_sankey_chart)
     ]
     
@@ -81,6 +274,14 @@ def test_line_chart(indicators):
     if fig is None:
         raise ValueError("Biểu đồ trả về None")
     
+    # Test giảm số điểm (LTTB) cho chuỗi dài
+    fig = viz_handler.create_line_chart([indicators[0]], max_points=50)
+    if fig is None:
+        raise ValueError("Biểu đồ trả về None")
+    stars = len(fig.data[1].x) if len(fig.data) > 1 else 0
+    if len(fig.data[0].x) > 50 + stars:
+        raise ValueError("Biểu đồ không được giảm số điểm")
+    
     # Test với danh sách rỗng
     fig = viz_handler.create_line_chart([])
     if fig is not None:
@@ -107,6 +308,24 @@ def test_calendar_heatmap(indicators):
     """Kiểm tra biểu đồ heatmap theo lịch"""
     # Test với 1 chỉ số
     fig = viz_handler.create_calendar_heatmap(indicators[0])
+    if fig is None:
+        raise ValueError("Biểu đồ trả về None")
+    # Toàn bộ lịch sử nằm trong một heatmap duy nhất
+    heatmaps = [trace for trace in fig.data if trace.type == 'heatmap']
+    if len(heatmaps) != 1 or len(heatmaps[0].y) != data_handler.data['Year'].nunique():
+        raise ValueError("Heatmap không chứa đủ các năm")
+    
+    # Các sự kiện sau một năm không có dữ liệu vẫn được đánh dấu
+    source = data_handler.data.drop(columns='Date')
+    gap_handler = VisualizationHandler(data_handler=DataHandler.from_frame(source[source['Year'] != 2010]))
+    fig = gap_handler.create_calendar_heatmap(indicators[0])
+    event_years = sorted(int(date[:4]) for date in gap_handler.historical_annotations
+                         if int(date[:4]) in set(source['Year']) - {2010})
+    if sorted(fig.data[1].y) != event_years:
+        raise ValueError("Sự kiện sau năm thiếu dữ liệu bị bỏ qua")
+    
+    # Chế độ cũ: mỗi năm một subplot
+    fig = viz_handler.create_calendar_heatmap(indicators[0], mode='subplots')
     if fig is None:
         raise ValueError("Biểu đồ trả về None")
     
@@ -150,6 +369,9 @@ def test_trend_chart(indicators):
     fig = viz_handler.create_trend_chart(indicators[0])
     if fig is None:
         raise ValueError("Biểu đồ trả về None")
+    # Các tháng liên tiếp cùng xu hướng được gộp thành một vùng
+    if len(fig.layout.shapes) >= len(data_handler.data) - 2:
+        raise ValueError("Vùng xu hướng không được gộp")
     
     # Test với chỉ số rỗng
     fig = viz_handler.create_trend_chart("")
@@ -185,6 +407,34 @@ def test_pie_chart(indicators):
     if fig is not None:
         raise ValueError("Biểu đồ không trả về None với 1 chỉ số")
 
+def test_box_plot(indicators):
+    """Kiểm tra biểu đồ hộp"""
+    # Test với nhiều chỉ số
+    fig = viz_handler.create_box_plot(indicators[:3])
+    if fig is None:
+        raise ValueError("Biểu đồ trả về None")
+    
+    # Test với danh sách rỗng
+    fig = viz_handler.create_box_plot([])
+    if fig is not None:
+        raise ValueError("Biểu đồ không trả về None với danh sách rỗng")
+
+def test_histogram(indicators):
+    """Kiểm tra biểu đồ histogram"""
+    # Test với 1 chỉ số
+    fig = viz_handler.create_histogram(indicators[0])
+    if fig is None:
+        raise ValueError("Biểu đồ trả về None")
+    
+    # Histogram và KDE được tính một lần cho mỗi phiên bản dữ liệu
+    if data_handler.get_distribution(indicators[0]) is not data_handler.get_distribution(indicators[0]):
+        raise ValueError("Phân phối không được lưu lại")
+    
+    # Test với chỉ số rỗng
+    fig = viz_handler.create_histogram("")
+    if fig is not None:
+        raise ValueError("Biểu đồ không trả về None với chỉ số rỗng")
+
 def test_sankey_chart(indicators):
     """Kiểm tra biểu đồ Sankey"""
     # Test với nhiều chỉ số